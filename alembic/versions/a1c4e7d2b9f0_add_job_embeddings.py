@@ -0,0 +1,43 @@
+"""Add job_embeddings table
+
+Revision ID: a1c4e7d2b9f0
+Revises: 613740c0a2ec
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c4e7d2b9f0'
+down_revision: Union[str, Sequence[str], None] = '613740c0a2ec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_embeddings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('model_version', sa.String(length=100), nullable=False),
+        sa.Column('dim', sa.Integer(), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_job_embeddings_id'), 'job_embeddings', ['id'], unique=False)
+    op.create_index(op.f('ix_job_embeddings_job_id'), 'job_embeddings', ['job_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_embeddings_job_id'), table_name='job_embeddings')
+    op.drop_index(op.f('ix_job_embeddings_id'), table_name='job_embeddings')
+    op.drop_table('job_embeddings')
@@ -0,0 +1,29 @@
+"""Index for keyset pagination of the job list
+
+Revision ID: a9d3f6c2e175
+Revises: f4b7d1e9a258
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3f6c2e175'
+down_revision: Union[str, Sequence[str], None] = 'f4b7d1e9a258'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the cursor is (created_at, id); rows without a created_at would never be reached
+    op.execute("UPDATE jobs SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) WHERE created_at IS NULL")
+    op.create_index('ix_jobs_active_created_id', 'jobs', ['is_active', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_jobs_active_created_id', table_name='jobs')
@@ -0,0 +1,55 @@
+"""job_skills inverted index for skill-overlap recommendations
+
+Revision ID: b2e6a8d4c391
+Revises: a9d3f6c2e175
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e6a8d4c391'
+down_revision: Union[str, Sequence[str], None] = 'a9d3f6c2e175'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    job_skills = op.create_table(
+        'job_skills',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('skill_id', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_id', 'skill_id', name='uq_job_skills_job_skill'),
+    )
+    op.create_index(op.f('ix_job_skills_id'), 'job_skills', ['id'], unique=False)
+    op.create_index('ix_job_skills_skill_job', 'job_skills', ['skill_id', 'job_id'], unique=False)
+
+    # index the existing live jobs, as job_sync would; new and edited ones are handled by job_sync
+    from backend.ai.skill_taxonomy import skill_ids_for
+
+    rows = []
+    live_jobs = sa.text("SELECT id, required_skills FROM jobs WHERE is_active = 1 AND deleted_at IS NULL")
+    for job_id, required_skills in op.get_bind().execute(live_jobs):
+        try:
+            skills = json.loads(required_skills or "[]")
+        except ValueError:
+            continue
+        if isinstance(skills, list):
+            rows += [{"job_id": job_id, "skill_id": skill_id} for skill_id in skill_ids_for(skills)]
+    if rows:
+        op.bulk_insert(job_skills, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_skills_skill_job', table_name='job_skills')
+    op.drop_index(op.f('ix_job_skills_id'), table_name='job_skills')
+    op.drop_table('job_skills')
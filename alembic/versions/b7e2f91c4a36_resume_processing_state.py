@@ -0,0 +1,29 @@
+"""Resume background processing state
+
+Revision ID: b7e2f91c4a36
+Revises: a1c4e7d2b9f0
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2f91c4a36'
+down_revision: Union[str, Sequence[str], None] = 'a1c4e7d2b9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('ai_error', sa.Text(), nullable=True))
+    op.add_column('resumes', sa.Column('ai_started_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('resumes', 'ai_started_at')
+    op.drop_column('resumes', 'ai_error')
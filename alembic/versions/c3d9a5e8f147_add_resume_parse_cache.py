@@ -0,0 +1,45 @@
+"""Add resume_parse_cache table
+
+Revision ID: c3d9a5e8f147
+Revises: b7e2f91c4a36
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d9a5e8f147'
+down_revision: Union[str, Sequence[str], None] = 'b7e2f91c4a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'resume_parse_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('parser_version', sa.String(length=100), nullable=False),
+        sa.Column('parsed', sa.Text(), nullable=False),
+        sa.Column('embedding', sa.LargeBinary(), nullable=True),
+        sa.Column('embedding_model', sa.String(length=100), nullable=True),
+        sa.Column('size_bytes', sa.Integer(), nullable=True),
+        sa.Column('hits', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_used_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('content_hash', 'parser_version', name='uq_parse_cache_hash_version'),
+    )
+    op.create_index(op.f('ix_resume_parse_cache_id'), 'resume_parse_cache', ['id'], unique=False)
+    op.create_index(op.f('ix_resume_parse_cache_last_used_at'), 'resume_parse_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_resume_parse_cache_last_used_at'), table_name='resume_parse_cache')
+    op.drop_index(op.f('ix_resume_parse_cache_id'), table_name='resume_parse_cache')
+    op.drop_table('resume_parse_cache')
@@ -0,0 +1,53 @@
+"""job_search_documents for full-text job search
+
+Revision ID: c7f1d3b9e482
+Revises: b2e6a8d4c391
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f1d3b9e482'
+down_revision: Union[str, Sequence[str], None] = 'b2e6a8d4c391'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_search_documents',
+        sa.Column('job_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('tags', sa.String(length=255), nullable=True),
+        sa.Column('company', sa.String(length=100), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id']),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    op.execute(
+        "INSERT INTO job_search_documents (job_id, title, description, tags, company, updated_at)"
+        " SELECT jobs.id, jobs.title, jobs.description, jobs.tags, employers.company_name, CURRENT_TIMESTAMP"
+        " FROM jobs LEFT OUTER JOIN employers ON employers.id = jobs.employer_id WHERE jobs.is_active = 1"
+    )
+    # built after the backfill: loading first and indexing once is much faster on InnoDB.
+    # SQLite's FTS5 table is created (and filled) by job_search.ensure_schema() at startup.
+    if op.get_bind().dialect.name in ("mysql", "mariadb"):
+        op.create_index('ft_job_search_documents', 'job_search_documents',
+                        ['title', 'description', 'tags', 'company'], mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ("job_search_documents_ai", "job_search_documents_ad", "job_search_documents_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS job_search_fts")
+    if op.get_bind().dialect.name in ("mysql", "mariadb"):
+        op.drop_index('ft_job_search_documents', table_name='job_search_documents')
+    op.drop_table('job_search_documents')
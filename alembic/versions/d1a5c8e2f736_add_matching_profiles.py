@@ -0,0 +1,53 @@
+"""matching_profiles: per-user matching data of the latest scored resume
+
+Revision ID: d1a5c8e2f736
+Revises: c7f1d3b9e482
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1a5c8e2f736'
+down_revision: Union[str, Sequence[str], None] = 'c7f1d3b9e482'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # rows are built on first use from the user's latest scored resume, so no backfill here
+    op.create_table(
+        'matching_profiles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('resume_id', sa.Integer(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=True),
+        sa.Column('title', sa.String(length=100), nullable=True),
+        sa.Column('file_url', sa.String(length=255), nullable=True),
+        sa.Column('skills', sa.Text(), nullable=True),
+        sa.Column('skill_ids', sa.Text(), nullable=True),
+        sa.Column('education', sa.Text(), nullable=True),
+        sa.Column('experience', sa.Text(), nullable=True),
+        sa.Column('text_head', sa.Text(), nullable=True),
+        sa.Column('embedding', sa.LargeBinary(), nullable=True),
+        sa.Column('embedding_codec', sa.String(length=16), nullable=True),
+        sa.Column('embedding_model', sa.String(length=100), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_matching_profiles_id'), 'matching_profiles', ['id'], unique=False)
+    op.create_index(op.f('ix_matching_profiles_user_id'), 'matching_profiles', ['user_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_matching_profiles_user_id'), table_name='matching_profiles')
+    op.drop_index(op.f('ix_matching_profiles_id'), table_name='matching_profiles')
+    op.drop_table('matching_profiles')
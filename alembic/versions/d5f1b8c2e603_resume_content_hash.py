@@ -0,0 +1,29 @@
+"""Resume content hash for content-addressed storage
+
+Revision ID: d5f1b8c2e603
+Revises: c3d9a5e8f147
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f1b8c2e603'
+down_revision: Union[str, Sequence[str], None] = 'c3d9a5e8f147'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_resumes_content_hash'), 'resumes', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_resumes_content_hash'), table_name='resumes')
+    op.drop_column('resumes', 'content_hash')
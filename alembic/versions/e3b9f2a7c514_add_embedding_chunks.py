@@ -0,0 +1,41 @@
+"""embedding_chunks: per-chunk vector cache for pooled document embeddings
+
+Revision ID: e3b9f2a7c514
+Revises: d1a5c8e2f736
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9f2a7c514'
+down_revision: Union[str, Sequence[str], None] = 'd1a5c8e2f736'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # document vectors change with the new EMBED_MODEL_VERSION and are rebuilt lazily,
+    # filling this table as they go
+    op.create_table(
+        'embedding_chunks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('chunk_hash', sa.String(length=40), nullable=False),
+        sa.Column('model_version', sa.String(length=100), nullable=False),
+        sa.Column('vector', sa.LargeBinary(), nullable=False),
+        sa.Column('codec', sa.String(length=16), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('chunk_hash', 'model_version', name='uq_embedding_chunks_hash_model'),
+    )
+    op.create_index(op.f('ix_embedding_chunks_id'), 'embedding_chunks', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_embedding_chunks_id'), table_name='embedding_chunks')
+    op.drop_table('embedding_chunks')
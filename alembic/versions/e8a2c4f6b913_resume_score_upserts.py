@@ -0,0 +1,42 @@
+"""Unique resume/job pairs, top-K index and staleness on resume_scores
+
+Revision ID: e8a2c4f6b913
+Revises: d5f1b8c2e603
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a2c4f6b913'
+down_revision: Union[str, Sequence[str], None] = 'd5f1b8c2e603'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # keep only the newest row per (resume_id, job_id) before adding the unique constraint
+    op.execute(
+        "DELETE FROM resume_scores WHERE id NOT IN ("
+        " SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM resume_scores GROUP BY resume_id, job_id) AS newest)"
+    )
+    with op.batch_alter_table('resume_scores') as batch_op:
+        batch_op.add_column(sa.Column('is_stale', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_unique_constraint('uq_resume_scores_resume_job', ['resume_id', 'job_id'])
+        batch_op.create_index('ix_resume_scores_resume_score', ['resume_id', 'score'], unique=False)
+        batch_op.create_index(op.f('ix_resume_scores_job_id'), ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('resume_scores') as batch_op:
+        batch_op.drop_index(op.f('ix_resume_scores_job_id'))
+        batch_op.drop_index('ix_resume_scores_resume_score')
+        batch_op.drop_constraint('uq_resume_scores_resume_job', type_='unique')
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('is_stale')
@@ -0,0 +1,33 @@
+"""Codec column for stored job and resume embeddings
+
+Revision ID: f4b7d1e9a258
+Revises: e8a2c4f6b913
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b7d1e9a258'
+down_revision: Union[str, Sequence[str], None] = 'e8a2c4f6b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing blobs are raw float32; new ones are written with EMBED_CODEC
+    op.add_column('job_embeddings', sa.Column('codec', sa.String(length=16), nullable=False, server_default='float32'))
+    op.add_column('resume_parse_cache', sa.Column('embedding_codec', sa.String(length=16), nullable=True, server_default='float32'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # quantized blobs cannot be read as float32 any more; drop them so they get re-embedded
+    op.execute("DELETE FROM job_embeddings WHERE codec <> 'float32'")
+    op.execute("UPDATE resume_parse_cache SET embedding = NULL WHERE embedding_codec <> 'float32'")
+    op.drop_column('resume_parse_cache', 'embedding_codec')
+    op.drop_column('job_embeddings', 'codec')
@@ -0,0 +1,99 @@
+# backend/ai/chunking.py
+#
+# Splits resumes and job descriptions into chunks short enough for the embedding
+# model. MiniLM reads at most 256 word-pieces and silently drops the rest, so a
+# whole resume encoded as one text is mostly its first section.
+#
+# Chunks follow the document's sections: a new section starts at a line break
+# followed by a heading, or at a heading word ("Experience", "EDUCATION",
+# "Technical Skills:", ...) inside whitespace-normalized text, which is what
+# extract_document returns. Sections shorter than EMBED_CHUNK_MIN_WORDS are
+# joined to the next one. Sections longer than EMBED_CHUNK_WORDS are cut into
+# windows of that many words, overlapping by EMBED_CHUNK_OVERLAP. Editing one
+# section therefore changes only that section's chunks.
+
+import os
+import re
+
+EMBED_CHUNK_WORDS = int(os.getenv("EMBED_CHUNK_WORDS", "160"))  # ~1.3 word-pieces per word, under 256
+EMBED_CHUNK_OVERLAP = int(os.getenv("EMBED_CHUNK_OVERLAP", "20"))
+EMBED_CHUNK_MIN_WORDS = int(os.getenv("EMBED_CHUNK_MIN_WORDS", "24"))
+EMBED_MAX_CHUNKS = int(os.getenv("EMBED_MAX_CHUNKS", "32"))
+
+SECTION_HEADINGS = {
+    # resumes
+    "summary", "profile", "objective", "about", "experience", "employment", "work experience",
+    "professional experience", "work history", "education", "skills", "technical skills",
+    "key skills", "projects", "certifications", "certificates", "achievements", "awards",
+    "publications", "languages", "interests", "volunteering", "references", "training",
+    # job descriptions
+    "responsibilities", "requirements", "qualifications", "about us", "about the role",
+    "what you will do", "what we offer", "benefits", "nice to have", "preferred qualifications",
+}
+_MAX_HEADING_WORDS = max(len(heading.split()) for heading in SECTION_HEADINGS)
+_STRIP = ":-–—•|*#"
+
+def _heading_length(words: list, i: int) -> int:
+    """Number of words of a section heading starting at words[i], or 0."""
+    for n in range(min(_MAX_HEADING_WORDS, len(words) - i), 0, -1):
+        span = words[i:i + n]
+        candidate = " ".join(word.strip(_STRIP) for word in span).lower()
+        if candidate not in SECTION_HEADINGS:
+            continue
+        # prose mentions ("5 years of experience") are lower case and not followed by a colon
+        first = span[0].strip(_STRIP)
+        if first[:1].isupper() or span[-1].endswith(":"):
+            return n
+    return 0
+
+def _sections(text: str) -> list:
+    """Word lists of the text's sections, in order."""
+    sections = []
+    for block in re.split(r"\n\s*\n", text or ""):
+        words = block.split()
+        current = []
+        i = 0
+        while i < len(words):
+            n = _heading_length(words, i)
+            if n and current:
+                sections.append(current)
+                current = []
+            take = n or 1
+            current.extend(words[i:i + take])
+            i += take
+        if current:
+            sections.append(current)
+    return sections
+
+def _windows(words: list) -> list:
+    if len(words) <= EMBED_CHUNK_WORDS:
+        return [words]
+    step = max(1, EMBED_CHUNK_WORDS - EMBED_CHUNK_OVERLAP)
+    windows = []
+    for start in range(0, len(words), step):
+        windows.append(words[start:start + EMBED_CHUNK_WORDS])
+        if start + EMBED_CHUNK_WORDS >= len(words):
+            break
+    return windows
+
+def chunk_document(text: str) -> list:
+    """
+    The text's chunks, in document order, each at most EMBED_CHUNK_WORDS words
+    joined by single spaces. An empty text gives one empty chunk, so every
+    document gets a vector.
+    """
+    merged = []
+    pending = []
+    for words in _sections(text):
+        pending.extend(words)
+        if len(pending) >= EMBED_CHUNK_MIN_WORDS:
+            merged.append(pending)
+            pending = []
+    if pending:
+        if merged and len(merged[-1]) + len(pending) <= EMBED_CHUNK_WORDS:
+            merged[-1].extend(pending)
+        else:
+            merged.append(pending)
+
+    chunks = [" ".join(window) for words in merged for window in _windows(words)]
+    return chunks[:EMBED_MAX_CHUNKS] or [""]
@@ -0,0 +1,118 @@
+# backend/ai/embed_client.py
+#
+# Client side of the shared embedding server (backend/ai/embed_server.py). When
+# EMBED_SERVER_SOCKET is set, the registry's "embedder" is an EmbedClient instead
+# of a local embedding backend, so API workers hold no model weights and their
+# encodes are batched together with everyone else's. The server must run the
+# same EMBED_BACKEND/model as the worker expects; that is checked on connect.
+#
+# Wire format, both directions: frames of a 4-byte big-endian length + payload.
+# A request is one JSON frame ({"op": "encode", "texts": [...], "normalize": bool},
+# {"op": "info"} or {"op": "stats"}). A response is one JSON frame; an encode
+# response ({"rows": n, "dim": d}) is followed by one frame of n x d float32.
+
+import json
+import os
+import socket
+import struct
+import threading
+import numpy as np
+
+from backend.ai.embedding_backends import EmbeddingBackend, MODEL_VERSION
+
+EMBED_SERVER_SOCKET = os.getenv("EMBED_SERVER_SOCKET", "").strip()
+EMBED_SERVER_TIMEOUT = float(os.getenv("EMBED_SERVER_TIMEOUT", "30"))
+# the server's largest batch; bigger encodes are sent as several requests of this size
+EMBED_BATCH_MAX_TEXTS = int(os.getenv("EMBED_BATCH_MAX_TEXTS", "64"))
+
+FRAME_LENGTH = struct.Struct(">I")
+
+class EmbedServerError(RuntimeError):
+    pass
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("embedding server closed the connection")
+        buf.extend(chunk)
+    return bytes(buf)
+
+def send_frame(sock: socket.socket, payload: bytes):
+    sock.sendall(FRAME_LENGTH.pack(len(payload)) + payload)
+
+def recv_frame(sock: socket.socket) -> bytes:
+    (size,) = FRAME_LENGTH.unpack(_recv_exact(sock, FRAME_LENGTH.size))
+    return _recv_exact(sock, size)
+
+
+class EmbedClient(EmbeddingBackend):
+    """An embedding backend that runs in the shared server. One connection per thread."""
+    name = "remote"
+
+    def __init__(self, path: str = EMBED_SERVER_SOCKET, timeout: float = EMBED_SERVER_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        # fail at load time, not on the first upload
+        info = self.info()
+        if info["model_version"] != MODEL_VERSION:
+            raise EmbedServerError(
+                f"embedding server at {path} runs {info['model_version']}, this worker expects {MODEL_VERSION}"
+            )
+        self.model_version = info["model_version"]
+        self.dim = info["dim"]
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.path)
+        self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _call(self, request: dict, with_payload: bool = False):
+        data = json.dumps(request).encode("utf-8")
+        while True:
+            sock = getattr(self._local, "sock", None)
+            reused = sock is not None
+            try:
+                if sock is None:
+                    sock = self._connect()
+                send_frame(sock, data)
+                header = json.loads(recv_frame(sock))
+                payload = recv_frame(sock) if with_payload and "error" not in header else None
+                break
+            except OSError as e:
+                self._close()
+                # a kept-alive connection may predate a server restart: retry once on a new one
+                if not reused or isinstance(e, socket.timeout):
+                    raise
+        if "error" in header:
+            raise EmbedServerError(header["error"])
+        return header, payload
+
+    def info(self) -> dict:
+        return self._call({"op": "info"})[0]
+
+    def stats(self) -> dict:
+        return self._call({"op": "stats"})[0]
+
+    def encode(self, texts: list, normalize: bool = True) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        texts = list(texts)
+        parts = []
+        for start in range(0, len(texts), EMBED_BATCH_MAX_TEXTS):
+            header, payload = self._call(
+                {"op": "encode", "texts": texts[start:start + EMBED_BATCH_MAX_TEXTS], "normalize": normalize},
+                with_payload=True,
+            )
+            parts.append(np.frombuffer(payload, dtype=np.float32).reshape(header["rows"], header["dim"]))
+        return parts[0] if len(parts) == 1 else np.vstack(parts)
@@ -0,0 +1,203 @@
+# backend/ai/embed_server.py
+#
+# Shared embedding server: one process holds the embedding model and every
+# API worker on the host sends it texts over a Unix socket (backend/ai/embed_client.py).
+# Requests arriving within EMBED_BATCH_WAIT_MS of each other are encoded as one
+# batch (up to EMBED_BATCH_MAX_TEXTS texts), which is far cheaper per text than
+# many single encodes, and the model's weights are in memory once per host.
+#
+#   python -m backend.ai.embed_server [--socket /tmp/jobmatcher-embed.sock]
+#
+# then start the API workers with EMBED_SERVER_SOCKET set to the same path.
+# Requests are refused with an error (not queued) when they would take the
+# queue past EMBED_SERVER_MAX_QUEUE texts; an empty queue takes any request. {"op": "stats"} returns queue depth,
+# batch-size histograms and timings; /health/metrics shows them.
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter, deque
+import numpy as np
+
+from backend.ai.embed_client import EMBED_BATCH_MAX_TEXTS, EMBED_SERVER_SOCKET, FRAME_LENGTH
+from backend.ai.registry import load_local_embedder
+
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+EMBED_SERVER_MAX_QUEUE = int(os.getenv("EMBED_SERVER_MAX_QUEUE", "2048"))
+DEFAULT_SOCKET = EMBED_SERVER_SOCKET or "/tmp/jobmatcher-embed.sock"
+
+_HISTOGRAM_BINS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+def _bin(n: int) -> str:
+    for upper in _HISTOGRAM_BINS:
+        if n <= upper:
+            return f"<={upper}"
+    return f">{_HISTOGRAM_BINS[-1]}"
+
+
+class EmbedServer:
+    def __init__(self, model):
+        self.model = model
+        self.dim = model.dim
+        self.queue = asyncio.Queue()
+        self.queued_texts = 0
+        self.counters = {"requests": 0, "texts": 0, "batches": 0, "rejected": 0, "errors": 0}
+        self.batch_texts = Counter()     # histogram of texts per batch
+        self.batch_requests = Counter()  # histogram of requests merged per batch
+        self.encode_ms = deque(maxlen=1000)
+        self.wait_ms = deque(maxlen=1000)
+
+    # ---------------------------
+    # BATCHING
+    # ---------------------------
+
+    async def _next_batch(self) -> list:
+        """Block for one request, then collect more for up to EMBED_BATCH_WAIT_MS."""
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        size = len(batch[0][0])
+        deadline = loop.time() + EMBED_BATCH_WAIT_MS / 1000
+        while size < EMBED_BATCH_MAX_TEXTS:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    async def run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            texts = [text for request_texts, _, _, _ in batch for text in request_texts]
+            self.queued_texts -= len(texts)
+            started = time.perf_counter()
+            for _, _, _, enqueued in batch:
+                self.wait_ms.append((started - enqueued) * 1000)
+            try:
+                # off the event loop, so new requests keep queueing for the next batch
+                vectors = await loop.run_in_executor(None, lambda: self.model.encode(texts, normalize=False))
+            except Exception as e:
+                self.counters["errors"] += 1
+                for _, _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.encode_ms.append((time.perf_counter() - started) * 1000)
+            self.counters["batches"] += 1
+            self.batch_texts[_bin(len(texts))] += 1
+            self.batch_requests[_bin(len(batch))] += 1
+
+            start = 0
+            for request_texts, normalize, future, _ in batch:
+                rows = vectors[start:start + len(request_texts)]
+                start += len(request_texts)
+                if normalize:
+                    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+                    rows = rows / np.where(norms > 0, norms, 1)
+                if not future.done():
+                    future.set_result(np.ascontiguousarray(rows, dtype=np.float32))
+
+    # ---------------------------
+    # CONNECTIONS
+    # ---------------------------
+
+    def stats(self) -> dict:
+        def pct(values, p):
+            values = sorted(values)
+            return round(values[min(len(values) - 1, int(p * len(values)))], 2) if values else None
+
+        return {
+            "backend": self.model.name,
+            "model_version": self.model.model_version,
+            "queue_depth": self.queue.qsize(),
+            "queued_texts": self.queued_texts,
+            **self.counters,
+            "batch_texts": dict(self.batch_texts),
+            "batch_requests": dict(self.batch_requests),
+            "wait_ms": {"p50": pct(self.wait_ms, 0.50), "p99": pct(self.wait_ms, 0.99)},
+            "encode_ms": {"p50": pct(self.encode_ms, 0.50), "p99": pct(self.encode_ms, 0.99)},
+        }
+
+    async def _encode(self, texts: list, normalize: bool):
+        if self.queued_texts and self.queued_texts + len(texts) > EMBED_SERVER_MAX_QUEUE:
+            self.counters["rejected"] += 1
+            return {"error": f"embedding server busy ({self.queued_texts} texts queued)"}, None
+        future = asyncio.get_running_loop().create_future()
+        self.queued_texts += len(texts)
+        self.counters["requests"] += 1
+        self.counters["texts"] += len(texts)
+        await self.queue.put((texts, normalize, future, time.perf_counter()))
+        try:
+            vectors = await future
+        except Exception as e:
+            return {"error": f"encode failed: {e}"}, None
+        return {"rows": int(vectors.shape[0]), "dim": int(vectors.shape[1])}, vectors.tobytes()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    (size,) = FRAME_LENGTH.unpack(await reader.readexactly(FRAME_LENGTH.size))
+                    request = json.loads(await reader.readexactly(size))
+                except asyncio.IncompleteReadError:
+                    break  # client went away
+
+                payload = None
+                op = request.get("op")
+                if op == "encode":
+                    texts = [str(text) for text in request.get("texts") or []]
+                    header, payload = await self._encode(texts, bool(request.get("normalize")))
+                elif op == "info":
+                    header = {"backend": self.model.name, "model_version": self.model.model_version, "dim": self.dim}
+                elif op == "stats":
+                    header = self.stats()
+                else:
+                    header = {"error": f"unknown op {op!r}"}
+
+                data = json.dumps(header).encode("utf-8")
+                writer.write(FRAME_LENGTH.pack(len(data)) + data)
+                if payload is not None:
+                    writer.write(FRAME_LENGTH.pack(len(payload)) + payload)
+                await writer.drain()
+        except (ConnectionError, ValueError) as e:
+            print("Embedding server connection dropped:", e)
+        finally:
+            writer.close()
+
+
+async def serve(path: str):
+    model = load_local_embedder()
+    server = EmbedServer(model)
+    if os.path.exists(path):
+        os.unlink(path)  # left over from a previous run
+    unix_server = await asyncio.start_unix_server(server.handle, path=path)
+    os.chmod(path, 0o660)
+    batcher = asyncio.create_task(server.run_batches())
+    print(f"Embedding server: {model.name} backend, {model.model_version} (dim {server.dim}) on {path}, "
+          f"batches of up to {EMBED_BATCH_MAX_TEXTS} texts / {EMBED_BATCH_WAIT_MS}ms")
+    try:
+        async with unix_server:
+            await unix_server.serve_forever()
+    finally:
+        batcher.cancel()
+        if os.path.exists(path):
+            os.unlink(path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared micro-batching embedding server")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path to listen on")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.socket))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
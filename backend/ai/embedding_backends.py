@@ -0,0 +1,152 @@
+# backend/ai/embedding_backends.py
+#
+# What turns texts into vectors, picked with EMBED_BACKEND:
+#
+#   torch    SentenceTransformer(EMBED_MODEL_NAME) on PyTorch (default)
+#   onnx     the same model exported to ONNX and quantized to int8
+#            (backend/scripts/export_onnx_embedder.py), run by onnxruntime on CPU:
+#            no torch in the worker, a fraction of the memory, lower latency.
+#            Needs `pip install onnxruntime`; the model files are read from
+#            EMBED_ONNX_DIR
+#   hashing  signed feature hashing of words and word pairs into EMBED_HASH_DIM
+#            dims. No model files and fully deterministic, for tests and
+#            benchmarks on machines without the weights. Only lexical overlap, so
+#            not for production scores
+#
+# Every backend returns L2-normalized float32 rows. Each one has its own
+# `model_version`, which feeds EMBED_MODEL_VERSION, so switching backends
+# rebuilds stored vectors instead of mixing incompatible ones. The shared
+# embedding server (embed_server.py) runs whichever backend is configured, and
+# workers talking to it must be configured the same way.
+
+import hashlib
+import os
+import re
+import numpy as np
+
+from backend.ai.registry import EMBED_MODEL_NAME
+
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch").strip().lower()
+EMBED_ONNX_DIR = os.getenv(
+    "EMBED_ONNX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "onnx",
+                 EMBED_MODEL_NAME.replace("/", "__")),
+)
+EMBED_ONNX_FILE = os.getenv("EMBED_ONNX_FILE", "model_int8.onnx")
+EMBED_ONNX_THREADS = int(os.getenv("EMBED_ONNX_THREADS", "0"))  # 0 = onnxruntime default
+EMBED_MAX_TOKENS = int(os.getenv("EMBED_MAX_TOKENS", "256"))  # MiniLM's max_seq_length
+# texts per session.run: bounds the (batch, tokens, dim) activations and the padding to the longest text
+EMBED_ONNX_BATCH = int(os.getenv("EMBED_ONNX_BATCH", "32"))
+EMBED_HASH_DIM = int(os.getenv("EMBED_HASH_DIM", "384"))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms > 0, norms, 1)).astype(np.float32)
+
+
+class EmbeddingBackend:
+    name = ""
+    model_version = ""
+    dim = 0
+
+    def encode(self, texts: list, normalize: bool = True) -> np.ndarray:
+        """(len(texts), dim) float32; rows L2-normalized unless normalize=False."""
+        raise NotImplementedError
+
+
+class TorchBackend(EmbeddingBackend):
+    name = "torch"
+    model_version = EMBED_MODEL_NAME
+
+    def __init__(self):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(EMBED_MODEL_NAME)
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: list, normalize: bool = True) -> np.ndarray:
+        vectors = self.model.encode(list(texts), batch_size=max(1, min(len(texts), 64)), convert_to_numpy=True,
+                                    normalize_embeddings=normalize, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+
+
+class OnnxBackend(EmbeddingBackend):
+    name = "onnx"
+    model_version = f"{EMBED_MODEL_NAME}+onnx-{EMBED_ONNX_FILE.rsplit('.', 1)[0]}"
+
+    def __init__(self, model_dir: str = EMBED_ONNX_DIR):
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise RuntimeError("EMBED_BACKEND=onnx needs onnxruntime and tokenizers installed") from e
+        model_path = os.path.join(model_dir, EMBED_ONNX_FILE)
+        if not os.path.exists(model_path):
+            raise RuntimeError(f"{model_path} not found; run python -m backend.scripts.export_onnx_embedder")
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=EMBED_MAX_TOKENS)
+        self.tokenizer.enable_padding()
+        options = onnxruntime.SessionOptions()
+        if EMBED_ONNX_THREADS:
+            options.intra_op_num_threads = EMBED_ONNX_THREADS
+        self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.dim = int(self.session.get_outputs()[0].shape[-1])
+
+    def encode(self, texts: list, normalize: bool = True) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        texts = list(texts)
+        vectors = np.vstack([self._encode_batch(texts[start:start + EMBED_ONNX_BATCH])
+                             for start in range(0, len(texts), EMBED_ONNX_BATCH)])
+        return _normalize(vectors) if normalize else vectors
+
+    def _encode_batch(self, texts: list) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        token_vectors = self.session.run(None, {k: v for k, v in feeds.items() if k in self.input_names})[0]
+        # mean pooling over real tokens, as the sentence-transformers model does
+        mask = feeds["attention_mask"][:, :, None].astype(np.float32)
+        vectors = (token_vectors * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        return vectors.astype(np.float32)
+
+
+class HashingBackend(EmbeddingBackend):
+    name = "hashing"
+    model_version = f"hashing-{EMBED_HASH_DIM}"
+
+    _WORD_RE = re.compile(r"\w+")
+
+    def __init__(self, dim: int = EMBED_HASH_DIM):
+        self.dim = dim
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        words = self._WORD_RE.findall((text or "").lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            vector[digest % self.dim] += 1.0 if digest >> 63 else -1.0
+        return vector
+
+    def encode(self, texts: list, normalize: bool = True) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            vectors[i] = self._vector(text)
+        return _normalize(vectors) if normalize else vectors
+
+
+BACKENDS = {backend.name: backend for backend in (TorchBackend, OnnxBackend, HashingBackend)}
+
+if EMBED_BACKEND not in BACKENDS:
+    raise ValueError(f"EMBED_BACKEND must be one of {sorted(BACKENDS)}, got {EMBED_BACKEND!r}")
+
+# what the configured backend's vectors are, without loading it
+MODEL_VERSION = BACKENDS[EMBED_BACKEND].model_version
+
+def create_backend(name: str = EMBED_BACKEND) -> EmbeddingBackend:
+    return BACKENDS[name]()
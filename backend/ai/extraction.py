@@ -0,0 +1,247 @@
+# backend/ai/extraction.py
+#
+# PDF/DOCX text extraction off the API process. pypdf and docx2txt are pure
+# Python and hold the GIL, so a pathological document would stall every request
+# in the worker; here the work runs in up to EXTRACT_WORKERS extractor processes with
+#   - a hard per-document deadline: a task that overruns it has its own process
+#     killed (and replaced on the next call), other documents' tasks keep running,
+#   - a page budget (MAX_PAGES), and
+#   - per-page-range parallelism for long PDFs.
+# PDF pages are streamed back as they are read, so a timeout keeps the pages
+# that were already extracted.
+# This module is imported by the extractor processes, so keep it light.
+
+import inspect
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pypdf import PdfReader
+import docx2txt
+
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))  # 0 = run inline
+EXTRACT_TIMEOUT_SECONDS = float(os.getenv("EXTRACT_TIMEOUT_SECONDS", "20"))
+MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "40"))
+# PDFs longer than this are split into page ranges extracted in parallel
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("EXTRACT_PARALLEL_PAGE_THRESHOLD", "8"))
+PAGES_PER_TASK = int(os.getenv("EXTRACT_PAGES_PER_TASK", "4"))
+
+class ExtractorCrashed(RuntimeError):
+    pass
+
+# -----------------------------
+# WORK UNITS (run in extractor processes)
+# -----------------------------
+def _pdf_page_count(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+def _pdf_pages(file_path: str, start: int, stop: int, max_words: int = None):
+    """Yields the text of pages [start, stop). Stops early once `max_words` words were read."""
+    reader = PdfReader(file_path)
+    words = 0
+    for index in range(start, min(stop, len(reader.pages))):
+        try:
+            part = reader.pages[index].extract_text() or ""
+        except Exception:
+            part = ""
+        yield part
+        words += len(part.split())
+        if max_words is not None and words >= max_words:
+            break
+
+def _docx_text(file_path: str) -> str:
+    return docx2txt.process(file_path) or ""
+
+def _serve(conn):
+    """Extractor process loop: run (fn, args) requests; generator results are streamed item by item."""
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            result = fn(*args)
+            if inspect.isgenerator(result):
+                for item in result:
+                    conn.send(("item", item))
+                result = None
+            conn.send(("done", result))
+        except Exception as e:
+            try:
+                conn.send(("error", e))
+            except Exception:  # exception that does not pickle
+                conn.send(("error", RuntimeError(repr(e))))
+
+# -----------------------------
+# EXTRACTOR PROCESSES
+# -----------------------------
+class _Extractor:
+    """One extractor process, running one task at a time over a pipe."""
+
+    def __init__(self):
+        # spawn, not fork: the API process has threads (uvicorn, resume workers)
+        context = multiprocessing.get_context("spawn")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child,), daemon=True, name="extractor")
+        self.process.start()
+        child.close()
+
+    def call(self, fn, args: tuple, deadline: float, items: list):
+        """fn(*args) in the process; streamed items are appended to `items` as they arrive."""
+        self.conn.send((fn, args))
+        while True:
+            if not self.conn.poll(max(0.0, deadline - time.monotonic())):
+                raise TimeoutError()
+            try:
+                kind, value = self.conn.recv()
+            except (EOFError, OSError):
+                raise ExtractorCrashed("extractor process died") from None
+            if kind == "item":
+                items.append(value)
+            elif kind == "error":
+                raise value
+            else:
+                return value
+
+    def kill(self):
+        self.process.terminate()
+        self.conn.close()
+        self.process.join(timeout=1)
+
+
+_slots = threading.BoundedSemaphore(max(1, EXTRACT_WORKERS))
+_idle = queue.LifoQueue()
+_live = set()
+_live_lock = threading.Lock()
+# runs the page-range tasks of long PDFs concurrently; each blocks on an extractor
+_dispatch = ThreadPoolExecutor(max_workers=max(1, EXTRACT_WORKERS), thread_name_prefix="extract")
+
+def _checkout() -> _Extractor:
+    try:
+        return _idle.get_nowait()
+    except queue.Empty:
+        pass
+    extractor = _Extractor()
+    with _live_lock:
+        _live.add(extractor)
+    return extractor
+
+def _discard(extractor: _Extractor):
+    with _live_lock:
+        _live.discard(extractor)
+    extractor.kill()
+
+def _run(fn, *args, deadline: float, items: list = None):
+    """
+    Run fn(*args) in an extractor process, or inline when EXTRACT_WORKERS=0.
+    Raises TimeoutError at `deadline`, after killing only the process that ran this task;
+    items a generator fn yielded before that are already in `items`.
+    """
+    items = [] if items is None else items
+    if EXTRACT_WORKERS <= 0:
+        result = fn(*args)
+        if inspect.isgenerator(result):
+            items.extend(result)
+            return None
+        return result
+
+    if not _slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+        raise TimeoutError()
+    try:
+        extractor = _checkout()
+        try:
+            result = extractor.call(fn, args, deadline, items)
+        except (TimeoutError, ExtractorCrashed):
+            _discard(extractor)
+            raise
+        _idle.put(extractor)
+        return result
+    finally:
+        _slots.release()
+
+def shutdown():
+    _dispatch.shutdown(wait=False, cancel_futures=True)
+    with _live_lock:
+        extractors = list(_live)
+        _live.clear()
+    for extractor in extractors:
+        extractor.kill()
+
+# -----------------------------
+# PUBLIC
+# -----------------------------
+def read_document(file_path: str, max_words: int, max_pages: int = MAX_PAGES,
+                  timeout: float = EXTRACT_TIMEOUT_SECONDS) -> dict:
+    """
+    Extract up to `max_words` words from the first `max_pages` pages within `timeout` seconds.
+    Returns {"words", "pages_read", "page_count", "truncated_reason"} where truncated_reason is
+    None, "word_limit", "page_limit" or "timeout". A timeout keeps whatever was read in order.
+    """
+    deadline = time.monotonic() + timeout
+    lowered = file_path.lower()
+    if lowered.endswith(".docx"):
+        page_count, reason = 1, None
+        try:
+            parts = [_run(_docx_text, file_path, deadline=deadline)]
+        except TimeoutError:
+            parts, reason = [], "timeout"
+    elif lowered.endswith(".pdf"):
+        parts, page_count, reason = _read_pdf(file_path, max_words, max_pages, deadline)
+    else:
+        raise ValueError("Unsupported file format. Only PDF/DOCX allowed.")
+
+    words = []
+    for part in parts:
+        words.extend(part.split())
+        if len(words) >= max_words:
+            if len(words) > max_words:
+                reason = "word_limit"
+            del words[max_words:]
+            break
+
+    if reason:
+        print(f"Extraction of {os.path.basename(file_path)} cut off ({reason}): "
+              f"{len(parts)}/{page_count} pages, {len(words)} words")
+    return {"words": words, "pages_read": len(parts), "page_count": page_count, "truncated_reason": reason}
+
+def _read_pdf(file_path: str, max_words: int, max_pages: int, deadline: float):
+    try:
+        page_count = _run(_pdf_page_count, file_path, deadline=deadline)
+    except TimeoutError:
+        return [], 0, "timeout"
+
+    pages = min(page_count, max_pages)
+    reason = "page_limit" if page_count > max_pages else None
+
+    # short documents: one task, reads pages in order and stops at the word budget
+    if pages <= PARALLEL_PAGE_THRESHOLD or EXTRACT_WORKERS <= 1:
+        parts = []
+        try:
+            _run(_pdf_pages, file_path, 0, pages, max_words, deadline=deadline, items=parts)
+        except TimeoutError:
+            reason = "timeout"
+        return parts, page_count, reason
+
+    # long documents: page ranges in parallel, reassembled in order. Every range
+    # stops at the deadline on its own, so waiting for all of them is bounded.
+    ranges = [(start, min(start + PAGES_PER_TASK, pages)) for start in range(0, pages, PAGES_PER_TASK)]
+    range_parts = [[] for _ in ranges]
+    futures = [
+        _dispatch.submit(_run, _pdf_pages, file_path, start, stop, deadline=deadline, items=items)
+        for (start, stop), items in zip(ranges, range_parts)
+    ]
+    wait(futures)
+    parts = []
+    for future, items in zip(futures, range_parts):
+        error = future.exception()
+        if isinstance(error, TimeoutError):
+            # keep only the contiguous prefix that was read
+            parts.extend(items)
+            reason = "timeout"
+            break
+        if error is not None:
+            raise error
+        parts.extend(items)
+    return parts, page_count, reason
@@ -0,0 +1,235 @@
+# backend/ai/llm.py
+#
+# LLM client used by the resume parser. Every call gets
+#   - a deadline (LLM_TIMEOUT_SECONDS per attempt),
+#   - a slot in a bounded concurrency pool (LLM_MAX_CONCURRENCY, waiting at most LLM_QUEUE_TIMEOUT_SECONDS)
+#     per attempt. A slot is one executor thread: an abandoned (timed out) call keeps
+#     its slot until its thread really returns, so attempts never queue behind hung calls,
+#   - retries with exponential backoff + jitter for timeouts / rate limits / 5xx,
+#   - a circuit breaker that fails fast while the provider is degraded,
+# and latency/error counters for /health/metrics.
+#
+# LLM_BACKEND=gemini (default) talks to Gemini; LLM_BACKEND=fake answers locally
+# (no network, configurable latency and failure rate) for offline load tests.
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from backend.ai.registry import get_gemini_model
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "20"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "5"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "0.5"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "800"))
+FAKE_LLM_FAILURE_RATE = float(os.getenv("FAKE_LLM_FAILURE_RATE", "0"))
+
+# provider errors worth retrying (matched by class name so google.api_core stays optional)
+RETRYABLE_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "ConnectionError", "LLMTimeout",
+}
+
+# -----------------------------
+# ERRORS
+# -----------------------------
+class LLMError(Exception):
+    pass
+
+class LLMTimeout(LLMError):
+    pass
+
+class LLMUnavailable(LLMError):
+    """Raised without calling the provider: circuit open or no free slot in time."""
+    pass
+
+# -----------------------------
+# BACKENDS
+# -----------------------------
+class GeminiBackend:
+    name = "gemini"
+
+    def generate(self, prompt: str, timeout: float) -> str:
+        response = get_gemini_model().generate_content(prompt, request_options={"timeout": timeout})
+        return response.text
+
+class FakeLLMBackend:
+    """Offline stand-in: sleeps like a real provider, then answers from the local extractor."""
+    name = "fake"
+
+    def __init__(self, latency_ms: float = FAKE_LLM_LATENCY_MS, failure_rate: float = FAKE_LLM_FAILURE_RATE):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+
+    def generate(self, prompt: str, timeout: float) -> str:
+        from backend.ai.resume_parser import fallback_parse
+
+        # +-25% jitter so load tests see a realistic latency spread
+        time.sleep(self.latency_ms * random.uniform(0.75, 1.25) / 1000)
+        if random.random() < self.failure_rate:
+            raise RuntimeError("fake provider failure")
+        match = re.search(r"-{5,}\s*(.*?)\s*-{5,}", prompt, re.S)
+        return json.dumps(fallback_parse(match.group(1) if match else prompt))
+
+# -----------------------------
+# CIRCUIT BREAKER
+# -----------------------------
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Closed: always. Open: never. Half-open: one probe request at a time."""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """The probe was admitted but never reached the provider; let the next call probe."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+# -----------------------------
+# CLIENT
+# -----------------------------
+class LLMClient:
+    def __init__(self, backend, timeout: float = LLM_TIMEOUT_SECONDS, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 queue_timeout: float = LLM_QUEUE_TIMEOUT_SECONDS, max_retries: int = LLM_MAX_RETRIES,
+                 backoff: float = LLM_BACKOFF_SECONDS, breaker: CircuitBreaker = None):
+        self.backend = backend
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker(LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS)
+        # one slot per executor thread, given back when the thread finishes (see _attempt)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        # calls run here so a hung provider call can be abandoned at its deadline
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._latencies = deque(maxlen=500)
+        self._counters = {"calls": 0, "successes": 0, "failures": 0, "timeouts": 0,
+                          "retries": 0, "rejected": 0}
+        self._counters_lock = threading.Lock()
+
+    def _count(self, name: str):
+        with self._counters_lock:
+            self._counters[name] += 1
+
+    def _attempt(self, prompt: str) -> str:
+        """One provider call on a free executor thread; the caller holds a slot for it."""
+        try:
+            future = self._executor.submit(self.backend.generate, prompt, self.timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+        # the slot frees up with the thread, not when we stop waiting for it
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            self._count("timeouts")
+            raise LLMTimeout(f"LLM call exceeded {self.timeout}s")
+
+    def generate(self, prompt: str) -> str:
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise LLMUnavailable("circuit open, provider recently failing")
+
+        self._count("calls")
+        for attempt in range(self.max_retries + 1):
+            # waiting for a slot is not the provider's fault: no breaker failure, no retry
+            if not self._slots.acquire(timeout=self.queue_timeout):
+                self._count("rejected")
+                self.breaker.release_probe()
+                raise LLMUnavailable(f"no free LLM slot within {self.queue_timeout}s")
+            started = time.perf_counter()
+            try:
+                text = self._attempt(prompt)
+            except Exception as e:
+                retryable = type(e).__name__ in RETRYABLE_ERRORS
+                if not retryable or attempt == self.max_retries:
+                    self._count("failures")
+                    self.breaker.record_failure()
+                    raise
+                self._count("retries")
+                time.sleep(self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5))
+                continue
+            self._latencies.append(time.perf_counter() - started)
+            self._count("successes")
+            self.breaker.record_success()
+            return text
+
+    def stats(self) -> dict:
+        with self._counters_lock:
+            counters = dict(self._counters)
+        latencies = sorted(self._latencies)
+
+        def pct(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3) if latencies else None
+
+        return {
+            "backend": self.backend.name,
+            "circuit": self.breaker.state,
+            **counters,
+            "latency_p50_s": pct(0.50),
+            "latency_p95_s": pct(0.95),
+            "latency_max_s": round(latencies[-1], 3) if latencies else None,
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_llm_client() -> LLMClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            backend = FakeLLMBackend() if LLM_BACKEND == "fake" else GeminiBackend()
+            _client = LLMClient(backend)
+        return _client
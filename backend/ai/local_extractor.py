@@ -0,0 +1,148 @@
+# backend/ai/local_extractor.py
+#
+# Rule-based resume extractor that runs before the LLM. It segments the text
+# into sections (Experience / Education / Skills / ...), pulls out name, email,
+# phone, skills (via the skill taxonomy), education and experience, and scores
+# how confident it is.
+# parse_resume only calls the LLM when required fields are missing or the
+# confidence is below RESUME_LOCAL_CONFIDENCE.
+
+import re
+
+from backend.ai.skill_taxonomy import find_skill_ids, skill_name
+
+# -----------------------------
+# SECTIONS
+# -----------------------------
+# longest first so "WORK EXPERIENCE" wins over "EXPERIENCE"
+SECTION_HEADERS = {
+    "experience": ["WORK EXPERIENCE", "PROFESSIONAL EXPERIENCE", "EMPLOYMENT HISTORY", "EXPERIENCE", "EMPLOYMENT", "INTERNSHIPS"],
+    "education": ["ACADEMIC BACKGROUND", "EDUCATIONAL QUALIFICATIONS", "EDUCATION", "QUALIFICATIONS"],
+    "skills": ["TECHNICAL SKILLS", "KEY SKILLS", "CORE COMPETENCIES", "SKILLS", "EXPERTISE", "TECHNOLOGIES"],
+    "projects": ["PERSONAL PROJECTS", "PROJECTS"],
+    "summary": ["PROFESSIONAL SUMMARY", "CAREER OBJECTIVE", "SUMMARY", "OBJECTIVE", "PROFILE", "ABOUT ME"],
+    "certifications": ["CERTIFICATIONS", "CERTIFICATES", "COURSES"],
+    "other": ["DECLARATION", "REFERENCES", "LANGUAGES", "INTERESTS", "HOBBIES", "AWARDS", "ACHIEVEMENTS"],
+}
+
+_HEADER_TO_SECTION = {h: section for section, headers in SECTION_HEADERS.items() for h in headers}
+_HEADER_ALTERNATION = "|".join(sorted((re.escape(h) for h in _HEADER_TO_SECTION), key=len, reverse=True))
+# text arrives whitespace-normalized, so a header is an ALL-CAPS run ("EDUCATION Bachelor ...")
+# or a title-case word followed by a colon ("Skills: Python, ...")
+_HEADER_RE = re.compile(
+    rf"(?<![A-Za-z])(?:(?P<caps>{_HEADER_ALTERNATION})(?![A-Za-z])|(?P<title>{_HEADER_ALTERNATION})\s*:)",
+    re.IGNORECASE,
+)
+
+def segment_sections(text: str) -> dict:
+    """Split text into {"header": ..., "experience": ..., ...}; text before the first header is "header"."""
+    matches = []
+    for m in _HEADER_RE.finditer(text):
+        if m.group("caps") and not m.group("caps").isupper():
+            continue  # "experience" mid-sentence is not a header
+        matches.append(m)
+
+    sections = {"header": text[:matches[0].start()].strip() if matches else text}
+    for i, m in enumerate(matches):
+        name = _HEADER_TO_SECTION[(m.group("caps") or m.group("title")).upper()]
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        body = text[m.end():end].strip(" :-–—")
+        sections[name] = f"{sections[name]} {body}".strip() if name in sections else body
+    return sections
+
+# -----------------------------
+# FIELDS
+# -----------------------------
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w])\+?\(?\d[\d\s().-]{7,}\d(?![\w])")
+_NAME_STOP_RE = re.compile(r"Email|E-mail|Phone|Mobile|Tel|Address|\||@|\d", re.IGNORECASE)
+
+EDUCATION_KEYWORDS = [
+    "PhD", "Doctorate", "Master", "MBA", "M.Sc", "M.Tech", "MCA", "Bachelor", "B.Sc", "B.Tech", "BCA", "BBA",
+    "Engineering", "Diploma", "Associate", "High School", "Higher Secondary",
+]
+_EDU_RE = re.compile(
+    r"(?<![\w.])(" + "|".join(sorted((re.escape(e) for e in EDUCATION_KEYWORDS), key=len, reverse=True)) + r")(?![\w])",
+    re.IGNORECASE,
+)
+_EDU_CANONICAL = {e.lower(): e for e in EDUCATION_KEYWORDS}
+
+def extract_name(header: str):
+    candidate_zone = _NAME_STOP_RE.split(header, maxsplit=1)[0]
+    parts = []
+    for token in candidate_zone.split()[:6]:
+        if not (token.isalpha() and token[0].isupper()):
+            break
+        parts.append(token)
+    if 2 <= len(parts) <= 4:
+        return " ".join(p.capitalize() if p.isupper() else p for p in parts)
+    return None
+
+def extract_phone(text: str):
+    for match in PHONE_RE.finditer(text):
+        digits = re.sub(r"\D", "", match.group(0))
+        if 9 <= len(digits) <= 15:
+            return match.group(0).strip()
+    return None
+
+def extract_skills(text: str, skills_section: str = None) -> list:
+    """Canonical skill names; ambiguous spellings ("Go", "R") only count inside the Skills section."""
+    found = {}
+    for skill_id in find_skill_ids(skills_section or "") + find_skill_ids(text, include_ambiguous=False):
+        found.setdefault(skill_id, skill_name(skill_id))
+    return list(found.values())
+
+def extract_education(text: str, education_section: str = None) -> list:
+    found = {}
+    for m in _EDU_RE.finditer(education_section or text):
+        key = m.group(1).lower()
+        found.setdefault(key, _EDU_CANONICAL[key])
+    return list(found.values())
+
+def extract_experience(experience_section: str) -> list:
+    if not experience_section:
+        return []
+    entries = [e.strip(" •·-–—*") for e in re.split(r"\s[•·▪●]\s|\s\*\s", experience_section)]
+    return [e for e in entries if len(e.split()) >= 2][:20]
+
+# -----------------------------
+# CONFIDENCE
+# -----------------------------
+FIELD_WEIGHTS = {"name": 0.15, "email": 0.2, "phone": 0.1, "skills": 0.25, "education": 0.15, "experience": 0.15}
+
+def _text_quality(text: str) -> float:
+    """Letter-spaced or garbled PDFs ("A A Y U S H") produce mostly 1-char tokens."""
+    tokens = text.split()
+    if not tokens:
+        return 0.0
+    single = sum(1 for t in tokens if len(t) == 1 and t.isalnum())
+    return max(0.0, 1.0 - 2 * single / len(tokens))
+
+def confidence(fields: dict, text: str) -> float:
+    score = 0.0
+    for field, weight in FIELD_WEIGHTS.items():
+        value = fields.get(field)
+        if field == "skills":
+            score += weight * min(1.0, len(value or []) / 3)
+        elif value:
+            score += weight
+    return round(score * _text_quality(text), 3)
+
+# -----------------------------
+# PUBLIC
+# -----------------------------
+def extract_local(text: str) -> dict:
+    """Rule-based parse of whitespace-normalized resume text, plus a 0..1 "confidence"."""
+    sections = segment_sections(text)
+    emails = EMAIL_RE.findall(text)
+    fields = {
+        "name": extract_name(sections.get("header", "")),
+        "email": emails[0] if emails else None,
+        "phone": extract_phone(text),
+        "skills": extract_skills(text, sections.get("skills")),
+        "education": extract_education(text, sections.get("education")),
+        "experience": extract_experience(sections.get("experience")),
+    }
+    fields["confidence"] = confidence(fields, text)
+    fields["sections"] = [name for name in sections if name != "header"]
+    return fields
@@ -0,0 +1,129 @@
+# backend/ai/registry.py
+#
+# Heavy models (SentenceTransformer, CrossEncoder, Gemini client) are loaded on first use or
+# through warm_up(), never at import time, so `import backend.main` stays cheap
+# and a worker can answer health checks before any model is in memory.
+
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+# -----------------------------
+# ENVIRONMENT
+# -----------------------------
+ENV_FILE = os.getenv(
+    "JOBMATCHER_ENV_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env"),
+)
+load_dotenv(dotenv_path=ENV_FILE)  # a missing file is fine, real env vars still apply
+
+EMBED_MODEL_NAME = os.getenv("EMBED_MODEL_NAME", "all-MiniLM-L6-v2")
+GEM_MODEL_NAME = os.getenv("GEM_MODEL_NAME", "gemini-2.5-flash")
+CROSS_ENCODER_NAME = os.getenv("CROSS_ENCODER_NAME", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+
+# -----------------------------
+# REGISTRY
+# -----------------------------
+class ModelRegistry:
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._load_seconds = {}
+        self._errors = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks[name] = threading.Lock()
+
+    def get(self, name: str):
+        """Return the model, loading it on first use. Concurrent callers wait for one load."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+            started = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._errors[name] = str(e)
+                raise
+            self._load_seconds[name] = round(time.perf_counter() - started, 3)
+            self._errors.pop(name, None)
+            self._models[name] = model
+            print(f"Loaded model '{name}' in {self._load_seconds[name]}s")
+            return model
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def warm_up(self, names=None) -> dict:
+        """Load the given (default: all) models now; failures are reported, not raised."""
+        for name in names or list(self._loaders):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Warm-up of '{name}' failed:", e)
+        return self.status()
+
+    def status(self) -> dict:
+        return {
+            name: {
+                "loaded": name in self._models,
+                "load_seconds": self._load_seconds.get(name),
+                "error": self._errors.get(name),
+            }
+            for name in self._loaders
+        }
+
+
+registry = ModelRegistry()
+
+# -----------------------------
+# LOADERS
+# -----------------------------
+def load_local_embedder():
+    # EMBED_BACKEND: torch / onnx / hashing, see backend/ai/embedding_backends.py
+    from backend.ai.embedding_backends import create_backend
+    return create_backend()
+
+def _load_embedder():
+    # EMBED_SERVER_SOCKET: use the host's shared embedding server (backend/ai/embed_server.py)
+    # instead of a model copy in every worker
+    from backend.ai.embed_client import EMBED_SERVER_SOCKET, EmbedClient
+    if EMBED_SERVER_SOCKET:
+        return EmbedClient(EMBED_SERVER_SOCKET)
+    return load_local_embedder()
+
+def _load_cross_encoder():
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(CROSS_ENCODER_NAME, max_length=512, device="cpu")
+
+def _load_gemini():
+    api_key = os.getenv("GEM_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEM_API_KEY is not set")
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(GEM_MODEL_NAME)
+
+registry.register("embedder", _load_embedder)
+registry.register("gemini", _load_gemini)
+registry.register("cross_encoder", _load_cross_encoder)
+
+def get_embed_model():
+    return registry.get("embedder")
+
+def get_gemini_model():
+    return registry.get("gemini")
+
+def get_cross_encoder():
+    return registry.get("cross_encoder")
@@ -0,0 +1,123 @@
+# backend/ai/reranker.py
+#
+# Optional last stage of job search: a small CPU cross-encoder reads the resume
+# and one job posting together and scores how well they match, which the
+# whole-document cosine of the first stage cannot. It only ever sees the top
+# RERANK_TOP_N jobs of a request.
+#
+#   RERANK_ENABLED=1       turn it on (off by default)
+#   RERANK_TOP_N=20        jobs reranked per request
+#   RERANK_BUDGET_MS=150   longest a request waits for the model; past it the
+#                          request keeps the first-stage order, and the batch
+#                          finishes in the background and fills the cache
+#
+# Scores are cached per (resume hash, job text hash) in an in-process LRU, so
+# repeating or refining a search costs no model calls. At most
+# RERANK_MAX_PENDING batches run or wait at a time; beyond that requests skip
+# the rerank instead of queueing behind it.
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import numpy as np
+
+from backend.ai.registry import get_cross_encoder
+
+RERANK_ENABLED = os.getenv("RERANK_ENABLED", "0") == "1"
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "20"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "150"))
+RERANK_MAX_PENDING = int(os.getenv("RERANK_MAX_PENDING", "2"))
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "20000"))
+RERANK_MAX_CHARS = 2000  # the model truncates at 512 tokens anyway
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+_cache = OrderedDict()  # (resume hash, job hash) -> relevance 0-1, LRU order
+_cache_lock = threading.Lock()
+_pending = 0
+_counters = {"requests": 0, "pairs_cached": 0, "pairs_scored": 0, "timeouts": 0, "skipped": 0, "errors": 0}
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1((text or "").encode("utf-8", "ignore")).hexdigest()
+
+def _returns_probabilities(model) -> bool:
+    """
+    Whether the model's own activation is a sigmoid (activation_fn in sentence-transformers
+    4+, default_activation_function before). Otherwise predict() gives logits, for every batch.
+    """
+    activation = getattr(model, "activation_fn", None) or getattr(model, "default_activation_function", None)
+    return activation is not None and type(activation).__name__ == "Sigmoid"
+
+def _score_pairs(keys: list, pairs: list):
+    global _pending
+    try:
+        model = get_cross_encoder()
+        scores = np.asarray(model.predict(pairs, batch_size=len(pairs), show_progress_bar=False),
+                            dtype=np.float32).reshape(-1)
+        # decided by the model, not by each batch's range, so every cached score is on one scale
+        if not _returns_probabilities(model):
+            scores = 1.0 / (1.0 + np.exp(-scores))
+        with _cache_lock:
+            for key, score in zip(keys, scores):
+                _cache[key] = float(score)
+            while len(_cache) > RERANK_CACHE_SIZE:
+                _cache.popitem(last=False)
+            _counters["pairs_scored"] += len(keys)
+    finally:
+        with _cache_lock:
+            _pending -= 1
+
+def relevance(resume_hash: str, resume_text: str, jobs: list, budget_ms: float = RERANK_BUDGET_MS):
+    """
+    Cross-encoder relevance (0-1) of the resume to each (job hash, job text) in
+    `jobs`, or None when the scores are not ready within `budget_ms`.
+    """
+    global _pending
+    keys = [(resume_hash, job_hash) for job_hash, _ in jobs]
+    with _cache_lock:
+        _counters["requests"] += 1
+        found = {}
+        for key in keys:
+            if key in _cache:
+                _cache.move_to_end(key)
+                found[key] = _cache[key]
+        _counters["pairs_cached"] += len(found)
+        missing = [i for i, key in enumerate(keys) if key not in found]
+        if missing:
+            if _pending >= RERANK_MAX_PENDING:
+                _counters["skipped"] += 1
+                return None
+            _pending += 1
+
+    if missing:
+        resume_text = (resume_text or "")[:RERANK_MAX_CHARS]
+        future = _executor.submit(
+            _score_pairs,
+            [keys[i] for i in missing],
+            [(resume_text, (jobs[i][1] or "")[:RERANK_MAX_CHARS]) for i in missing],
+        )
+        try:
+            future.result(timeout=budget_ms / 1000)
+        except FutureTimeout:
+            # not cancelled: the batch still lands in the cache for the next request
+            with _cache_lock:
+                _counters["timeouts"] += 1
+            return None
+        except Exception as e:
+            with _cache_lock:
+                _counters["errors"] += 1
+            print("Cross-encoder rerank failed:", e)
+            return None
+        with _cache_lock:
+            for i in missing:
+                found[keys[i]] = _cache.get(keys[i], 0.0)
+    return [found[key] for key in keys]
+
+def stats() -> dict:
+    with _cache_lock:
+        return {"enabled": RERANK_ENABLED, "top_n": RERANK_TOP_N, "budget_ms": RERANK_BUDGET_MS,
+                "cached_pairs": len(_cache), "pending": _pending, **_counters}
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
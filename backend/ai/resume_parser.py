@@ -3,7 +3,7 @@
 # from pdfminer.high_level import extract_text
 # import docx2txt
 # import spacy
-# from sentence_transformers import SentenceTransformer, util
+# from sentence_transformers import SentenceTransformer
 #
 # # Load spaCy NLP model
 # nlp = spacy.load("en_core_web_sm")
@@ -133,32 +133,22 @@
 import os
 import re
 import json
-from pypdf import PdfReader
-import docx2txt
-from sentence_transformers import SentenceTransformer, util
-import google.generativeai as genai
-from dotenv import load_dotenv
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from backend.ai.chunking import chunk_document, EMBED_CHUNK_WORDS
+from backend.ai.embedding_backends import MODEL_VERSION as EMBEDDING_BACKEND_VERSION
+from backend.ai.extraction import read_document
+from backend.ai.llm import get_llm_client, LLM_BACKEND
+from backend.ai.local_extractor import extract_local
+from backend.ai.skill_taxonomy import canonicalize_skills, get_matcher, skill_ids_for
+from backend.ai.registry import GEM_MODEL_NAME, get_embed_model
 
-# -----------------------------
-# LOAD API KEY
-# -----------------------------
-dotenv_path = r"C:\jobmatcher\backend\.env"
-print("Looking for .env at:", dotenv_path)
-
-if not os.path.exists(dotenv_path):
-    raise FileNotFoundError(f".env not found at {dotenv_path}")
-
-load_dotenv(dotenv_path=dotenv_path)
-API_KEY = os.getenv("GEM_API_KEY")
-if not API_KEY:
-    raise ValueError("GEM_API_KEY not found in .env")
-
-print("GEM_API_KEY loaded successfully")
-
-genai.configure(api_key=API_KEY)
-GEM_MODEL = genai.GenerativeModel("gemini-2.5-flash")
-
-embed_model = SentenceTransformer("all-MiniLM-L6-v2")
+# Identifies what produced a parse; bump the suffix whenever the prompt or the
+# post-processing changes so cached parses from the old version are ignored.
+PARSER_VERSION = f"{GEM_MODEL_NAME if LLM_BACKEND == 'gemini' else LLM_BACKEND}/4"
 
 # -----------------------------
 # SANITIZATION
@@ -193,37 +183,58 @@ def sanitize_obj(obj):
 # -----------------------------
 # EXTRACT TEXT FROM FILE
 # -----------------------------
-def extract_text_from_file(file_path: str) -> str:
+MAX_WORDS = 3000  # keep smaller to avoid Gemini rejection
+PREVIEW_CHARS = 300
+
+def extract_document(file_path: str, max_words: int = MAX_WORDS) -> dict:
+    """
+    Single extraction pass shared by the preview and the parser. Runs in the
+    extraction process pool with page and time budgets (see backend.ai.extraction)
+    and stops once `max_words` words are collected.
+    Returns {"text", "preview", "truncated", "truncated_reason", "pages_read", "page_count"};
+    text is whitespace-normalized and UTF-8 clean.
+    """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    text = ""
-    if file_path.lower().endswith(".pdf"):
-        reader = PdfReader(file_path)
-        for page in reader.pages:
-            try:
-                part = page.extract_text()
-                if part:
-                    text += part + "\n"
-            except:
-                continue
-    elif file_path.lower().endswith(".docx"):
-        text = docx2txt.process(file_path)
-    else:
-        raise ValueError("Unsupported file format. Only PDF/DOCX allowed.")
+    result = read_document(file_path, max_words=max_words)
+    text = clean_str(" ".join(result["words"]))
+    return {
+        "text": text,
+        "preview": text[:PREVIEW_CHARS],
+        "truncated": result["truncated_reason"] is not None,
+        "truncated_reason": result["truncated_reason"],
+        "pages_read": result["pages_read"],
+        "page_count": result["page_count"],
+    }
 
-    # Truncate long resumes for Gemini
-    words = text.split()
-    if len(words) > 3000:  # keep smaller to avoid Gemini rejection
-        text = " ".join(words[:3000])
-    return clean_str(text)
+def extract_text_from_file(file_path: str) -> str:
+    return extract_document(file_path)["text"]
 
 # -----------------------------
 # PARSE RESUME
 # -----------------------------
+# The local extractor's answer is used as-is when it is confident enough and has
+# every required field; otherwise the LLM is asked.
+RESUME_LOCAL_CONFIDENCE = float(os.getenv("RESUME_LOCAL_CONFIDENCE", "0.75"))
+RESUME_REQUIRED_FIELDS = [f.strip() for f in os.getenv("RESUME_REQUIRED_FIELDS", "email,skills").split(",") if f.strip()]
+PARSED_FIELDS = ["name", "email", "phone", "skills", "education", "experience"]
+
+_source_counts = {"local": 0, "llm": 0, "fallback": 0}
+_source_counts_lock = threading.Lock()
+
+def fallback_parse(text: str) -> dict:
+    """Local rule-based parse (no LLM), limited to the fields the LLM returns."""
+    local = extract_local(text)
+    return {field: local[field] for field in PARSED_FIELDS}
+
+def local_parse_is_enough(local: dict) -> bool:
+    missing = [field for field in RESUME_REQUIRED_FIELDS if not local.get(field)]
+    return not missing and local["confidence"] >= RESUME_LOCAL_CONFIDENCE
+
 def parse_resume(file_path: str) -> dict:
-    raw_text = extract_text_from_file(file_path)
-    text = clean_str(re.sub(r"\s+", " ", raw_text))
+    document = extract_document(file_path)
+    text = document["text"]
 
     prompt = f"""
     You are an AI resume parser. Extract ONLY the following fields from the resume text and RETURN STRICT JSON.
@@ -252,61 +263,222 @@ def parse_resume(file_path: str) -> dict:
     ---------------------------
     """
 
-    try:
-        print("Sending to Gemini...")
-        response = GEM_MODEL.generate_content(prompt)
-        resp_text = response.text.strip()
-        if resp_text.startswith("```"):
-            resp_text = resp_text.strip("`").strip()
-        parsed = json.loads(resp_text)
-    except Exception as e:
-        print("Gemini failed or returned invalid JSON, using fallback regex:", e)
-        # Fallback
-        email_match = re.findall(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)
-        phone_match = re.findall(r"\+?\d[\d\s-]{7,}\d", text)
-        skill_keywords = [
-            "Python", "Java", "Kotlin", "SQL", "Firebase",
-            "Android", "JavaScript", "React", "Machine Learning",
-            "Data Analysis", "HTML", "CSS", "FastAPI", "Jetpack", "Compose", "SQLAlchemy"
-        ]
-        skills_found = [skill for skill in skill_keywords if skill.lower() in text.lower()]
-        education_keywords = ["Bachelor", "Master", "B.Sc", "Engineering", "Diploma", "High School"]
-        education_found = [edu for edu in education_keywords if edu.lower() in text.lower()]
-        parsed = {
-            "name": None,
-            "email": email_match[0] if email_match else None,
-            "phone": phone_match[0] if phone_match else None,
-            "skills": skills_found,
-            "education": education_found,
-            "experience": []
-        }
+    local = extract_local(text)
+    if local_parse_is_enough(local):
+        parsed = {field: local[field] for field in PARSED_FIELDS}
+        source = "local"
+    else:
+        try:
+            print(f"Sending to {LLM_BACKEND} (local confidence {local['confidence']})...")
+            resp_text = get_llm_client().generate(prompt).strip()
+            if resp_text.startswith("```"):
+                resp_text = resp_text.strip("`").strip()
+            parsed = json.loads(resp_text)
+            source = "llm"
+        except Exception as e:
+            print("Gemini failed or returned invalid JSON, using local parse:", e)
+            parsed = {field: local[field] for field in PARSED_FIELDS}
+            source = "fallback"
 
     parsed = sanitize_obj(parsed)
-    parsed["text"] = sanitize_obj(text)
+    # same canonical names/ids as job required_skills, whichever tier answered
+    parsed["skills"] = canonicalize_skills(parsed.get("skills") if isinstance(parsed.get("skills"), list) else [])
+    parsed["skill_ids"] = skill_ids_for(parsed["skills"])
+    # text is already clean from extract_document, no second sanitize pass
+    parsed["text"] = text
+    parsed["preview"] = document["preview"]
+    parsed["truncated"] = document["truncated"]
+    parsed["truncated_reason"] = document["truncated_reason"]
+    parsed["source"] = source  # "local", "llm", or "fallback" (LLM needed but failed, local result)
+    parsed["local_confidence"] = local["confidence"]
+    with _source_counts_lock:
+        _source_counts[source] += 1
     return parsed
 
+def parse_stats() -> dict:
+    """How many parses each tier answered, for /health/metrics."""
+    with _source_counts_lock:
+        counts = dict(_source_counts)
+    total = sum(counts.values())
+    return {
+        **counts,
+        "local_rate": round(counts["local"] / total, 4) if total else None,
+        "local_confidence_threshold": RESUME_LOCAL_CONFIDENCE,
+        "required_fields": RESUME_REQUIRED_FIELDS,
+    }
+
+# -----------------------------
+# EMBEDDINGS
+# -----------------------------
+# Documents (resumes, job descriptions) are embedded chunk by chunk (see
+# backend/ai/chunking.py) and the chunk vectors pooled into one unit vector:
+#   EMBED_POOLING=mean   word-weighted mean of the chunks (default)
+#   EMBED_POOLING=max    element-wise max of the chunks
+# Chunk vectors are cached by sha1(chunk text): in an in-process LRU, and in
+# whatever `chunk_store` the caller passes (services/embedding_chunks keeps them
+# in the database), so an edited section is the only part re-encoded.
+EMBED_POOLING = os.getenv("EMBED_POOLING", "mean")
+if EMBED_POOLING not in ("mean", "max"):
+    raise ValueError(f"EMBED_POOLING must be 'mean' or 'max', got {EMBED_POOLING!r}")
+
+# Bump when the encode settings change so stored chunk vectors get rebuilt; the
+# backend's own version (EMBED_BACKEND, see embedding_backends.py) is part of it
+CHUNK_MODEL_VERSION = f"{EMBEDDING_BACKEND_VERSION}/1"
+# Bump when the embedded text, chunking or pooling change so stored document vectors get rebuilt
+EMBED_MODEL_VERSION = f"{EMBEDDING_BACKEND_VERSION}/2:{EMBED_POOLING}{EMBED_CHUNK_WORDS}"
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "8192"))  # chunks
+
+_embed_cache = OrderedDict()  # sha1(chunk text) -> normalized vector, LRU order
+_embed_cache_lock = threading.Lock()
+_embed_counters = {"documents": 0, "chunks": 0, "lru_hits": 0, "store_hits": 0, "encoded": 0}
+
+def embed_texts(texts: list) -> np.ndarray:
+    """Encode texts in one batch; rows are L2-normalized float32 so dot product == cosine."""
+    backend = get_embed_model()
+    if not texts:
+        return np.zeros((0, backend.dim), dtype=np.float32)
+    return backend.encode(list(texts))
+
+def chunk_hash(chunk: str) -> str:
+    return hashlib.sha1(chunk.encode("utf-8", "ignore")).hexdigest()
+
+def _pool(vectors: np.ndarray, weights: list) -> np.ndarray:
+    if EMBED_POOLING == "max":
+        pooled = vectors.max(axis=0)
+    else:
+        pooled = np.average(vectors, axis=0, weights=np.maximum(np.asarray(weights, dtype=np.float32), 1))
+    norm = np.linalg.norm(pooled)
+    return (pooled / norm if norm > 0 else pooled).astype(np.float32)
+
+def embed_documents(texts: list, chunk_store=None) -> np.ndarray:
+    """
+    One pooled, L2-normalized vector per text. Only chunks found neither in the
+    LRU nor in `chunk_store` (an object with load(hashes) -> {hash: vector} and
+    save({hash: vector})) go to the model, all in one batch.
+    """
+    chunked = [chunk_document(text) for text in texts]
+    keys = [[chunk_hash(chunk) for chunk in chunks] for chunks in chunked]
+    wanted = {}
+    for chunks, chunk_keys in zip(chunked, keys):
+        for chunk, key in zip(chunks, chunk_keys):
+            wanted.setdefault(key, chunk)
+
+    found = {}
+    with _embed_cache_lock:
+        for key in wanted:
+            if key in _embed_cache:
+                _embed_cache.move_to_end(key)
+                found[key] = _embed_cache[key]
+        _embed_counters["lru_hits"] += len(found)
+
+    loaded = {}
+    if chunk_store is not None and len(found) < len(wanted):
+        loaded = chunk_store.load([key for key in wanted if key not in found])
+        found.update(loaded)
+
+    missing = [key for key in wanted if key not in found]
+    encoded = {}
+    if missing:
+        encoded = dict(zip(missing, embed_texts([wanted[key] for key in missing])))
+        found.update(encoded)
+        if chunk_store is not None:
+            chunk_store.save(encoded)
+
+    with _embed_cache_lock:
+        for key, vector in {**loaded, **encoded}.items():
+            _embed_cache[key] = vector
+        while len(_embed_cache) > EMBED_CACHE_SIZE:
+            _embed_cache.popitem(last=False)
+        _embed_counters["documents"] += len(texts)
+        _embed_counters["chunks"] += len(wanted)
+        _embed_counters["store_hits"] += len(loaded)
+        _embed_counters["encoded"] += len(encoded)
+
+    if not texts:
+        return embed_texts([])
+    return np.vstack([
+        _pool(np.vstack([found[key] for key in chunk_keys]), [len(chunk.split()) for chunk in chunks])
+        for chunks, chunk_keys in zip(chunked, keys)
+    ])
+
+def embed_stats() -> dict:
+    """Chunk cache counters, for /health/metrics."""
+    with _embed_cache_lock:
+        return {"model_version": EMBED_MODEL_VERSION, "cached_chunks": len(_embed_cache), **_embed_counters}
+
 # -----------------------------
 # SCORE RESUME
 # -----------------------------
+_TOKEN_PUNCTUATION = ".,;:!?()[]{}\"'"
+
+def _skill_key(matcher, skill: str) -> str:
+    """Taxonomy id for a known skill name or synonym, else the lowercased text."""
+    return matcher.lookup(skill) or skill.lower()
+
+@lru_cache(maxsize=4096)
+def _job_features(job_description: str):
+    """
+    Per-job-text work that does not depend on the resume: lowered text + the
+    skill keys of its title-case tokens, so a job's "Spark" meets a resume's
+    canonical "Apache Spark".
+    """
+    matcher = get_matcher()
+    job_skills = [_skill_key(matcher, w.strip(_TOKEN_PUNCTUATION) or w)
+                  for w in job_description.split() if w.istitle()]
+    return job_description.lower(), frozenset(job_skills), len(job_skills)
+
+def score_features(resume_data: dict, jobs: list, job_vectors: np.ndarray = None,
+                   resume_vector: np.ndarray = None, similarity: bool = True) -> dict:
+    """
+    The parts of the match score, each an array aligned with `jobs`:
+    "skills" (share of the job's skills the resume has, 0-1), "education"
+    (0/1) and "similarity" (cosine of the embeddings; zeros if it cannot be
+    computed or similarity=False). Vectors work as in score_resume_batch.
+    """
+    matcher = get_matcher()
+    resume_skills = {_skill_key(matcher, skill) for skill in resume_data.get("skills", []) if isinstance(skill, str)}
+    edu_list = [edu.lower() for edu in resume_data.get("education", []) if isinstance(edu, str)]
+    features = [_job_features(job) for job in jobs]
+
+    matched = np.fromiter((len(resume_skills & skills) for _, skills, _ in features), dtype=np.float64, count=len(jobs))
+    totals = np.fromiter((total for _, _, total in features), dtype=np.float64, count=len(jobs))
+    skill_share = np.divide(matched, totals, out=np.zeros(len(jobs)), where=totals > 0)
+
+    edu_match = np.fromiter((any(edu in lowered for edu in edu_list) for lowered, _, _ in features), dtype=bool, count=len(jobs))
+
+    cosine = np.zeros(len(jobs), dtype=np.float32)
+    if similarity and jobs:
+        try:
+            if resume_vector is None:
+                resume_vector = embed_documents([resume_data["text"]])[0]
+            if job_vectors is None:
+                job_vectors = embed_documents(list(jobs))
+            cosine = np.asarray(job_vectors, dtype=np.float32) @ resume_vector
+        except:
+            pass
+
+    return {"skills": skill_share, "education": edu_match, "similarity": cosine}
+
+def score_resume_batch(resume_data: dict, jobs: list, job_vectors: np.ndarray = None,
+                       resume_vector: np.ndarray = None) -> list:
+    """
+    Score one resume against many job descriptions. Same result as calling
+    score_resume on each pair, but the resume is encoded once and the jobs in
+    one batch (or not at all when `job_vectors`, aligned with `jobs`, is given).
+    A stored `resume_vector` skips the resume encode as well.
+    """
+    if not jobs:
+        return []
+
+    features = score_features(resume_data, jobs, job_vectors, resume_vector)
+    scores = features["skills"] * 50            # 1. Skill match (max 50)
+    scores += features["education"] * 20        # 2. Education match (max 20)
+    scores += features["similarity"] * 30       # 3. Semantic similarity (max 30)
+
+    return [round(float(score), 2) for score in scores]
+
 def score_resume(resume_data: dict, job_description: str) -> float:
-    score = 0
-    resume_skills = resume_data.get("skills", [])
-    job_skills = [w for w in job_description.split() if w.istitle()]
-    matched = set(resume_skills) & set(job_skills)
-    if job_skills:
-        score += (len(matched) / len(job_skills)) * 50
-    edu_list = resume_data.get("education", [])
-    edu_match = any(isinstance(edu, str) and edu.lower() in job_description.lower() for edu in edu_list)
-    if edu_match:
-        score += 20
-    try:
-        res_emb = embed_model.encode(resume_data["text"], convert_to_tensor=True)
-        job_emb = embed_model.encode(job_description, convert_to_tensor=True)
-        similarity = util.pytorch_cos_sim(res_emb, job_emb).item()
-        score += similarity * 30
-    except:
-        pass
-    return round(score, 2)
+    return score_resume_batch(resume_data, [job_description])[0]
 
 if __name__ == "__main__":
     resume_path = r"C:\jobmatcher\backend\uploads\resumes\AAYUSH SHRESTHA.pdf"
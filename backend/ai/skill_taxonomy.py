@@ -0,0 +1,447 @@
+# backend/ai/skill_taxonomy.py
+#
+# Canonical skill taxonomy shared by resume parsing and job ingestion, so a
+# resume's "ReactJS" and a job's "react.js" both become skill id "react".
+#
+# All names and synonyms are compiled once into an Aho-Corasick automaton, and a
+# document is scanned in a single pass over its lowercased text. The cost is
+# linear in the text length plus the number of matches, not the taxonomy size.
+# Matches must sit on word boundaries, so "Java" is not found inside "JavaScript".
+# Overlapping matches resolve leftmost-longest, so "Spring Boot" wins over
+# "Spring" and "Node.js" wins over "JS".
+#
+# SKILL_TAXONOMY_FILE may point to a JSON list of {"id", "name", "aliases",
+# "ambiguous"} entries that extend or override the built-in table.
+
+import json
+import os
+import threading
+from collections import deque
+
+SKILL_TAXONOMY_FILE = os.getenv("SKILL_TAXONOMY_FILE")
+
+# characters that continue a token: "c" must not match in "c++" or "c#", "java" not in "java_home"
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_+#")
+
+# -----------------------------
+# TAXONOMY
+# -----------------------------
+# (id, display name, synonyms, ambiguous spellings)
+# ambiguous spellings are ordinary words or single letters ("go", "r", "excel") and
+# only count inside a resume's Skills section or a job's skill list; specific
+# spellings of the same skill ("golang", "Microsoft Excel") count anywhere
+_BUILTIN = [
+    # languages
+    ("python", "Python", ["python3", "python 3"], []),
+    ("java", "Java", ["core java", "java se", "java ee", "j2ee"], []),
+    ("kotlin", "Kotlin", [], []),
+    ("javascript", "JavaScript", ["js", "ecmascript", "es6", "vanilla js"], []),
+    ("typescript", "TypeScript", [], []),
+    ("c", "C", ["c language", "ansi c"], ["c"]),
+    ("cpp", "C++", ["cpp", "c plus plus"], []),
+    ("csharp", "C#", ["c sharp", "csharp"], []),
+    ("go", "Go", ["golang"], ["go"]),
+    ("rust", "Rust", [], []),
+    ("ruby", "Ruby", [], []),
+    ("php", "PHP", [], []),
+    ("swift", "Swift", [], []),
+    ("objective_c", "Objective-C", ["objective c", "objc", "obj-c"], []),
+    ("scala", "Scala", [], []),
+    ("r", "R", ["r language", "rstudio"], ["r"]),
+    ("matlab", "MATLAB", [], []),
+    ("perl", "Perl", [], []),
+    ("dart", "Dart", [], []),
+    ("lua", "Lua", [], []),
+    ("haskell", "Haskell", [], []),
+    ("elixir", "Elixir", [], []),
+    ("erlang", "Erlang", [], []),
+    ("clojure", "Clojure", [], []),
+    ("fsharp", "F#", ["f sharp"], []),
+    ("julia", "Julia", [], ["julia"]),
+    ("groovy", "Groovy", [], []),
+    ("visual_basic", "Visual Basic", ["vb.net", "vba", "vb"], []),
+    ("assembly", "Assembly", ["asm", "assembly language"], []),
+    ("fortran", "Fortran", [], []),
+    ("cobol", "COBOL", [], []),
+    ("solidity", "Solidity", [], []),
+    ("bash", "Bash", ["bash scripting"], []),
+    ("shell", "Shell Scripting", ["shell", "shell script", "unix shell", "zsh"], []),
+    ("powershell", "PowerShell", [], []),
+    ("sql", "SQL", ["structured query language"], []),
+    ("plsql", "PL/SQL", ["pl sql"], []),
+    ("tsql", "T-SQL", ["transact-sql"], []),
+    ("html", "HTML", ["html5"], []),
+    ("css", "CSS", ["css3"], []),
+    ("sass", "Sass", ["scss"], []),
+    ("less", "Less", [], ["less"]),
+    ("graphql", "GraphQL", [], []),
+    ("xml", "XML", [], []),
+    ("json", "JSON", [], []),
+    ("yaml", "YAML", [], []),
+    # web frontend
+    ("react", "React", ["react.js", "reactjs", "react js"], []),
+    ("react_native", "React Native", ["react-native"], []),
+    ("angular", "Angular", ["angularjs", "angular.js"], []),
+    ("vue", "Vue.js", ["vue", "vuejs", "vue js"], []),
+    ("nextjs", "Next.js", ["nextjs", "next js"], []),
+    ("nuxt", "Nuxt.js", ["nuxt", "nuxtjs"], []),
+    ("svelte", "Svelte", ["sveltekit"], []),
+    ("jquery", "jQuery", [], []),
+    ("bootstrap", "Bootstrap", [], []),
+    ("tailwind", "Tailwind CSS", ["tailwind", "tailwindcss"], []),
+    ("redux", "Redux", ["redux toolkit"], []),
+    ("webpack", "Webpack", [], []),
+    ("vite", "Vite", [], []),
+    ("babel", "Babel", [], []),
+    ("material_ui", "Material UI", ["mui", "material-ui"], []),
+    ("threejs", "Three.js", ["threejs"], []),
+    ("d3", "D3.js", ["d3", "d3js"], []),
+    ("web_components", "Web Components", [], []),
+    ("pwa", "Progressive Web Apps", ["pwa"], []),
+    # web backend
+    ("nodejs", "Node.js", ["node", "nodejs", "node js"], []),
+    ("express", "Express.js", ["express", "expressjs"], ["express"]),
+    ("nestjs", "NestJS", ["nest.js"], []),
+    ("django", "Django", ["django rest framework", "drf"], []),
+    ("flask", "Flask", [], []),
+    ("fastapi", "FastAPI", ["fast api"], []),
+    ("spring", "Spring", ["spring framework", "spring mvc"], ["spring"]),
+    ("spring_boot", "Spring Boot", ["springboot"], []),
+    ("hibernate", "Hibernate", [], []),
+    ("laravel", "Laravel", [], []),
+    ("symfony", "Symfony", [], []),
+    ("codeigniter", "CodeIgniter", [], []),
+    ("rails", "Ruby on Rails", ["rails", "ror"], []),
+    ("dotnet", ".NET", ["dotnet", ".net core", "dotnet core", ".net framework"], []),
+    ("aspnet", "ASP.NET", ["asp.net core", "asp.net mvc"], []),
+    ("gin", "Gin", [], ["gin"]),
+    ("grpc", "gRPC", [], []),
+    ("rest", "REST APIs", ["rest", "rest api", "restful", "restful api", "restful apis", "rest apis"], []),
+    ("soap", "SOAP", [], []),
+    ("websockets", "WebSockets", ["websocket", "socket.io"], []),
+    ("oauth", "OAuth", ["oauth2", "oauth 2.0"], []),
+    ("jwt", "JWT", ["json web token"], []),
+    ("microservices", "Microservices", ["microservice", "micro-services"], []),
+    ("celery", "Celery", [], []),
+    ("rabbitmq", "RabbitMQ", [], []),
+    ("kafka", "Apache Kafka", ["kafka"], []),
+    # mobile
+    ("android", "Android", ["android sdk", "android development"], []),
+    ("ios", "iOS", ["ios development"], []),
+    ("flutter", "Flutter", [], []),
+    ("jetpack", "Jetpack", ["android jetpack"], []),
+    ("jetpack_compose", "Jetpack Compose", ["compose"], ["compose"]),
+    ("swiftui", "SwiftUI", [], []),
+    ("uikit", "UIKit", [], []),
+    ("xamarin", "Xamarin", [], []),
+    ("ionic", "Ionic", [], []),
+    ("cordova", "Cordova", ["phonegap"], []),
+    ("retrofit", "Retrofit", [], []),
+    ("room", "Room", ["room database"], ["room"]),
+    ("coroutines", "Kotlin Coroutines", ["coroutines", "kotlin flow"], []),
+    ("mvvm", "MVVM", [], []),
+    ("dagger", "Dagger", ["dagger hilt", "hilt"], []),
+    ("firebase", "Firebase", ["firebase auth", "firebase cloud messaging", "fcm"], []),
+    ("firestore", "Firestore", ["cloud firestore"], []),
+    # data / ML
+    ("machine_learning", "Machine Learning", ["ml"], []),
+    ("deep_learning", "Deep Learning", [], []),
+    ("data_analysis", "Data Analysis", ["data analytics", "data analyst"], []),
+    ("data_science", "Data Science", [], []),
+    ("data_engineering", "Data Engineering", ["etl", "data pipelines"], []),
+    ("data_visualization", "Data Visualization", ["data viz"], []),
+    ("nlp", "NLP", ["natural language processing"], []),
+    ("computer_vision", "Computer Vision", [], []),
+    ("llm", "LLMs", ["llm", "large language models", "large language model"], []),
+    ("generative_ai", "Generative AI", ["genai", "gen ai"], []),
+    ("prompt_engineering", "Prompt Engineering", [], []),
+    ("rag", "RAG", ["retrieval augmented generation"], []),
+    ("tensorflow", "TensorFlow", [], []),
+    ("pytorch", "PyTorch", ["torch"], []),
+    ("keras", "Keras", [], []),
+    ("scikit_learn", "scikit-learn", ["sklearn", "scikit learn"], []),
+    ("pandas", "Pandas", [], []),
+    ("numpy", "NumPy", [], []),
+    ("scipy", "SciPy", [], []),
+    ("matplotlib", "Matplotlib", [], []),
+    ("seaborn", "Seaborn", [], []),
+    ("plotly", "Plotly", [], []),
+    ("opencv", "OpenCV", [], []),
+    ("huggingface", "Hugging Face", ["huggingface", "hugging face transformers"], []),
+    ("langchain", "LangChain", [], []),
+    ("xgboost", "XGBoost", [], []),
+    ("spark", "Apache Spark", ["spark", "pyspark"], []),
+    ("hadoop", "Hadoop", ["hdfs", "mapreduce"], []),
+    ("airflow", "Apache Airflow", ["airflow"], []),
+    ("dbt", "dbt", [], []),
+    ("snowflake", "Snowflake", [], []),
+    ("databricks", "Databricks", [], []),
+    ("bigquery", "BigQuery", [], []),
+    ("tableau", "Tableau", [], []),
+    ("power_bi", "Power BI", ["powerbi"], []),
+    ("looker", "Looker", [], []),
+    ("excel", "Microsoft Excel", ["excel", "ms excel", "advanced excel"], ["excel"]),
+    ("statistics", "Statistics", ["statistical analysis"], []),
+    ("jupyter", "Jupyter", ["jupyter notebook"], []),
+    # databases
+    ("mysql", "MySQL", [], []),
+    ("postgresql", "PostgreSQL", ["postgres", "psql"], []),
+    ("sqlite", "SQLite", [], []),
+    ("mongodb", "MongoDB", ["mongo"], []),
+    ("redis", "Redis", [], []),
+    ("cassandra", "Cassandra", [], []),
+    ("oracle_db", "Oracle Database", ["oracle", "oracle db"], []),
+    ("sql_server", "SQL Server", ["mssql", "ms sql", "microsoft sql server"], []),
+    ("mariadb", "MariaDB", [], []),
+    ("dynamodb", "DynamoDB", [], []),
+    ("elasticsearch", "Elasticsearch", ["elastic search", "elk"], []),
+    ("neo4j", "Neo4j", [], []),
+    ("couchdb", "CouchDB", [], []),
+    ("sqlalchemy", "SQLAlchemy", [], []),
+    ("supabase", "Supabase", [], []),
+    ("prisma", "Prisma", [], []),
+    ("orm", "ORM", [], []),
+    # cloud / devops
+    ("aws", "AWS", ["amazon web services"], []),
+    ("aws_lambda", "AWS Lambda", ["lambda"], ["lambda"]),
+    ("ec2", "EC2", ["aws ec2"], []),
+    ("s3", "S3", ["aws s3"], []),
+    ("azure", "Azure", ["microsoft azure"], []),
+    ("gcp", "Google Cloud", ["gcp", "google cloud platform"], []),
+    ("docker", "Docker", ["docker compose", "docker-compose"], []),
+    ("kubernetes", "Kubernetes", ["k8s"], []),
+    ("helm", "Helm", [], []),
+    ("terraform", "Terraform", [], []),
+    ("ansible", "Ansible", [], []),
+    ("jenkins", "Jenkins", [], []),
+    ("github_actions", "GitHub Actions", [], []),
+    ("gitlab_ci", "GitLab CI", ["gitlab ci/cd"], []),
+    ("ci_cd", "CI/CD", ["ci cd", "continuous integration", "continuous delivery", "continuous deployment"], []),
+    ("devops", "DevOps", [], []),
+    ("linux", "Linux", ["ubuntu", "debian", "centos", "red hat", "rhel"], []),
+    ("unix", "Unix", [], []),
+    ("nginx", "Nginx", [], []),
+    ("apache_http", "Apache HTTP Server", ["apache2", "httpd"], []),
+    ("git", "Git", [], []),
+    ("github", "GitHub", [], []),
+    ("gitlab", "GitLab", [], []),
+    ("bitbucket", "Bitbucket", [], []),
+    ("heroku", "Heroku", [], []),
+    ("vercel", "Vercel", [], []),
+    ("netlify", "Netlify", [], []),
+    ("serverless", "Serverless", [], []),
+    ("prometheus", "Prometheus", [], []),
+    ("grafana", "Grafana", [], []),
+    ("cloud_computing", "Cloud Computing", [], []),
+    # testing / practices
+    ("unit_testing", "Unit Testing", ["unit tests"], []),
+    ("tdd", "TDD", ["test driven development", "test-driven development"], []),
+    ("selenium", "Selenium", [], []),
+    ("cypress", "Cypress", [], []),
+    ("jest", "Jest", [], []),
+    ("pytest", "pytest", [], []),
+    ("junit", "JUnit", [], []),
+    ("postman", "Postman", [], []),
+    ("qa", "Quality Assurance", ["qa", "software testing", "manual testing"], []),
+    ("automation_testing", "Test Automation", ["automation testing", "automated testing"], []),
+    ("agile", "Agile", ["agile methodology"], []),
+    ("scrum", "Scrum", [], []),
+    ("kanban", "Kanban", [], []),
+    ("jira", "Jira", [], []),
+    ("confluence", "Confluence", [], []),
+    ("oop", "OOP", ["object oriented programming", "object-oriented programming"], []),
+    ("data_structures", "Data Structures", ["data structures and algorithms", "dsa"], []),
+    ("algorithms", "Algorithms", [], []),
+    ("system_design", "System Design", [], []),
+    ("design_patterns", "Design Patterns", [], []),
+    # design
+    ("figma", "Figma", [], []),
+    ("ui_ux", "UI/UX", ["ui ux", "ux design", "ui design", "user experience"], []),
+    ("photoshop", "Adobe Photoshop", ["photoshop"], []),
+    ("illustrator", "Adobe Illustrator", ["illustrator"], []),
+    ("adobe_xd", "Adobe XD", [], []),
+    ("sketch", "Sketch", [], ["sketch"]),
+    ("canva", "Canva", [], []),
+    # security / networking / systems
+    ("networking", "Networking", ["computer networks", "tcp/ip"], []),
+    ("cybersecurity", "Cybersecurity", ["cyber security", "information security", "infosec"], []),
+    ("penetration_testing", "Penetration Testing", ["pentesting", "ethical hacking"], []),
+    ("blockchain", "Blockchain", ["web3"], []),
+    ("embedded_systems", "Embedded Systems", ["embedded"], []),
+    ("iot", "IoT", ["internet of things"], []),
+    ("arduino", "Arduino", [], []),
+    ("raspberry_pi", "Raspberry Pi", [], []),
+    # business / soft skills
+    ("project_management", "Project Management", [], []),
+    ("product_management", "Product Management", [], []),
+    ("digital_marketing", "Digital Marketing", [], []),
+    ("seo", "SEO", ["search engine optimization"], []),
+    ("content_writing", "Content Writing", ["copywriting"], []),
+    ("accounting", "Accounting", ["tally"], []),
+    ("sales", "Sales", [], ["sales"]),
+    ("customer_service", "Customer Service", ["customer support"], []),
+    ("communication", "Communication", ["communication skills"], []),
+    ("leadership", "Leadership", [], []),
+    ("teamwork", "Teamwork", ["team work", "team player"], []),
+    ("problem_solving", "Problem Solving", ["problem-solving"], []),
+    ("time_management", "Time Management", [], []),
+    ("critical_thinking", "Critical Thinking", [], []),
+    ("ms_office", "Microsoft Office", ["ms office", "microsoft word", "ms word", "powerpoint"], []),
+]
+
+# -----------------------------
+# AUTOMATON
+# -----------------------------
+class SkillMatcher:
+    """Aho-Corasick automaton over lowercased skill names and synonyms."""
+
+    def __init__(self, entries):
+        self.names = {}       # skill id -> display name
+        self._aliases = {}    # lowercased name/synonym -> skill id
+        self._ambiguous = set()  # aliases that need an explicit skills context
+        for skill_id, name, aliases, ambiguous in entries:
+            self.names[skill_id] = name
+            for alias in [name, *aliases]:
+                key = " ".join(alias.lower().split())
+                if not key:
+                    continue
+                self._aliases[key] = skill_id
+                self._ambiguous.discard(key)
+            self._ambiguous.update(" ".join(a.lower().split()) for a in ambiguous)
+
+        # trie: _goto[state] maps a char to the next state, _out[state] lists (length, skill id, ambiguous)
+        self._goto = [{}]
+        self._out = [[]]
+        for alias, skill_id in self._aliases.items():
+            state = 0
+            for ch in alias:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(alias), skill_id, alias in self._ambiguous))
+
+        # failure links, breadth first; outputs inherit those of their failure state
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __len__(self):
+        return len(self._aliases)
+
+    def _scan(self, text: str):
+        """Yield (start, end, skill id, ambiguous) for every boundary-respecting match in `text`."""
+        lowered = " ".join(text.lower().split())
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            after = lowered[end] if end < len(lowered) else " "
+            for length, skill_id, ambiguous in out[state]:
+                start = end - length
+                before = lowered[start - 1] if start > 0 else " "
+                # the pattern's own edge chars decide which neighbours would extend the token
+                if (lowered[start] in _WORD_CHARS and before in _WORD_CHARS) or \
+                        (lowered[end - 1] in _WORD_CHARS and after in _WORD_CHARS):
+                    continue
+                if lowered[start].isalnum() and before == "." and start > 1 and lowered[start - 2].isalnum():
+                    continue  # "js" in "node.js" when node.js itself is not an alias
+                yield start, end, skill_id, ambiguous
+
+    def find(self, text: str, include_ambiguous: bool = True) -> list:
+        """Canonical skill ids in order of first appearance, leftmost-longest, without duplicates."""
+        if not text:
+            return []
+        matches = sorted(self._scan(text), key=lambda m: (m[0], m[0] - m[1]))
+        found = {}
+        covered_until = 0
+        for start, end, skill_id, ambiguous in matches:
+            if start < covered_until:
+                continue
+            covered_until = end
+            if include_ambiguous or not ambiguous:
+                found.setdefault(skill_id, None)
+        return list(found)
+
+    def lookup(self, name: str):
+        """Skill id for an exact name or synonym (any case/spacing), else None."""
+        if not isinstance(name, str):
+            return None
+        return self._aliases.get(" ".join(name.lower().split()))
+
+
+def _load_entries() -> list:
+    entries = list(_BUILTIN)
+    if SKILL_TAXONOMY_FILE:
+        with open(SKILL_TAXONOMY_FILE, encoding="utf-8") as f:
+            for item in json.load(f):
+                entries.append((item["id"], item["name"], item.get("aliases", []), item.get("ambiguous", [])))
+    return entries
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+def get_matcher() -> SkillMatcher:
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = SkillMatcher(_load_entries())
+        return _matcher
+
+# -----------------------------
+# PUBLIC
+# -----------------------------
+def skill_name(skill_id: str) -> str:
+    return get_matcher().names.get(skill_id, skill_id)
+
+def find_skill_ids(text: str, include_ambiguous: bool = True) -> list:
+    return get_matcher().find(text, include_ambiguous)
+
+def canonicalize_skills(skills) -> list:
+    """
+    Map free-form skill strings (a job's required_skills, the LLM's "skills") to
+    canonical display names, de-duplicated. Entries that are not an exact
+    name/synonym are scanned for known skills; strings with no known skill are
+    kept as written so nothing the user typed is lost.
+    """
+    matcher = get_matcher()
+    result = {}
+    for raw in skills or []:
+        if not isinstance(raw, str) or not raw.strip():
+            continue
+        skill_id = matcher.lookup(raw)
+        ids = [skill_id] if skill_id else matcher.find(raw)
+        if ids:
+            for found in ids:
+                result.setdefault(found, matcher.names[found])
+        else:
+            text = " ".join(raw.split())
+            result.setdefault(text.lower(), text)
+    return list(result.values())
+
+def skill_ids_for(skills) -> list:
+    """Canonical ids for a list of skill strings; unknown skills are dropped."""
+    matcher = get_matcher()
+    ids = {}
+    for raw in skills or []:
+        skill_id = matcher.lookup(raw)
+        for found in ([skill_id] if skill_id else matcher.find(raw) if isinstance(raw, str) else []):
+            ids.setdefault(found, None)
+    return list(ids)
@@ -0,0 +1,100 @@
+# backend/ai/vector_codec.py
+#
+# Binary encodings for stored embeddings (job_embeddings.vector, the parse
+# cache's resume embedding and the in-memory job index). Vectors are unit
+# length, which keeps quantization error small:
+#
+#   float32  4 bytes/dim   exact
+#   float16  2 bytes/dim   ~1e-3 relative error
+#   int8     1 byte/dim    + 4-byte per-vector scale (max |x| / 127)
+#
+# Blobs decode zero-copy with np.frombuffer; quantized matrices score a query
+# chunk by chunk, so only CHUNK_ROWS rows are ever widened to float32 at a time.
+# EMBED_CODEC picks the codec new vectors are written with. Rows remember their
+# codec, so mixed tables keep working.
+
+import os
+import numpy as np
+
+CODECS = ("float32", "float16", "int8")
+EMBED_CODEC = os.getenv("EMBED_CODEC", "int8")
+CHUNK_ROWS = 4096
+
+_SCALE_BYTES = 4
+
+if EMBED_CODEC not in CODECS:
+    raise ValueError(f"EMBED_CODEC must be one of {CODECS}, got {EMBED_CODEC!r}")
+
+# -----------------------------
+# SINGLE VECTORS (DB blobs)
+# -----------------------------
+def quantize_int8(vectors: np.ndarray):
+    """(n, dim) float -> (int8 codes, float32 scales) with codes * scale ~= vectors."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+def encode(vector: np.ndarray, codec: str = EMBED_CODEC) -> bytes:
+    vector = np.asarray(vector, dtype=np.float32)
+    if codec == "float32":
+        return vector.tobytes()
+    if codec == "float16":
+        return vector.astype(np.float16).tobytes()
+    if codec == "int8":
+        codes, scales = quantize_int8(vector)
+        return scales[:1].tobytes() + codes[0].tobytes()
+    raise ValueError(f"unknown vector codec {codec!r}")
+
+def decode_raw(blob: bytes, codec: str = "float32"):
+    """Zero-copy view of a blob: (values, scale). values keep the stored dtype."""
+    if codec == "float32":
+        return np.frombuffer(blob, dtype=np.float32), 1.0
+    if codec == "float16":
+        return np.frombuffer(blob, dtype=np.float16), 1.0
+    if codec == "int8":
+        scale = float(np.frombuffer(blob, dtype=np.float32, count=1)[0])
+        return np.frombuffer(blob, dtype=np.int8, offset=_SCALE_BYTES), scale
+    raise ValueError(f"unknown vector codec {codec!r}")
+
+def decode(blob: bytes, codec: str = "float32") -> np.ndarray:
+    """float32 vector. Zero-copy for float32 blobs, one small widening copy otherwise."""
+    values, scale = decode_raw(blob, codec)
+    if codec == "float32":
+        return values
+    return values.astype(np.float32) * np.float32(scale)
+
+def bytes_per_vector(dim: int, codec: str) -> int:
+    return {"float32": 4 * dim, "float16": 2 * dim, "int8": dim + _SCALE_BYTES}[codec]
+
+# -----------------------------
+# MATRICES (in-memory index)
+# -----------------------------
+def storage_dtype(codec: str):
+    return {"float32": np.float32, "float16": np.float16, "int8": np.int8}[codec]
+
+def encode_rows(vectors: np.ndarray, codec: str):
+    """(n, dim) float32 -> (stored rows, float32 per-row scales) for `codec`."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    if codec == "int8":
+        return quantize_int8(vectors)
+    return vectors.astype(storage_dtype(codec)), np.ones(len(vectors), dtype=np.float32)
+
+def decode_rows(rows: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    if rows.dtype == np.float32:
+        return rows
+    return rows.astype(np.float32) * scales[:, None]
+
+def dot_rows(rows: np.ndarray, scales: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """rows @ query on the stored representation, widening CHUNK_ROWS rows at a time."""
+    query = np.asarray(query, dtype=np.float32)
+    if rows.dtype == np.float32:
+        return rows @ query
+    out = np.empty(len(rows), dtype=np.float32)
+    for start in range(0, len(rows), CHUNK_ROWS):
+        chunk = rows[start:start + CHUNK_ROWS]
+        out[start:start + CHUNK_ROWS] = chunk.astype(np.float32) @ query
+    if rows.dtype == np.int8:
+        out *= scales
+    return out
@@ -1,8 +1,14 @@
 # backend/main.py
 
+import os
 import subprocess
-from fastapi import FastAPI
+import threading
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from backend.database import Base, engine
+from backend.ai.registry import registry
+from backend.ai import extraction, reranker
+from backend.services import admission, job_search, job_sync, resume_pipeline, storage
 
 # Routers
 from backend.routers.auth import router as auth_router
@@ -11,11 +17,7 @@ from backend.routers.resume import router as resumes_router
 from backend.routers.employer import router as employer_router
 from backend.routers.news import router as news_router
 from backend.routers.best_jobs import router as best_jobs_router
-
-# ---------------------------
-# Create tables
-# ---------------------------
-Base.metadata.create_all(bind=engine)
+from backend.routers.health import router as health_router
 
 # ---------------------------
 # Initialize FastAPI app
@@ -26,6 +28,28 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# ---------------------------
+# Reject oversized uploads, or uploads we cannot take right now, before the body is read
+# ---------------------------
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    # multipart bodies are parsed before the route runs, so check the declared length here;
+    # storage.save_upload still enforces the limit on the bytes actually received
+    if request.url.path == "/resumes/upload":
+        declared = request.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > storage.MAX_UPLOAD_BYTES + 64 * 1024:
+            return JSONResponse(status_code=413, content={"detail": "Upload too large"})
+        # admission control, also before the body is read (see services/admission)
+        if resume_pipeline.is_full():
+            return JSONResponse(status_code=503, content={"detail": "Resume processing is backed up, retry later"},
+                                headers={"Retry-After": str(resume_pipeline.retry_after())})
+        try:
+            async with admission.limiter("upload").admit():
+                return await call_next(request)
+        except admission.Rejected as e:
+            return JSONResponse(status_code=e.status_code, content={"detail": e.detail}, headers=e.headers)
+    return await call_next(request)
+
 # ---------------------------
 # Root endpoint
 # ---------------------------
@@ -33,6 +57,42 @@ app = FastAPI(
 def root():
     return {"message": "Backend is running!"}
 
+# ---------------------------
+# Startup: create tables, warm models in the background
+# ---------------------------
+# WARM_MODELS: "all", or a comma list such as "embedder,gemini". Empty = load on first use.
+WARM_MODELS = os.getenv("WARM_MODELS", "").strip()
+
+@app.on_event("startup")
+def create_tables():
+    # done here rather than at import so importing the app never needs the DB
+    Base.metadata.create_all(bind=engine)
+    # full-text index objects the ORM does not create (SQLite FTS5 table + triggers)
+    job_search.ensure_schema()
+
+@app.on_event("startup")
+def warm_models():
+    if not WARM_MODELS:
+        return
+    names = None if WARM_MODELS == "all" else [n.strip() for n in WARM_MODELS.split(",") if n.strip()]
+    # background thread so the worker starts serving (and passing /health/live) right away
+    threading.Thread(target=registry.warm_up, args=(names,), daemon=True, name="model-warmup").start()
+
+@app.on_event("startup")
+def resume_pending_uploads():
+    # the resumes table is the queue: pick up anything a previous run left pending
+    recovered = resume_pipeline.recover_pending()
+    if recovered:
+        print(f"Re-queued {recovered} pending resume(s)")
+
+@app.on_event("shutdown")
+def stop_resume_workers():
+    resume_pipeline.shutdown()
+    job_sync.shutdown()
+    extraction.shutdown()
+    reranker.shutdown()
+    admission.shutdown()
+
 # ---------------------------
 # Optional: Alembic migrations on startup
 # ---------------------------
@@ -54,3 +114,4 @@ app.include_router(resumes_router)
 app.include_router(employer_router)
 app.include_router(news_router)
 app.include_router(best_jobs_router)
+app.include_router(health_router)
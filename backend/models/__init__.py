@@ -3,6 +3,12 @@ from .applicant import Applicant
 from .employer import Employer
 from .resume import Resume
 from .job import Job, JobApplication, SavedJob
+from .job_embedding import JobEmbedding
+from .job_skill import JobSkill
+from .job_search_document import JobSearchDocument
 from .resume_score import ResumeScore
 from .best_job import HotJob, TopJob
-from .news import NewsItem
\ No newline at end of file
+from .news import NewsItem
+from .parse_cache import ParseCacheEntry
+from .matching_profile import MatchingProfile
+from .embedding_chunk import EmbeddingChunk
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime, UniqueConstraint
+from datetime import datetime
+from ..database import Base
+
+class EmbeddingChunk(Base):
+    """Vector of one resume/job text chunk, shared by every document containing it."""
+    __tablename__ = "embedding_chunks"
+    __table_args__ = (UniqueConstraint("chunk_hash", "model_version", name="uq_embedding_chunks_hash_model"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    chunk_hash = Column(String(40), nullable=False)  # sha1 of the chunk text, see resume_parser.chunk_hash
+    model_version = Column(String(100), nullable=False)  # resume_parser.CHUNK_MODEL_VERSION
+    vector = Column(LargeBinary, nullable=False)  # packed with `codec`, see backend/ai/vector_codec.py
+    codec = Column(String(16), nullable=False, default="float32")
+    created_at = Column(DateTime, default=datetime.utcnow)
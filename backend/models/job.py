@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -6,6 +6,10 @@ from sqlalchemy.dialects.mysql import JSON
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # GET /jobs/ keyset pages: WHERE is_active ORDER BY created_at DESC, id DESC
+        Index("ix_jobs_active_created_id", "is_active", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), index=True, nullable=False)
@@ -32,6 +36,7 @@ class Job(Base):
     applications = relationship("JobApplication", back_populates="job")
     saved_jobs = relationship("SavedJob", back_populates="job")
     resume_scores = relationship("ResumeScore", back_populates="job")
+    embedding = relationship("JobEmbedding", back_populates="job", uselist=False)
 
 class JobApplication(Base):
     __tablename__ = "job_applications"
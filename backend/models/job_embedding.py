@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, LargeBinary, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from ..database import Base
+
+class JobEmbedding(Base):
+    __tablename__ = "job_embeddings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), unique=True, index=True, nullable=False)
+    content_hash = Column(String(64), nullable=False)  # sha256 of the embedded job text
+    model_version = Column(String(100), nullable=False)
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # packed with `codec`, see backend/ai/vector_codec.py
+    codec = Column(String(16), nullable=False, default="float32")  # float32 / float16 / int8
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    job = relationship("Job", back_populates="embedding")
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from datetime import datetime
+from ..database import Base
+
+class JobSearchDocument(Base):
+    """
+    Searchable text of one active job (see services/job_search). MySQL searches
+    it through the FULLTEXT index; SQLite mirrors it into an FTS5 table.
+    """
+    __tablename__ = "job_search_documents"
+    __table_args__ = (
+        Index("ft_job_search_documents", "title", "description", "tags", "company",
+              mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+    # integer primary key, so SQLite's FTS5 table can use it as its rowid
+    job_id = Column(Integer, ForeignKey("jobs.id"), primary_key=True, autoincrement=False)
+    title = Column(String(100), nullable=False)
+    description = Column(Text, nullable=False)
+    tags = Column(String(255))
+    company = Column(String(100))  # employer's company_name
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
+from ..database import Base
+
+class JobSkill(Base):
+    """Inverted index: one row per (job, canonical skill id) from the job's required_skills."""
+    __tablename__ = "job_skills"
+    __table_args__ = (
+        UniqueConstraint("job_id", "skill_id", name="uq_job_skills_job_skill"),
+        # recommendations: WHERE skill_id IN (...) -> job ids, without touching jobs
+        Index("ix_job_skills_skill_job", "skill_id", "job_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=False)
+    skill_id = Column(String(64), nullable=False)  # skill_taxonomy id, e.g. "react"
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, LargeBinary, DateTime, ForeignKey
+from datetime import datetime
+from ..database import Base
+
+class MatchingProfile(Base):
+    """
+    What personalized endpoints need about a user, derived from their latest
+    scored resume (see services/matching_profiles). One row per user.
+    """
+    __tablename__ = "matching_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True, index=True, nullable=False)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    content_hash = Column(String(64))  # the resume file's sha256
+    title = Column(String(100))
+    file_url = Column(String(255))
+    skills = Column(Text)       # JSON list, canonical display names
+    skill_ids = Column(Text)    # JSON list, skill_taxonomy ids
+    education = Column(Text)    # JSON list
+    experience = Column(Text)   # JSON list
+    text_head = Column(Text)    # start of the parsed text (previews, cross-encoder input)
+    embedding = Column(LargeBinary)  # resume text vector, packed with embedding_codec
+    embedding_codec = Column(String(16), default="float32")
+    embedding_model = Column(String(100))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
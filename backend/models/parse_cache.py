@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Text, LargeBinary, DateTime, UniqueConstraint
+from datetime import datetime
+from ..database import Base
+
+class ParseCacheEntry(Base):
+    __tablename__ = "resume_parse_cache"
+    __table_args__ = (UniqueConstraint("content_hash", "parser_version", name="uq_parse_cache_hash_version"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False)  # sha256 of the uploaded file bytes
+    parser_version = Column(String(100), nullable=False)
+    parsed = Column(Text, nullable=False)  # parse_resume() output as JSON
+    embedding = Column(LargeBinary)  # resume text vector, packed with embedding_codec
+    embedding_model = Column(String(100))
+    embedding_codec = Column(String(16), default="float32")
+    size_bytes = Column(Integer, default=0)
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -13,6 +13,7 @@ class Resume(Base):
     file_url = Column(String(255))
     file_path = Column(String(255))
     file_size = Column(Integer)
+    content_hash = Column(String(64), index=True)  # sha256 of the file; file_path points at the shared blob
 
     # AI/parsed fields
     parsed_text = Column(Text)
@@ -20,6 +21,8 @@ class Resume(Base):
     education = Column(JSON)
     experience = Column(JSON)
     ai_status = Column(String(50), default="pending")  # pending / parsed / scored / failed
+    ai_error = Column(Text)  # why processing failed, shown by GET /resumes/{id}/status
+    ai_started_at = Column(DateTime)  # set when a worker claims the resume
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,16 +1,24 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
 
 class ResumeScore(Base):
     __tablename__ = "resume_scores"
+    __table_args__ = (
+        # one row per pair, so writers can upsert instead of delete + insert
+        UniqueConstraint("resume_id", "job_id", name="uq_resume_scores_resume_job"),
+        # top-K reads: WHERE resume_id = ? ORDER BY score DESC
+        Index("ix_resume_scores_resume_score", "resume_id", "score"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"))
-    job_id = Column(Integer, ForeignKey("jobs.id"))  # <-- add this
+    job_id = Column(Integer, ForeignKey("jobs.id"), index=True)
     score = Column(Float)
+    is_stale = Column(Boolean, default=False, nullable=False)  # job edited since this score was computed
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     resume = relationship("Resume", back_populates="scores")
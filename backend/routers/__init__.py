@@ -4,6 +4,7 @@ from .jobs import router as jobs_router
 from .resume import router as resume_router
 from .news import router as news_router
 from .resume_score import router as resume_score_router
+from .health import router as health_router
 routers = [
     auth_router,
     employer_router,
@@ -11,4 +12,5 @@ routers = [
     resume_router,
     news_router,
     resume_score_router,
+    health_router,
 ]
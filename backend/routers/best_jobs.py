@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime, timedelta
@@ -10,6 +10,9 @@ from backend.models.resume import Resume
 from backend.models.user import User
 from backend.models.applicant import Applicant
 from backend.schemas.job import JobResponse
+from backend.services import crud, job_skills, matching_profiles
+from backend.services.auth import get_current_user
+from backend.routers.jobs import _job_response
 
 router = APIRouter(prefix="/best-jobs", tags=["Best Jobs"])
 
@@ -34,52 +37,41 @@ def get_top_jobs(db: Session = Depends(get_db)):
 # ✅ Hot Jobs (personalized, highest score for user)
 # -----------------------------
 @router.get("/hot", response_model=List[JobResponse])
-def get_hot_jobs(current_user: User = Depends(), db: Session = Depends(get_db)):
-    # Get the user's latest resume
-    user_resume = db.query(Resume).filter(Resume.user_id == current_user.id).order_by(Resume.created_at.desc()).first()
-    if not user_resume:
+def get_hot_jobs(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    # Precomputed scores of the user's latest scored resume (indexed top-K read)
+    if not matching_profiles.get_profile(db, current_user.id):
         raise HTTPException(status_code=404, detail="No resume found for user")
 
-    # Fetch jobs sorted by ResumeScore for this resume
-    hot_jobs = (
-        db.query(Job, ResumeScore.score)
-        .join(ResumeScore, ResumeScore.job_id == Job.id)
-        .filter(ResumeScore.resume_id == user_resume.id)
-        .order_by(ResumeScore.score.desc())
-        .limit(10)
-        .all()
-    )
-
+    hot_jobs = crud.get_recommended_jobs(db, current_user.id, limit=10)
     if not hot_jobs:
         raise HTTPException(status_code=404, detail="No hot jobs found")
 
     # Return Job objects only
-    return [job for job, score in hot_jobs]
+    return [_job_response(job) for job in hot_jobs]
 
 
 # -----------------------------
 # ✅ Recommended Jobs (matching skills)
 # -----------------------------
 @router.get("/recommended/{applicant_id}", response_model=List[JobResponse])
-def get_recommended_jobs(applicant_id: int, db: Session = Depends(get_db)):
+def get_recommended_jobs(
+        applicant_id: int,
+        limit: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_db)
+):
     applicant = db.query(Applicant).filter(Applicant.id == applicant_id).first()
     if not applicant:
         raise HTTPException(status_code=404, detail="Applicant not found")
 
-    # Get latest resume
-    if not applicant.resumes:
+    # Resumes belong to the applicant's user; use their current matching profile
+    profile = matching_profiles.get_profile(db, applicant.user_id)
+    if not profile:
         raise HTTPException(status_code=404, detail="Applicant has no resumes")
 
-    resume = applicant.resumes[-1]  # latest resume uploaded
-    skills = resume.skills or []
-
-    # Match jobs containing at least one matching skill
-    # Note: Assuming `Job.required_skills` is JSON/array field (PostgreSQL)
-    jobs = (
-        db.query(Job)
-        .filter(Job.is_active == True)
-        .filter(Job.required_skills.overlap(skills))
-        .all()
-    )
-
-    return jobs
+    # Jobs ranked by how many of the resume's skills they require (job_skills index)
+    ranked = job_skills.recommend_job_ids(db, profile["skills"], limit=limit)
+    jobs_by_id = {
+        job.id: job
+        for job in db.query(Job).filter(Job.id.in_([job_id for job_id, _ in ranked]), Job.is_active == True)
+    }
+    return [_job_response(jobs_by_id[job_id]) for job_id, _ in ranked if job_id in jobs_by_id]
@@ -0,0 +1,79 @@
+# backend/routers/health.py
+import os
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.database import engine, get_db
+from backend.ai.registry import registry, get_embed_model
+from backend.ai.embed_client import EMBED_SERVER_SOCKET
+from backend.ai.llm import get_llm_client
+from backend.ai.resume_parser import embed_stats, parse_stats
+from backend.services import (
+    admission, job_index, job_ranker, job_search, job_skills, matching_profiles, parse_cache, resume_pipeline,
+)
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+# Models that must be loaded before /health/ready reports ready, e.g. "embedder"
+REQUIRED_MODELS = [m.strip() for m in os.getenv("REQUIRED_MODELS", "").split(",") if m.strip()]
+
+
+@router.get("/live")
+def liveness():
+    """Process is up. Never touches the DB or the models."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def readiness(response: Response):
+    """Which models are loaded, and whether the DB answers."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        database_ok = True
+    except Exception:
+        database_ok = False
+
+    models = registry.status()
+    missing = [name for name in REQUIRED_MODELS if not models.get(name, {}).get("loaded")]
+    ready = database_ok and not missing
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return {
+        "status": "ready" if ready else "not_ready",
+        "database": database_ok,
+        "models": models,
+        "missing_models": missing,
+    }
+
+
+def _embed_server_stats():
+    """Queue and batching stats of the shared embedding server, if this worker uses one."""
+    if not EMBED_SERVER_SOCKET:
+        return None
+    if not registry.is_loaded("embedder"):
+        return {"connected": False}
+    try:
+        return get_embed_model().stats()
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@router.get("/metrics")
+def metrics(db: Session = Depends(get_db)):
+    """Cache counters are per worker process; entry/byte totals come from the DB."""
+    return {
+        "parse_cache": parse_cache.stats(db),
+        "llm": get_llm_client().stats(),
+        "parser": parse_stats(),
+        "embeddings": embed_stats(),
+        "embed_server": _embed_server_stats(),
+        "job_index": job_index.stats(),
+        "job_skills": job_skills.stats(),
+        "search_backend": job_search.backend_name(),
+        "ranker": job_ranker.stats(),
+        "matching_profiles": matching_profiles.stats(),
+        "admission": {**admission.stats(), "resume_backlog": resume_pipeline.backlog()},
+    }
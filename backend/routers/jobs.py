@@ -1,46 +1,132 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, load_only
 from typing import List, Optional
-from backend.database import get_db
-from backend.models import Job, Employer, Resume
-from backend.schemas import JobCreate, JobResponse
+from backend.database import SessionLocal, get_db
+from backend.models import Job, Employer
+from backend.schemas import JobCreate, JobUpdate, JobResponse, JobListItem, JobPage
 from backend.services.auth import get_current_user
-from backend.ai.resume_parser import score_resume
+from backend.services import admission, job_ranker, job_sync, matching_profiles
+from backend.ai.skill_taxonomy import canonicalize_skills
+from datetime import datetime
+from functools import lru_cache
+import base64
+import binascii
 import json
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
 
+@lru_cache(maxsize=4096)
+def _decode_list(raw: str) -> tuple:
+    # keyed by the stored JSON text, so an edited job simply misses the cache
+    try:
+        value = json.loads(raw or "[]")
+    except ValueError:
+        return ()
+    return tuple(value) if isinstance(value, list) else ()
+
+
+def _as_list(value) -> list:
+    """JSON columns come back as lists on MySQL but may still be raw strings elsewhere."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return list(_decode_list(value))
+    return value if isinstance(value, list) else []
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        employer_id=job.employer_id,
+        title=job.title,
+        description=job.description,
+        tags=job.tags,
+        min_salary=job.min_salary,
+        max_salary=job.max_salary,
+        salary_currency=job.salary_currency,
+        salary_period=job.salary_period,
+        job_types=job.job_types,
+        job_level=job.job_level,
+        experience=job.experience,
+        education=job.education,
+        is_active=job.is_active,
+        required_skills=_as_list(job.required_skills),  # ✅ convert here
+        created_at=job.created_at,
+        updated_at=job.updated_at
+    )
+
+
 # -----------------------
-# GET all jobs
+# GET jobs, newest first, one keyset page at a time
 # -----------------------
-@router.get("/", response_model=List[JobResponse])
-def get_jobs(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    jobs = db.query(Job).filter(Job.is_active == True).all()
-
-    response = []
-    for job in jobs:
-        response.append(JobResponse(
-            id=job.id,
-            employer_id=job.employer_id,
-            title=job.title,
-            description=job.description,
-            tags=job.tags,
-            min_salary=job.min_salary,
-            max_salary=job.max_salary,
-            salary_currency=job.salary_currency,
-            salary_period=job.salary_period,
-            job_types=job.job_types,
-            job_level=job.job_level,
-            experience=job.experience,
-            education=job.education,
-            is_active=job.is_active,
-            required_skills=json.loads(job.required_skills or "[]"),  # ✅ convert here
-            created_at=job.created_at,
-            updated_at=job.updated_at
+# list columns only; description is the bulk of a row and is left in the table
+_LIST_COLUMNS = (
+    Job.id, Job.employer_id, Job.title, Job.tags, Job.min_salary, Job.max_salary,
+    Job.salary_currency, Job.salary_period, Job.job_types, Job.job_level,
+    Job.experience, Job.education, Job.required_skills, Job.created_at,
+)
+
+
+def _encode_cursor(job: Job) -> str:
+    raw = f"{job.created_at.isoformat()}|{job.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, job_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(job_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _job_list_item(job: Job) -> JobListItem:
+    return JobListItem(
+        id=job.id,
+        employer_id=job.employer_id,
+        title=job.title,
+        tags=job.tags,
+        min_salary=job.min_salary,
+        max_salary=job.max_salary,
+        salary_currency=job.salary_currency,
+        salary_period=job.salary_period,
+        job_types=job.job_types,
+        job_level=job.job_level,
+        experience=job.experience,
+        education=job.education,
+        required_skills=_as_list(job.required_skills),
+        created_at=job.created_at,
+    )
+
+
+@router.get("/", response_model=JobPage)
+def get_jobs(
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        limit: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user)
+):
+    jobs_query = (
+        db.query(Job)
+        .options(load_only(*_LIST_COLUMNS))
+        .filter(Job.is_active == True)
+    )
+    if cursor:
+        # seek past the last row seen instead of OFFSET, so every page costs the same
+        created_at, job_id = _decode_cursor(cursor)
+        jobs_query = jobs_query.filter(or_(
+            Job.created_at < created_at,
+            and_(Job.created_at == created_at, Job.id < job_id),
         ))
+    # one extra row tells us whether there is a next page
+    jobs = jobs_query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1).all()
+
+    next_cursor = _encode_cursor(jobs[limit - 1]) if len(jobs) > limit else None
+    return JobPage(items=[_job_list_item(job) for job in jobs[:limit]], next_cursor=next_cursor)
 
-    return response
 
 # -----------------------
 # POST a new job (Employer only)
@@ -67,71 +153,128 @@ def create_job(
         job_level=job_in.job_level,
         experience=job_in.experience,
         education=job_in.education,
-        required_skills=json.dumps(job_in.required_skills or []),
+        required_skills=json.dumps(canonicalize_skills(job_in.required_skills)),
         is_active=job_in.is_active,
         employer_id=employer.id
     )
     db.add(job)
     db.commit()
     db.refresh(job)
-    return job
+
+    # embed once at write time so search never re-encodes job descriptions,
+    # and score it against existing resumes in the background
+    job_sync.on_job_saved(db, job)
+    return _job_response(job)
 
 
 # -----------------------
-# Search jobs & score
+# PUT update a job (owning employer only)
 # -----------------------
-@router.get("/search", response_model=List[dict])
-def search_jobs(
-        query: Optional[str] = Query(None, description="Search keyword for job title or description"),
+@router.put("/{job_id}", response_model=JobResponse)
+def update_job(
+        job_id: int,
+        job_in: JobUpdate,
         db: Session = Depends(get_db),
         current_user=Depends(get_current_user)
 ):
-    resume = (
-        db.query(Resume)
-        .filter(Resume.user_id == current_user.id)
-        .order_by(Resume.created_at.desc())
-        .first()
-    )
+    employer = db.query(Employer).filter(Employer.user_id == current_user.id).first()
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job or job.deleted_at is not None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not employer or job.employer_id != employer.id:
+        raise HTTPException(status_code=403, detail="You can only edit your own jobs.")
 
-    if not resume:
-        raise HTTPException(status_code=400, detail="Upload a resume first to enable job recommendations.")
+    changes = job_in.model_dump(exclude_unset=True)
+    if "required_skills" in changes:
+        changes["required_skills"] = json.dumps(canonicalize_skills(changes["required_skills"]))
+    for field, value in changes.items():
+        setattr(job, field, value)
+    db.commit()
+    db.refresh(job)
+
+    if job.is_active:
+        job_sync.on_job_saved(db, job, changed_fields=set(changes))
+    else:
+        job_sync.on_job_removed(db, job)
+    return _job_response(job)
 
-    # Convert stored JSON fields
-    user_skills = json.loads(resume.skills or "[]")
-    user_experience = json.loads(resume.experience or "[]")
-    user_education = json.loads(resume.education or "[]")
 
-    user_profile = {
-        "skills": user_skills,
-        "experience": user_experience,
-        "education": user_education,
+# -----------------------
+# DELETE a job (owning employer only); soft delete, history keeps the row
+# -----------------------
+@router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_job(
+        job_id: int,
+        db: Session = Depends(get_db),
+        current_user=Depends(get_current_user)
+):
+    employer = db.query(Employer).filter(Employer.user_id == current_user.id).first()
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job or job.deleted_at is not None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not employer or job.employer_id != employer.id:
+        raise HTTPException(status_code=403, detail="You can only delete your own jobs.")
+
+    job.is_active = False
+    job.deleted_at = datetime.utcnow()
+    db.commit()
+    job_sync.on_job_removed(db, job)
+
+
+# -----------------------
+# Search jobs & score (see services/job_ranker)
+# -----------------------
+def _search_result(job: Job, score: float) -> dict:
+    return {
+        "id": job.id,
+        "title": job.title,
+        "company": job.employer.company_name if job.employer else None,
+        "location": job.employer.location if job.employer else None,
+        "description": job.description,
+        "score": round(score, 2)
     }
 
-    jobs_query = db.query(Job).filter(Job.is_active == True)
-    if query:
-        jobs_query = jobs_query.filter(Job.title.ilike(f"%{query}%"))
-
-    jobs = jobs_query.all()
-
-    scored_jobs = []
-    for job in jobs:
-        try:
-            job_score = score_resume(user_profile, job.description)
-        except:
-            job_score = 0.0
-        scored_jobs.append({"job": job, "score": float(job_score)})
-
-    scored_jobs.sort(key=lambda x: x["score"], reverse=True)
-
-    # Return clean response with safe list fields
-    return [
-        {
-            "id": item["job"].id,
-            "title": item["job"].title,
-            "company": item["job"].employer.company_name if item["job"].employer else None,
-            "location": item["job"].employer.location if item["job"].employer else None,
-            "description": item["job"].description,
-            "score": round(item["score"], 2)
-        }
-        for item in scored_jobs
-    ]
+
+def _search(user_id: int, query, limit: int, deadline=None) -> tuple:
+    """(results, Server-Timing value). Runs on the AI executor, possibly past the request's
+    504, so it uses its own Session rather than the request's."""
+    db = SessionLocal()
+    try:
+        profile = matching_profiles.get_profile(db, user_id)
+        if not profile:
+            raise HTTPException(status_code=400, detail="Upload a resume first to enable job recommendations.")
+
+        timer = job_ranker.StageTimer(deadline=deadline)
+        ranked = job_ranker.rank_jobs(db, profile, query=query, limit=limit, timer=timer)
+        timer.finish()
+        return [_search_result(job, score) for job, score in ranked], timer.server_timing()
+    finally:
+        db.close()
+
+
+@router.get("/search", response_model=List[dict])
+async def search_jobs(
+        response: Response,
+        query: Optional[str] = Query(None, description="Full-text query over title, description, tags and company"),
+        limit: int = Query(20, ge=1, le=100, description="Number of best-matching jobs to return"),
+        deadline_ms: Optional[float] = Header(None, alias="X-Deadline-Ms", gt=0,
+                                              description="Give up (504) if results are not ready in this time"),
+        current_user=Depends(get_current_user)
+):
+    # ranking runs on the bounded AI executor under the search limits (services/admission),
+    # not on the threadpool shared with every other endpoint
+    results, server_timing = await admission.run("search", _search, current_user.id, query, limit,
+                                                 user_id=current_user.id, deadline_ms=deadline_ms)
+    response.headers["Server-Timing"] = server_timing
+    return results
+
+
+# -----------------------
+# GET one job, with its description (declared after /search so it does not shadow it)
+# -----------------------
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    job = db.query(Job).filter(Job.id == job_id, Job.is_active == True).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
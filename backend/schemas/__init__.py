@@ -12,7 +12,10 @@ from .employer import EmployerCreate, EmployerResponse
 # Job
 from .job import (
     JobCreate,
+    JobUpdate,
     JobResponse,
+    JobListItem,
+    JobPage,
     JobApplicationCreate,
     JobApplicationResponse,
     SavedJobCreate,
@@ -1,6 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 # ------------------------------
 # Job Schemas
@@ -23,6 +23,29 @@ class JobBase(BaseModel):
 class JobCreate(JobBase):
     pass
 
+class JobUpdate(BaseModel):
+    title: Optional[str] = None
+    description: Optional[str] = None
+    tags: Optional[str] = None
+    min_salary: Optional[float] = None
+    max_salary: Optional[float] = None
+    salary_currency: Optional[str] = None
+    salary_period: Optional[str] = None
+    job_types: Optional[str] = None
+    job_level: Optional[str] = None
+    experience: Optional[str] = None
+    education: Optional[str] = None
+    is_active: Optional[bool] = None
+    required_skills: Optional[List[str]] = None
+
+    @field_validator("title", "description", "is_active")
+    @classmethod
+    def not_null(cls, value):
+        # these columns are NOT NULL: leave the field out to keep it, null is not a value
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
+
 class JobResponse(JobBase):
     id: int
     employer_id: int
@@ -34,6 +57,27 @@ class JobResponse(JobBase):
 # class JobCreate(JobBase):
 #     pass
 
+class JobListItem(BaseModel):
+    """Row of the GET /jobs/ list: everything but the description (fetch /jobs/{id} for that)."""
+    id: int
+    employer_id: int
+    title: str
+    tags: Optional[str] = None
+    min_salary: Optional[float] = None
+    max_salary: Optional[float] = None
+    salary_currency: Optional[str] = None
+    salary_period: Optional[str] = None
+    job_types: Optional[str] = None
+    job_level: Optional[str] = None
+    experience: Optional[str] = None
+    education: Optional[str] = None
+    required_skills: List[str] = []
+    created_at: datetime
+
+class JobPage(BaseModel):
+    items: List[JobListItem]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page; None on the last page
+
 # ------------------------------
 # Job Application Schemas
 # ------------------------------
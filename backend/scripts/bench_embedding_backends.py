@@ -0,0 +1,132 @@
+# backend/scripts/bench_embedding_backends.py
+#
+# Latency, throughput, memory and score agreement of the embedding backends
+# (see backend/ai/embedding_backends.py). Agreement is measured against the
+# first backend listed: how much score_resume_batch scores move, in points,
+# and how many of each resume's top-K jobs stay in the top K.
+#
+#   python -m backend.scripts.bench_embedding_backends
+#   BENCH_BACKENDS=torch,onnx BENCH_TEXTS=2000 python -m backend.scripts.bench_embedding_backends
+#   BENCH_FROM_DB=1 python -m backend.scripts.bench_embedding_backends   # real resumes and jobs
+#
+# Backends that cannot load here (no weights, no onnxruntime) are reported and skipped.
+
+import os
+import time
+import numpy as np
+
+BACKEND_NAMES = [b.strip() for b in os.getenv("BENCH_BACKENDS", "torch,onnx,hashing").split(",") if b.strip()]
+N_TEXTS = int(os.getenv("BENCH_TEXTS", "500"))
+N_RESUMES = int(os.getenv("BENCH_RESUMES", "20"))
+N_SINGLE = int(os.getenv("BENCH_SINGLE", "50"))
+BATCH = int(os.getenv("BENCH_BATCH", "32"))
+K = int(os.getenv("BENCH_K", "10"))
+FROM_DB = os.getenv("BENCH_FROM_DB") == "1"
+
+_ROLES = ["backend developer", "data scientist", "mobile developer", "devops engineer", "accountant",
+          "graphic designer", "nurse", "sales manager", "teacher", "civil engineer"]
+_SKILLS = ["Python", "Java", "Kotlin", "React", "SQL", "Docker", "Kubernetes", "Excel", "Figma", "AWS",
+           "Django", "Flutter", "Tableau", "Photoshop", "AutoCAD", "Linux", "Git", "Spark", "Swift", "Go"]
+_DEGREES = ["bachelor of computer science", "bachelor of business studies", "master of data science",
+            "bachelor of civil engineering", "diploma in nursing"]
+
+
+def synthetic_texts(n: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    texts = []
+    for _ in range(n):
+        role = _ROLES[rng.integers(len(_ROLES))]
+        skills = " ".join(rng.choice(_SKILLS, size=5, replace=False))
+        degree = _DEGREES[rng.integers(len(_DEGREES))]
+        years = int(rng.integers(1, 12))
+        texts.append(f"Experienced {role} with {years} years of work using {skills}. "
+                     f"Education: {degree}. Skills: {skills}.")
+    return texts
+
+
+def db_texts() -> tuple:
+    from backend.database import SessionLocal
+    from backend.models.job import Job
+    from backend.models.resume import Resume
+
+    db = SessionLocal()
+    try:
+        jobs = [d for (d,) in db.query(Job.description).filter(Job.is_active == True).limit(N_TEXTS)]
+        resumes = [t for (t,) in db.query(Resume.parsed_text).filter(Resume.parsed_text != None).limit(N_RESUMES)]
+    finally:
+        db.close()
+    if not jobs or not resumes:
+        raise SystemExit("need active jobs and parsed resumes in the database")
+    return jobs, resumes
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return float("nan")
+
+
+def scores(resumes: list, jobs: list, resume_vectors: np.ndarray, job_vectors: np.ndarray) -> np.ndarray:
+    from backend.ai.resume_parser import score_resume_batch
+
+    return np.array([
+        score_resume_batch({"text": text, "skills": [], "education": []}, jobs,
+                           job_vectors=job_vectors, resume_vector=vector)
+        for text, vector in zip(resumes, resume_vectors)
+    ])
+
+
+def main() -> int:
+    from backend.ai.embedding_backends import BACKENDS
+
+    jobs, resumes = db_texts() if FROM_DB else (synthetic_texts(N_TEXTS, 0), synthetic_texts(N_RESUMES, 1))
+    k = min(K, len(jobs))
+    print(f"{len(jobs)} job texts, {len(resumes)} resumes, batches of {BATCH}, agreement vs {BACKEND_NAMES[0]}\n")
+    print(f"{'backend':<8} {'dim':>4} {'load s':>7} {'+RSS MB':>8} {'1-text p50':>10} {'p99 ms':>7} "
+          f"{'texts/s':>8} {'score err':>9} {'top-' + str(k):>6}")
+
+    reference = None
+    for name in BACKEND_NAMES:
+        before = rss_mb()
+        started = time.perf_counter()
+        try:
+            backend = BACKENDS[name]()
+        except Exception as e:
+            print(f"{name:<8} skipped: {e}")
+            continue
+        load_s = time.perf_counter() - started
+        backend.encode(jobs[:BATCH])  # warm-up
+        loaded = rss_mb() - before
+
+        single = []
+        for text in jobs[:N_SINGLE]:
+            started = time.perf_counter()
+            backend.encode([text])
+            single.append((time.perf_counter() - started) * 1000)
+        single.sort()
+
+        started = time.perf_counter()
+        job_vectors = np.vstack([backend.encode(jobs[i:i + BATCH]) for i in range(0, len(jobs), BATCH)])
+        throughput = len(jobs) / (time.perf_counter() - started)
+        result = scores(resumes, jobs, backend.encode(resumes), job_vectors)
+
+        if reference is None:
+            reference, err, overlap = result, 0.0, 1.0
+        else:
+            err = float(np.abs(result - reference).mean())
+            overlap = np.mean([
+                len(set(np.argsort(-got)[:k]) & set(np.argsort(-want)[:k])) / k
+                for got, want in zip(result, reference)
+            ])
+        print(f"{name:<8} {backend.dim:>4} {load_s:>7.2f} {loaded:>8.0f} {single[len(single) // 2]:>10.2f} "
+              f"{single[min(len(single) - 1, int(0.99 * len(single)))]:>7.2f} {throughput:>8.0f} "
+              f"{err:>9.3f} {overlap:>6.2f}")
+    print(f"\nscore err = mean |score change| in points (0-100 scale); top-{k} = share of each resume's "
+          f"top {k} jobs that stay in the top {k}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
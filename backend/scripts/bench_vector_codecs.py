@@ -0,0 +1,91 @@
+# backend/scripts/bench_vector_codecs.py
+#
+# Memory, speed and accuracy of the embedding codecs (float32 / float16 / int8)
+# on the job vector index. Recall@K and score error are measured against float32.
+#
+#   python -m backend.scripts.bench_vector_codecs
+#   BENCH_VECTORS=200000 BENCH_K=20 python -m backend.scripts.bench_vector_codecs
+#   BENCH_FROM_DB=1 python -m backend.scripts.bench_vector_codecs   # real job embeddings
+#
+# Synthetic vectors are clustered unit vectors (like sentence embeddings of job
+# posts, which bunch by role), not uniform noise, so recall numbers are realistic.
+
+import os
+import time
+import numpy as np
+
+N_VECTORS = int(os.getenv("BENCH_VECTORS", "50000"))
+DIM = int(os.getenv("BENCH_DIM", "384"))
+N_QUERIES = int(os.getenv("BENCH_QUERIES", "200"))
+K = int(os.getenv("BENCH_K", "10"))
+FROM_DB = os.getenv("BENCH_FROM_DB") == "1"
+
+
+def synthetic_vectors(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(8, n // 500), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), n)] + 0.7 * rng.normal(size=(n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def db_vectors() -> np.ndarray:
+    from backend.database import SessionLocal
+    from backend.models.job_embedding import JobEmbedding
+    from backend.services.job_embeddings import unpack_vector
+
+    db = SessionLocal()
+    try:
+        rows = db.query(JobEmbedding.vector, JobEmbedding.codec).all()
+    finally:
+        db.close()
+    if not rows:
+        raise SystemExit("job_embeddings is empty")
+    return np.vstack([unpack_vector(blob, codec) for blob, codec in rows])
+
+
+def main() -> int:
+    from backend.ai import vector_codec
+    from backend.services.job_index import JobVectorIndex
+
+    vectors = db_vectors() if FROM_DB else synthetic_vectors(N_VECTORS, DIM)
+    n, dim = vectors.shape
+    rng = np.random.default_rng(1)
+    # queries: perturbed catalog vectors, i.e. resumes close to some jobs
+    queries = vectors[rng.integers(0, n, N_QUERIES)] + 0.3 * rng.normal(size=(N_QUERIES, dim)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    ids = list(range(1, n + 1))
+    k = min(K, n)
+
+    print(f"{n} vectors x {dim} dims, {N_QUERIES} queries, recall@{k} vs float32 (exact search)\n")
+    print(f"{'codec':<8} {'bytes/vec':>9} {'index MB':>9} {'blob MB':>8} {'saved':>6} "
+          f"{'search ms':>9} {'recall':>7} {'max err':>8}")
+
+    reference = None
+    baseline_bytes = None
+    for codec in vector_codec.CODECS:
+        index = JobVectorIndex(ivf_threshold=n + 1, codec=codec)  # exact, so only the codec differs
+        index.build(ids, vectors)
+        started = time.perf_counter()
+        results = [index.search(q, k) for q in queries]
+        search_ms = (time.perf_counter() - started) / N_QUERIES * 1000
+
+        blob_bytes = n * vector_codec.bytes_per_vector(dim, codec)
+        index_bytes = index.stats()["bytes"]
+        if reference is None:
+            reference, baseline_bytes = results, index_bytes
+        recall = np.mean([
+            len({i for i, _ in got} & {i for i, _ in want}) / k for got, want in zip(results, reference)
+        ])
+        # error of the similarity term in score points (it is weighted x30 in score_resume_batch)
+        decoded = index.get_vectors(ids[:2000])
+        max_err = float(np.abs(decoded @ queries.T - vectors[:2000] @ queries.T).max()) * 30
+
+        print(f"{codec:<8} {vector_codec.bytes_per_vector(dim, codec):>9} {index_bytes / 2**20:>9.1f} "
+              f"{blob_bytes / 2**20:>8.1f} {1 - index_bytes / baseline_bytes:>6.0%} "
+              f"{search_ms:>9.2f} {recall:>7.3f} {max_err:>8.3f}")
+    print("\nmax err = largest change of the 0-30 similarity score component, in points")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,36 @@
+# backend/scripts/build_job_snapshot.py
+#
+# Write a fresh job vector index snapshot (see services/job_snapshot) from the
+# database. Run it on deploy, before starting the workers, so none of them has
+# to build the index in memory on its first search:
+#
+#   python -m backend.scripts.build_job_snapshot
+#
+# Workers publish snapshots on their own as jobs change; this is only needed
+# for a cold start or after an embedding model / codec change.
+
+import sys
+
+
+def main() -> int:
+    from backend.database import SessionLocal
+    from backend.services import job_index, job_snapshot
+
+    if not job_snapshot.SNAPSHOTS_ENABLED:
+        print("VECTOR_SNAPSHOT_DIR is empty, snapshots are disabled")
+        return 1
+    db = SessionLocal()
+    try:
+        job_index.backfill(db)
+        manifest = job_index.write_snapshot(db)
+    finally:
+        db.close()
+    if manifest is None:
+        print("Another process is writing a snapshot, try again later")
+        return 1
+    print(f"{job_snapshot.VECTOR_SNAPSHOT_DIR}: v{manifest['version']}, {manifest['count']} jobs")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
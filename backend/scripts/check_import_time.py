@@ -0,0 +1,58 @@
+# backend/scripts/check_import_time.py
+#
+# Measures how long `import backend.main` takes in a fresh interpreter and fails
+# if it goes over budget or pulls a heavy model library in at import time.
+#
+#   python -m backend.scripts.check_import_time
+#   IMPORT_BUDGET_SECONDS=1.0 IMPORT_RUNS=7 python -m backend.scripts.check_import_time
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "2.0"))
+RUNS = int(os.getenv("IMPORT_RUNS", "5"))
+
+# none of these may be imported just by loading the app
+FORBIDDEN_MODULES = ["torch", "sentence_transformers", "transformers", "google.generativeai"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import backend.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": [m for m in %r if m in sys.modules]}))
+""" % (FORBIDDEN_MODULES,)
+
+
+def measure_once() -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=root, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    results = [measure_once() for _ in range(RUNS)]
+    seconds = [r["seconds"] for r in results]
+    median = statistics.median(seconds)
+    heavy = sorted({m for r in results for m in r["modules"]})
+
+    print(f"import backend.main: median {median:.3f}s, min {min(seconds):.3f}s, "
+          f"max {max(seconds):.3f}s over {RUNS} runs (budget {BUDGET_SECONDS:.2f}s)")
+    if heavy:
+        print("❌ heavy modules imported at startup:", ", ".join(heavy))
+    if median > BUDGET_SECONDS:
+        print("❌ import time over budget")
+    if heavy or median > BUDGET_SECONDS:
+        return 1
+    print("✅ within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# backend/scripts/export_onnx_embedder.py
+#
+# Export EMBED_MODEL_NAME to ONNX and quantize its weights to int8, for
+# EMBED_BACKEND=onnx (see backend/ai/embedding_backends.py). Needs torch,
+# sentence-transformers and onnxruntime; the workers afterwards only need
+# onnxruntime and tokenizers.
+#
+#   python -m backend.scripts.export_onnx_embedder            # -> EMBED_ONNX_DIR
+#
+# Writes model.onnx (float32), model_int8.onnx and tokenizer.json, then prints
+# how close the int8 vectors are to the PyTorch ones.
+
+import os
+import sys
+
+
+def main() -> int:
+    import numpy as np
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+    from backend.ai.registry import EMBED_MODEL_NAME
+    from backend.ai.embedding_backends import EMBED_ONNX_DIR, OnnxBackend
+
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else EMBED_ONNX_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    model = SentenceTransformer(EMBED_MODEL_NAME, device="cpu")
+    transformer, tokenizer = model[0].auto_model.eval(), model.tokenizer
+    tokenizer.save_pretrained(out_dir)  # tokenizer.json for the `tokenizers` runtime
+
+    sample = tokenizer(["Senior Python developer, FastAPI and SQL"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class TokenEmbeddings(torch.nn.Module):
+        def forward(self, *inputs):
+            return transformer(**dict(zip(input_names, inputs))).last_hidden_state
+
+    fp32_path = os.path.join(out_dir, "model.onnx")
+    int8_path = os.path.join(out_dir, "model_int8.onnx")
+    torch.onnx.export(
+        TokenEmbeddings(), tuple(sample[name] for name in input_names), fp32_path,
+        input_names=input_names, output_names=["token_embeddings"],
+        dynamic_axes={name: {0: "batch", 1: "tokens"} for name in input_names + ["token_embeddings"]},
+        opset_version=17,
+    )
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"Wrote {fp32_path} ({os.path.getsize(fp32_path) / 2**20:.1f} MB) "
+          f"and {int8_path} ({os.path.getsize(int8_path) / 2**20:.1f} MB)")
+
+    texts = [
+        "Backend engineer with five years of Python, Django and PostgreSQL experience.",
+        "We are hiring a mobile developer (Kotlin, Android) to build our job search app.",
+        "Bachelor of Science in Computer Science, Tribhuvan University.",
+    ]
+    reference = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+    quantized = OnnxBackend(out_dir).encode(texts)
+    cosines = (reference * quantized).sum(axis=1)
+    print(f"int8 vs torch cosine: min {cosines.min():.4f}, mean {np.mean(cosines):.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+# backend/scripts/load_test_uploads.py
+#
+# Offline load test of the whole upload path (storage -> extraction -> LLM ->
+# scoring). Start the API with the fake LLM, e.g.
+#
+#   LLM_BACKEND=fake FAKE_LLM_LATENCY_MS=1500 uvicorn backend.main:app
+#
+# then run
+#
+#   python -m backend.scripts.load_test_uploads --uploads 50 --concurrency 10
+#
+# Each upload is made unique (a trailing comment is appended to the PDF) so the
+# parse cache does not short-circuit the pipeline.
+
+import argparse
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+
+def login(client: httpx.Client) -> dict:
+    email = f"loadtest-{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/auth/register", json={"username": email.split("@")[0], "email": email, "password": "loadtest"})
+    token = client.post("/auth/login", json={"email": email, "password": "loadtest"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def one_upload(base_url: str, headers: dict, pdf: bytes, poll_interval: float) -> dict:
+    body = pdf + f"\n% {uuid.uuid4().hex}\n".encode()
+    with httpx.Client(base_url=base_url, headers=headers, timeout=60) as client:
+        started = time.perf_counter()
+        response = client.post("/resumes/upload", files={"file": ("loadtest.pdf", body, "application/pdf")})
+        accepted = time.perf_counter() - started
+        if response.status_code != 202:
+            return {"accepted_s": accepted, "done_s": None, "status": f"http {response.status_code}"}
+        resume_id = response.json()["resume_id"]
+        while True:
+            status = client.get(f"/resumes/{resume_id}/status").json()["ai_status"]
+            if status in ("scored", "failed"):
+                return {"accepted_s": accepted, "done_s": time.perf_counter() - started, "status": status}
+            time.sleep(poll_interval)
+
+
+def summary(label: str, values: list):
+    if not values:
+        print(f"{label}: no samples")
+        return
+    values = sorted(values)
+    p95 = values[min(len(values) - 1, int(0.95 * len(values)))]
+    print(f"{label}: p50 {statistics.median(values):.3f}s  p95 {p95:.3f}s  max {values[-1]:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--file", default="backend/uploads/resumes/resume.pdf")
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--poll-interval", type=float, default=0.25)
+    args = parser.parse_args()
+
+    with open(args.file, "rb") as f:
+        pdf = f.read()
+    with httpx.Client(base_url=args.base_url, timeout=30) as client:
+        headers = login(client)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda _: one_upload(args.base_url, headers, pdf, args.poll_interval),
+                                range(args.uploads)))
+    wall = time.perf_counter() - started
+
+    statuses = {}
+    for r in results:
+        statuses[r["status"]] = statuses.get(r["status"], 0) + 1
+    print(f"{args.uploads} uploads, concurrency {args.concurrency}, {wall:.1f}s wall: {statuses}")
+    summary("upload accepted", [r["accepted_s"] for r in results])
+    summary("upload processed", [r["done_s"] for r in results if r["done_s"] is not None])
+    with httpx.Client(base_url=args.base_url, timeout=30) as client:
+        print("llm:", client.get("/health/metrics").json().get("llm"))
+
+
+if __name__ == "__main__":
+    main()
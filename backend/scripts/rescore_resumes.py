@@ -0,0 +1,34 @@
+# backend/scripts/rescore_resumes.py
+#
+# Recompute the whole resume x job score matrix (see services/resume_scores)
+# for every user's latest resume. Run it on deploy after a change to how
+# scores are computed (score_resume_batch, skill matching, PARSER_VERSION):
+#
+#   python -m backend.scripts.rescore_resumes
+#
+# Rows are upserted one resume at a time, so readers keep seeing the old
+# scores until each resume's new ones land.
+
+import sys
+
+
+def main() -> int:
+    from backend.database import SessionLocal
+    from backend.services import resume_scores
+
+    db = SessionLocal()
+    try:
+        resumes = resume_scores.latest_scored_resumes(db)
+        vectors = resume_scores.resume_vectors(db, resumes)
+        written = 0
+        for resume, vector in zip(resumes, vectors):
+            written += resume_scores.score_resume_against_jobs(db, resume, vector)
+            db.commit()
+    finally:
+        db.close()
+    print(f"Rescored {len(resumes)} resumes, {written} scores written")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+# backend/services/admission.py
+#
+# Admission control for the CPU-heavy AI endpoints, so a burst of them cannot
+# take every thread of the AnyIO pool that cheap endpoints (/news, /auth/login)
+# also run on.
+#
+#   - AI work runs on its own bounded executor (AI_WORKERS threads), not on
+#     the AnyIO pool.
+#   - Each endpoint has a concurrency limit and a bounded wait queue
+#     (<NAME>_CONCURRENCY, <NAME>_MAX_QUEUE, <NAME>_MAX_WAIT_MS). The request is
+#     answered at once with a 503 and Retry-After when:
+#       * the queue is full, or
+#       * a slot does not free up within the max wait.
+#     A user who already has ADMISSION_PER_USER requests of the endpoint in
+#     flight gets a 429.
+#   - A request may carry a deadline (X-Deadline-Ms header, capped at
+#     ADMISSION_MAX_DEADLINE_MS). When it passes the request gets a 504 at once;
+#     work still running stops at its next stage boundary (see Deadline.check)
+#     and only then gives its slot back, so slots always match busy threads. A
+#     deadline that runs out while the request is still queued is a 504 as well.
+#
+# The limits are per worker process. Counters are in /health/metrics.
+
+import asyncio
+import math
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from fastapi import HTTPException, status
+
+AI_WORKERS = int(os.getenv("AI_WORKERS", "4"))
+ADMISSION_PER_USER = int(os.getenv("ADMISSION_PER_USER", "2"))
+ADMISSION_DEFAULT_DEADLINE_MS = float(os.getenv("ADMISSION_DEFAULT_DEADLINE_MS", "10000"))
+ADMISSION_MAX_DEADLINE_MS = float(os.getenv("ADMISSION_MAX_DEADLINE_MS", "30000"))
+
+_executor = ThreadPoolExecutor(max_workers=AI_WORKERS, thread_name_prefix="ai")
+
+# ---------------------------
+# ERRORS / DEADLINES
+# ---------------------------
+
+class Rejected(HTTPException):
+    """A request turned away before any work was done; the client should retry later."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(status_code=status_code, detail=detail, headers={"Retry-After": str(retry_after)})
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+def _deadline_response(endpoint: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                         detail=f"{endpoint} did not finish within the request deadline")
+
+
+class Deadline:
+    """A request's time budget, checked by the work between its stages."""
+
+    def __init__(self, milliseconds: float = None):
+        milliseconds = min(milliseconds or ADMISSION_DEFAULT_DEADLINE_MS, ADMISSION_MAX_DEADLINE_MS)
+        self.expires_at = time.monotonic() + milliseconds / 1000
+        self.cancelled = False
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.cancelled or time.monotonic() >= self.expires_at
+
+    def cancel(self):
+        self.cancelled = True
+
+    def check(self):
+        if self.expired():
+            raise DeadlineExceeded()
+
+# ---------------------------
+# PER-ENDPOINT LIMITS
+# ---------------------------
+
+class EndpointLimiter:
+    """Concurrency slots plus a bounded queue for one endpoint. Used from the event loop only."""
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, max_wait_ms: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait_ms / 1000
+        self.running = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._per_user = Counter()
+        self._service_seconds = deque(maxlen=200)
+        self.counters = {"admitted": 0, "queue_full": 0, "wait_timeout": 0, "per_user": 0, "deadline_exceeded": 0}
+
+    def retry_after(self) -> int:
+        """Seconds until a new request would likely get a slot."""
+        mean = sum(self._service_seconds) / len(self._service_seconds) if self._service_seconds else 1.0
+        return max(1, math.ceil(mean * (self.waiting + 1) / self.concurrency))
+
+    def _reject(self, reason: str, status_code: int, detail: str):
+        self.counters[reason] += 1
+        raise Rejected(status_code, detail, self.retry_after())
+
+    async def acquire(self, user_id=None, timeout: float = None) -> float:
+        """
+        Take a slot or raise Rejected; `timeout` is the request's remaining deadline, and running
+        out of it while queued is a 504. Returns the start time to hand back to release().
+        """
+        if user_id is not None and self._per_user[user_id] >= ADMISSION_PER_USER:
+            self._reject("per_user", status.HTTP_429_TOO_MANY_REQUESTS,
+                         f"Too many {self.name} requests in progress for this user")
+        if self.waiting >= self.max_queue:
+            self._reject("queue_full", status.HTTP_503_SERVICE_UNAVAILABLE, f"{self.name} is overloaded, retry later")
+
+        if user_id is not None:
+            self._per_user[user_id] += 1
+        try:
+            self.waiting += 1
+            deadline_bound = timeout is not None and timeout < self.max_wait
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout if deadline_bound else self.max_wait)
+            except asyncio.TimeoutError:
+                if deadline_bound:
+                    self.counters["deadline_exceeded"] += 1
+                    raise _deadline_response(self.name)
+                self._reject("wait_timeout", status.HTTP_503_SERVICE_UNAVAILABLE, f"{self.name} is busy, retry later")
+            finally:
+                self.waiting -= 1
+        except BaseException:
+            self._release_user(user_id)
+            raise
+
+        self.counters["admitted"] += 1
+        self.running += 1
+        return time.monotonic()
+
+    def release(self, user_id, started: float):
+        self.running -= 1
+        self._service_seconds.append(time.monotonic() - started)
+        self._slots.release()
+        self._release_user(user_id)
+
+    def _release_user(self, user_id):
+        if user_id is not None:
+            self._per_user[user_id] -= 1
+            if not self._per_user[user_id]:
+                del self._per_user[user_id]
+
+    @asynccontextmanager
+    async def admit(self, user_id=None, timeout: float = None):
+        started = await self.acquire(user_id, timeout)
+        try:
+            yield
+        finally:
+            self.release(user_id, started)
+
+    def stats(self) -> dict:
+        return {"concurrency": self.concurrency, "max_queue": self.max_queue, "running": self.running,
+                "waiting": self.waiting, **self.counters}
+
+
+def _limiter(name: str, concurrency: int, max_queue: int, max_wait_ms: float) -> EndpointLimiter:
+    prefix = name.upper()
+    return EndpointLimiter(
+        name,
+        int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+        int(os.getenv(f"{prefix}_MAX_QUEUE", str(max_queue))),
+        float(os.getenv(f"{prefix}_MAX_WAIT_MS", str(max_wait_ms))),
+    )
+
+_limiters = {
+    "search": _limiter("search", concurrency=AI_WORKERS, max_queue=4 * AI_WORKERS, max_wait_ms=2000),
+    # request side of uploads only (body spooling, storage, one insert); parsing is resume_pipeline's pool
+    "upload": _limiter("upload", concurrency=8, max_queue=32, max_wait_ms=1000),
+}
+
+def limiter(name: str) -> EndpointLimiter:
+    return _limiters[name]
+
+# ---------------------------
+# RUNNING AI WORK
+# ---------------------------
+
+async def run(endpoint: str, func, *args, user_id=None, deadline_ms: float = None):
+    """
+    Run func(*args, deadline=Deadline) on the AI executor under `endpoint`'s limits.
+    Raises Rejected (429/503) if it cannot start, HTTPException 504 if the deadline passes.
+    """
+    endpoint_limiter = _limiters[endpoint]
+    deadline = Deadline(deadline_ms)
+    started = await endpoint_limiter.acquire(user_id, timeout=deadline.remaining())
+    try:
+        future = asyncio.get_running_loop().run_in_executor(_executor, partial(func, *args, deadline=deadline))
+    except BaseException:
+        endpoint_limiter.release(user_id, started)
+        raise
+
+    def finished(done):
+        # the slot is held until the thread is really done, even after a 504 was sent
+        if not done.cancelled():
+            done.exception()  # retrieved, so an abandoned failure is not logged as unhandled
+        endpoint_limiter.release(user_id, started)
+
+    future.add_done_callback(finished)
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), deadline.remaining())
+    except (asyncio.TimeoutError, DeadlineExceeded):
+        deadline.cancel()  # the thread stops at its next stage boundary
+        endpoint_limiter.counters["deadline_exceeded"] += 1
+        raise _deadline_response(endpoint)
+
+def stats() -> dict:
+    return {"ai_workers": AI_WORKERS, **{name: limiter.stats() for name, limiter in _limiters.items()}}
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -6,6 +6,7 @@ from sqlalchemy import func
 from datetime import datetime, timedelta
 
 from backend import models, schemas
+from backend.services import matching_profiles
 
 # ---------------------------
 # USERS
@@ -90,7 +91,10 @@ def get_jobs(db: Session):
 # ---------------------------
 
 def get_latest_resume(db: Session, user_id: int):
-    """Return the latest resume uploaded by the user."""
+    """Return the user's current resume: the one their matching profile points at, else the latest upload."""
+    profile = matching_profiles.get_profile(db, user_id)
+    if profile:
+        return db.get(models.Resume, profile["resume_id"])
     return (
         db.query(models.Resume)
         .filter(models.Resume.user_id == user_id)
@@ -133,26 +137,40 @@ def get_hot_jobs(db: Session, limit: int = 10, days: int = 7):
         .all()
     )
 
-def get_recommended_jobs(db: Session, user_id: int, limit: int = 10):
+def get_latest_scored_resume(db: Session, user_id: int):
+    """Latest resume whose scores have been computed (a newer upload may still be processing)."""
+    return (
+        db.query(models.Resume)
+        .filter(models.Resume.user_id == user_id, models.Resume.ai_status == "scored")
+        .order_by(models.Resume.created_at.desc(), models.Resume.id.desc())
+        .first()
+    )
+
+def get_recommended_jobs(db: Session, user_id: int, limit: int = 10, with_scores: bool = False):
     """
     Personalized recommended jobs based on latest resume and ResumeScore.
-    Returns list of jobs with score descending.
+    Returns list of jobs with score descending (or (job, score) tuples with
+    with_scores=True). Scores of jobs edited since they were computed are skipped
+    until the background rescore lands.
     """
-    resume = get_latest_resume(db, user_id)
-    if not resume:
+    profile = matching_profiles.get_profile(db, user_id)  # points at the latest scored resume
+    if not profile:
         return []
 
-    # Join Jobs with ResumeScore
+    # Join Jobs with ResumeScore; served by the (resume_id, score) index
     results = (
         db.query(models.Job, models.ResumeScore.score)
         .join(models.ResumeScore, models.ResumeScore.job_id == models.Job.id)
-        .filter(models.ResumeScore.resume_id == resume.id)
+        .filter(models.ResumeScore.resume_id == profile["resume_id"],
+                models.ResumeScore.is_stale == False,
+                models.Job.is_active == True)
         .order_by(models.ResumeScore.score.desc())
         .limit(limit)
         .all()
     )
 
-    # Return just the jobs (can also return tuple of (Job, score) if needed)
+    if with_scores:
+        return results
     return [job for job, score in results]
 
 
@@ -0,0 +1,106 @@
+# backend/services/embedding_chunks.py
+#
+# Database side of the chunk vector cache (see "EMBEDDINGS" in
+# backend/ai/resume_parser.py). Every chunk the model encodes is stored once per
+# CHUNK_MODEL_VERSION in embedding_chunks, keyed by sha1 of its text, so a
+# re-uploaded resume with one edited section, or a job whose description got a
+# new paragraph, only sends the changed chunks to the model, in any worker.
+#
+# Rows are written with a dialect-native insert-or-ignore, so two workers
+# encoding the same chunk never conflict. The table keeps the newest
+# EMBED_CHUNK_CACHE_MAX_ROWS rows; older ones are pruned once a worker has
+# written EMBED_CHUNK_PRUNE_EVERY chunks since its last prune.
+
+import os
+import threading
+from sqlalchemy.orm import Session
+
+from backend.models.embedding_chunk import EmbeddingChunk
+from backend.ai import vector_codec
+from backend.ai.resume_parser import embed_documents as _embed_documents, CHUNK_MODEL_VERSION
+from backend.ai.vector_codec import EMBED_CODEC
+
+EMBED_CHUNK_CACHE_MAX_ROWS = int(os.getenv("EMBED_CHUNK_CACHE_MAX_ROWS", "500000"))
+EMBED_CHUNK_PRUNE_EVERY = int(os.getenv("EMBED_CHUNK_PRUNE_EVERY", str(max(1, EMBED_CHUNK_CACHE_MAX_ROWS // 100))))
+LOOKUP_BATCH_SIZE = 500
+
+_written_since_prune = 0
+_prune_lock = threading.Lock()
+
+def _prune_due(written: int) -> bool:
+    global _written_since_prune
+    with _prune_lock:
+        _written_since_prune += written
+        if _written_since_prune < EMBED_CHUNK_PRUNE_EVERY:
+            return False
+        _written_since_prune = 0
+        return True
+
+def _insert_ignore(db: Session, rows: list):
+    dialect = db.get_bind().dialect.name
+    table = EmbeddingChunk.__table__
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        return insert(table).values(rows).prefix_with("IGNORE")
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        return insert(table).values(rows).on_conflict_do_nothing(index_elements=["chunk_hash", "model_version"])
+    return None
+
+class ChunkStore:
+    """embedding_chunks rows for one session; writes are flushed with the caller's commit."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, hashes: list) -> dict:
+        found = {}
+        for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            rows = (
+                self.db.query(EmbeddingChunk.chunk_hash, EmbeddingChunk.vector, EmbeddingChunk.codec)
+                .filter(EmbeddingChunk.chunk_hash.in_(hashes[start:start + LOOKUP_BATCH_SIZE]),
+                        EmbeddingChunk.model_version == CHUNK_MODEL_VERSION)
+            )
+            for chunk_hash, blob, codec in rows:
+                found[chunk_hash] = vector_codec.decode(blob, codec)
+        return found
+
+    def save(self, vectors: dict):
+        if not vectors:
+            return
+        rows = [
+            {"chunk_hash": chunk_hash, "model_version": CHUNK_MODEL_VERSION,
+             "vector": vector_codec.encode(vector, EMBED_CODEC), "codec": EMBED_CODEC}
+            for chunk_hash, vector in vectors.items()
+        ]
+        stmt = _insert_ignore(self.db, rows)
+        if stmt is not None:
+            self.db.execute(stmt)
+        else:
+            # no native insert-or-ignore on this dialect: skip what is already there
+            stored = set(self.load(list(vectors)))
+            self.db.bulk_insert_mappings(EmbeddingChunk, [row for row in rows if row["chunk_hash"] not in stored])
+        if _prune_due(len(rows)):
+            self._prune()
+
+    def _prune(self):
+        # the id of the newest row past the limit, by position: ids have gaps (ignored inserts,
+        # deletes), so "newest id - limit" would delete more than the surplus
+        cutoff = (
+            self.db.query(EmbeddingChunk.id)
+            .order_by(EmbeddingChunk.id.desc())
+            .offset(EMBED_CHUNK_CACHE_MAX_ROWS)
+            .limit(1)
+            .scalar()
+        )
+        if cutoff is not None:
+            (self.db.query(EmbeddingChunk)
+             .filter(EmbeddingChunk.id <= cutoff)
+             .delete(synchronize_session=False))
+
+def embed_documents(db: Session, texts: list):
+    """resume_parser.embed_documents with the database chunk cache. Caller commits."""
+    return _embed_documents(texts, chunk_store=ChunkStore(db))
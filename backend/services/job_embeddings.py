@@ -0,0 +1,93 @@
+# backend/services/job_embeddings.py
+
+import hashlib
+import numpy as np
+from sqlalchemy.orm import Session
+
+from backend.models.job import Job
+from backend.models.job_embedding import JobEmbedding
+from backend.ai import vector_codec
+from backend.ai.resume_parser import EMBED_MODEL_VERSION
+from backend.ai.vector_codec import EMBED_CODEC
+from backend.services.embedding_chunks import embed_documents
+
+# ---------------------------
+# HELPERS
+# ---------------------------
+
+def job_embedding_text(job: Job) -> str:
+    """The text that gets embedded for a job (what score_resume compares against)."""
+    return job.description or ""
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", "ignore")).hexdigest()
+
+def pack_vector(vector: np.ndarray, codec: str = EMBED_CODEC) -> bytes:
+    return vector_codec.encode(vector, codec)
+
+def unpack_vector(blob: bytes, codec: str = None) -> np.ndarray:
+    """float32 view of a stored vector; rows written before codecs existed are float32."""
+    return vector_codec.decode(blob, codec or "float32")
+
+def is_current(embedding: JobEmbedding, text_hash: str) -> bool:
+    return (
+        embedding is not None
+        and embedding.content_hash == text_hash
+        and embedding.model_version == EMBED_MODEL_VERSION
+    )
+
+# ---------------------------
+# WRITE PATH
+# ---------------------------
+
+def refresh_job_embeddings(db: Session, jobs: list, commit: bool = True) -> int:
+    """
+    (Re)compute embeddings for the given jobs whose text or model version changed.
+    The chunks of all stale jobs are encoded in a single batch. Returns how many were encoded.
+    """
+    stale = []
+    for job in jobs:
+        text = job_embedding_text(job)
+        text_hash = content_hash(text)
+        if not is_current(job.embedding, text_hash):
+            stale.append((job, text, text_hash))
+
+    if not stale:
+        return 0
+
+    vectors = embed_documents(db, [text for _, text, _ in stale])
+    for (job, _, text_hash), vector in zip(stale, vectors):
+        row = job.embedding
+        if row is None:
+            row = JobEmbedding(job_id=job.id)
+            db.add(row)
+            job.embedding = row
+        row.content_hash = text_hash
+        row.model_version = EMBED_MODEL_VERSION
+        row.dim = int(vector.shape[0])
+        row.vector = pack_vector(vector)
+        row.codec = EMBED_CODEC
+
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return len(stale)
+
+def refresh_job_embedding(db: Session, job: Job, commit: bool = True) -> int:
+    """Call after a job is created or its description changes."""
+    return refresh_job_embeddings(db, [job], commit=commit)
+
+# ---------------------------
+# READ PATH
+# ---------------------------
+
+def get_job_matrix(db: Session, jobs: list) -> np.ndarray:
+    """
+    Stored vectors for `jobs` as an (n, dim) matrix, row i <-> jobs[i].
+    Jobs created before the index existed are backfilled here once.
+    """
+    refresh_job_embeddings(db, jobs)
+    if not jobs:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack([unpack_vector(job.embedding.vector, job.embedding.codec) for job in jobs])
@@ -0,0 +1,535 @@
+# backend/services/job_index.py
+#
+# In-process vector index over active job embeddings, used by /jobs/search to
+# pick the top-K jobs for a resume without loading or scoring the whole catalog.
+#
+#   - up to VECTOR_INDEX_IVF_THRESHOLD jobs: exact brute force, one
+#     matrix-vector product + np.argpartition (no full sort);
+#   - above it: an IVF index (spherical k-means into ~sqrt(n) lists, searching
+#     the VECTOR_INDEX_NPROBE closest lists), pure NumPy on the CPU.
+#
+# Rows are held in VECTOR_INDEX_CODEC (int8 + per-row scale by default, a
+# quarter of float32) and scored on that representation; see vector_codec.
+#
+# The bulk of the index is a memory-mapped snapshot (job_snapshot) shared by
+# every worker process; jobs changed since it was written live in a small
+# in-memory delta. job_sync updates the delta directly (add on create/edit,
+# remove on deactivate). Every VECTOR_INDEX_SYNC_SECONDS each worker switches
+# to a newer snapshot if one was published and reads only the rows updated
+# since its last sync. Once VECTOR_SNAPSHOT_DELTA_MAX changes pile up, a worker
+# writes the next snapshot in the background.
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, selectinload
+
+from backend.database import SessionLocal
+from backend.models.job import Job
+from backend.models.job_embedding import JobEmbedding
+from backend.ai import vector_codec
+from backend.ai.resume_parser import EMBED_MODEL_VERSION
+from backend.services import job_snapshot
+from backend.services.job_embeddings import refresh_job_embeddings, unpack_vector
+
+VECTOR_INDEX_IVF_THRESHOLD = int(os.getenv("VECTOR_INDEX_IVF_THRESHOLD", "20000"))
+VECTOR_INDEX_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "8"))
+VECTOR_INDEX_SYNC_SECONDS = float(os.getenv("VECTOR_INDEX_SYNC_SECONDS", "30"))
+VECTOR_INDEX_CODEC = os.getenv("VECTOR_INDEX_CODEC", vector_codec.EMBED_CODEC)
+# write a new snapshot once this many jobs changed since the current one
+VECTOR_SNAPSHOT_DELTA_MAX = int(os.getenv("VECTOR_SNAPSHOT_DELTA_MAX", "500"))
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE = 20000
+
+# ---------------------------
+# SEARCH CORE
+# ---------------------------
+
+def _top_k(ids, vectors, scales, centroids, assign, nprobe, query, k, allowed_ids=None, excluded_ids=None) -> list:
+    """Shared by the in-memory and the memory-mapped index; `ids` holds the live rows only."""
+    query = np.asarray(query, dtype=np.float32)
+    size = len(ids)
+    if size == 0 or k <= 0:
+        return []
+    mask = None
+    if allowed_ids is not None:
+        # filtered searches are exact over the (usually small) allowed set
+        mask = np.isin(ids, np.fromiter(allowed_ids, dtype=np.int64))
+    elif centroids is not None and len(centroids):
+        nprobe = min(nprobe, len(centroids))
+        probe = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+        mask = np.isin(assign[:size], probe)
+    if excluded_ids:
+        keep = ~np.isin(ids, np.fromiter(excluded_ids, dtype=np.int64))
+        mask = keep if mask is None else mask & keep
+
+    if mask is None:
+        rows = None
+        sims = vector_codec.dot_rows(vectors[:size], scales[:size], query)
+    else:
+        rows = np.flatnonzero(mask)
+        sims = vector_codec.dot_rows(vectors[rows], scales[rows], query)
+    if len(sims) == 0:
+        return []
+    candidate_ids = ids if rows is None else ids[rows]
+    k = min(k, len(sims))
+    top = np.argpartition(-sims, k - 1)[:k]
+    top = top[np.argsort(-sims[top])]
+    return [(int(candidate_ids[i]), float(sims[i])) for i in top]
+
+# ---------------------------
+# INDEX
+# ---------------------------
+
+class JobVectorIndex:
+    """Job id -> unit vector rows with exact or IVF top-K search. Thread-safe."""
+
+    def __init__(self, ivf_threshold: int = VECTOR_INDEX_IVF_THRESHOLD, nprobe: int = VECTOR_INDEX_NPROBE,
+                 codec: str = VECTOR_INDEX_CODEC):
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.codec = codec
+        self._lock = threading.RLock()
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._vectors = None          # (capacity, dim) in the codec's dtype; rows [0, _size) are live
+        self._scales = np.zeros(0, dtype=np.float32)  # per-row dequantization scale
+        self._size = 0
+        self._rows = {}               # job id -> row
+        # IVF state, only built above ivf_threshold
+        self._centroids = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+
+    def __len__(self):
+        return self._size
+
+    # -- mutation ------------------------------------------------------
+
+    def _reserve(self, dim: int, capacity: int):
+        if self._vectors is None:
+            self._vectors = np.zeros((max(capacity, 64), dim), dtype=vector_codec.storage_dtype(self.codec))
+            self._scales = np.ones(len(self._vectors), dtype=np.float32)
+            self._ids = np.zeros(len(self._vectors), dtype=np.int64)
+            self._assign = np.zeros(len(self._vectors), dtype=np.int32)
+        elif capacity > len(self._vectors):
+            grown = max(capacity, 2 * len(self._vectors))  # doubling keeps add() amortized O(dim)
+            self._vectors = np.resize(self._vectors, (grown, self._vectors.shape[1]))
+            self._scales = np.resize(self._scales, grown)
+            self._ids = np.resize(self._ids, grown)
+            self._assign = np.resize(self._assign, grown)
+
+    def build(self, job_ids: list, vectors: np.ndarray):
+        """Replace the whole index."""
+        with self._lock:
+            self._vectors = None
+            self._size = 0
+            self._rows = {}
+            self._centroids = None
+            if len(job_ids):
+                rows, scales = vector_codec.encode_rows(vectors, self.codec)
+                self._reserve(rows.shape[1], len(job_ids))
+                self._vectors[:len(job_ids)] = rows
+                self._scales[:len(job_ids)] = scales
+                self._ids[:len(job_ids)] = job_ids
+                self._size = len(job_ids)
+                self._rows = {int(job_id): row for row, job_id in enumerate(job_ids)}
+            self._maybe_train()
+
+    def add(self, job_id: int, vector: np.ndarray):
+        """Insert or replace one job's vector."""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            if self._vectors is not None and vector.shape[0] != self._vectors.shape[1]:
+                raise ValueError(f"vector has dim {vector.shape[0]}, index has {self._vectors.shape[1]}")
+            row = self._rows.get(job_id)
+            if row is None:
+                self._reserve(vector.shape[0], self._size + 1)
+                row = self._size
+                self._size += 1
+                self._rows[job_id] = row
+                self._ids[row] = job_id
+            rows, scales = vector_codec.encode_rows(vector, self.codec)
+            self._vectors[row] = rows[0]
+            self._scales[row] = scales[0]
+            if self._centroids is not None:
+                self._assign[row] = int(np.argmax(self._centroids @ vector))
+            self._maybe_train()
+
+    def remove(self, job_id: int) -> bool:
+        with self._lock:
+            row = self._rows.pop(job_id, None)
+            if row is None:
+                return False
+            last = self._size - 1
+            if row != last:
+                # move the last row into the hole so live rows stay contiguous
+                self._vectors[row] = self._vectors[last]
+                self._scales[row] = self._scales[last]
+                self._ids[row] = self._ids[last]
+                self._assign[row] = self._assign[last]
+                self._rows[int(self._ids[row])] = row
+            self._size = last
+            if self._size < self.ivf_threshold:
+                self._centroids = None
+            return True
+
+    # -- IVF -----------------------------------------------------------
+
+    def _maybe_train(self):
+        # (re)train when crossing the threshold and again whenever the index doubles
+        if self._size < self.ivf_threshold:
+            self._centroids = None
+            return
+        if self._centroids is not None and self._size < 2 * self._trained_size:
+            return
+        live = self._vectors[:self._size]
+        nlist = int(min(4096, max(16, np.sqrt(self._size))))
+        rng = np.random.default_rng(0)
+        picked = rng.choice(self._size, size=min(self._size, KMEANS_SAMPLE), replace=False)
+        sample = vector_codec.decode_rows(live[picked], self._scales[picked])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        self._centroids = centroids
+        for start in range(0, self._size, 8192):
+            chunk = vector_codec.decode_rows(live[start:start + 8192], self._scales[start:start + 8192])
+            self._assign[start:start + 8192] = np.argmax(chunk @ centroids.T, axis=1)
+        self._trained_size = self._size
+
+    # -- search --------------------------------------------------------
+
+    def search(self, query: np.ndarray, k: int, allowed_ids=None, excluded_ids=None) -> list:
+        """
+        Top `k` (job_id, cosine similarity) pairs, best first. `allowed_ids`
+        restricts the search to those jobs (e.g. a title filter); `excluded_ids`
+        hides jobs.
+        """
+        with self._lock:
+            return _top_k(
+                self._ids[:self._size], self._vectors, self._scales, self._centroids, self._assign,
+                self.nprobe, query, k, allowed_ids, excluded_ids,
+            )
+
+    def contains(self, job_id: int) -> bool:
+        return job_id in self._rows
+
+    def export(self) -> dict:
+        """Copies of the live arrays, sorted by job id (the snapshot layout)."""
+        with self._lock:
+            order = np.argsort(self._ids[:self._size], kind="stable")
+            dim = 0 if self._vectors is None else self._vectors.shape[1]
+            vectors = (np.zeros((0, dim), dtype=vector_codec.storage_dtype(self.codec)) if self._vectors is None
+                       else self._vectors[:self._size][order])
+            return {
+                "ids": self._ids[:self._size][order],
+                "vectors": vectors,
+                "scales": self._scales[:self._size][order],
+                "centroids": (self._centroids if self._centroids is not None
+                              else np.zeros((0, dim), dtype=np.float32)),
+                "assign": self._assign[:self._size][order],
+            }
+
+    def get_vectors(self, job_ids: list) -> np.ndarray:
+        """Stored vectors for `job_ids` as float32 (all must be indexed), row i <-> job_ids[i]."""
+        with self._lock:
+            rows = [self._rows[job_id] for job_id in job_ids]
+            return vector_codec.decode_rows(self._vectors[rows], self._scales[rows])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self._size,
+                "mode": "ivf" if self._centroids is not None else "exact",
+                "lists": 0 if self._centroids is None else len(self._centroids),
+                "nprobe": self.nprobe,
+                "ivf_threshold": self.ivf_threshold,
+                "codec": self.codec,
+                "bytes": 0 if self._vectors is None else int(
+                    self._size * (self._vectors.itemsize * self._vectors.shape[1] + self._scales.itemsize)),
+            }
+
+# ---------------------------
+# SNAPSHOT + DELTA
+# ---------------------------
+
+class MappedJobIndex:
+    """Read-only index over a memory-mapped snapshot (see job_snapshot); ids are sorted."""
+
+    def __init__(self, arrays: dict, manifest: dict, nprobe: int = VECTOR_INDEX_NPROBE):
+        self.manifest = manifest
+        self.version = manifest["version"]
+        self.nprobe = nprobe
+        self._ids = arrays["ids"]
+        self._vectors = arrays["vectors"]
+        self._scales = arrays["scales"]
+        self._centroids = arrays["centroids"] if len(arrays["centroids"]) else None
+        self._assign = arrays["assign"]
+
+    def __len__(self):
+        return len(self._ids)
+
+    def contains(self, job_id: int) -> bool:
+        i = int(np.searchsorted(self._ids, job_id))
+        return i < len(self._ids) and int(self._ids[i]) == job_id
+
+    def search(self, query: np.ndarray, k: int, allowed_ids=None, excluded_ids=None) -> list:
+        return _top_k(self._ids, self._vectors, self._scales, self._centroids, self._assign,
+                      self.nprobe, query, k, allowed_ids, excluded_ids)
+
+    def get_vectors(self, job_ids: list) -> np.ndarray:
+        rows = np.searchsorted(self._ids, np.asarray(job_ids, dtype=np.int64))
+        return vector_codec.decode_rows(self._vectors[rows], self._scales[rows])
+
+
+class LayeredJobIndex:
+    """
+    A memory-mapped snapshot shared by all workers, plus a small in-memory delta
+    for jobs added or edited since it was written. Snapshot rows that were
+    edited or removed since are shadowed.
+    """
+
+    def __init__(self, base: MappedJobIndex = None):
+        self.base = base
+        self.delta = JobVectorIndex()
+        self._shadowed = set()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.delta) + (len(self.base) - len(self._shadowed) if self.base is not None else 0)
+
+    def pending(self) -> int:
+        """Changes not in the snapshot yet."""
+        return len(self.delta) + len(self._shadowed)
+
+    def add(self, job_id: int, vector: np.ndarray):
+        with self._lock:
+            self.delta.add(job_id, vector)
+            if self.base is not None and self.base.contains(job_id):
+                self._shadowed.add(job_id)
+
+    def remove(self, job_id: int):
+        with self._lock:
+            self.delta.remove(job_id)
+            if self.base is not None and self.base.contains(job_id):
+                self._shadowed.add(job_id)
+
+    def search(self, query: np.ndarray, k: int, allowed_ids=None) -> list:
+        with self._lock:
+            base, shadowed = self.base, set(self._shadowed)
+            hits = self.delta.search(query, k, allowed_ids)
+        if base is not None:
+            hits += base.search(query, k, allowed_ids, excluded_ids=shadowed)
+        hits.sort(key=lambda hit: hit[1], reverse=True)
+        return hits[:k]
+
+    def get_vectors(self, job_ids: list) -> np.ndarray:
+        with self._lock:
+            in_delta = [self.delta.contains(job_id) for job_id in job_ids]
+            delta_ids = [j for j, d in zip(job_ids, in_delta) if d]
+            delta_rows = self.delta.get_vectors(delta_ids) if delta_ids else None
+        base_ids = [j for j, d in zip(job_ids, in_delta) if not d]
+        base_rows = self.base.get_vectors(base_ids) if base_ids else None
+        out, di, bi = [], 0, 0
+        for d in in_delta:
+            if d:
+                out.append(delta_rows[di])
+                di += 1
+            else:
+                out.append(base_rows[bi])
+                bi += 1
+        return np.vstack(out) if out else np.zeros((0, 0), dtype=np.float32)
+
+    def contains(self, job_id: int) -> bool:
+        with self._lock:
+            if self.delta.contains(job_id):
+                return True
+            return self.base is not None and job_id not in self._shadowed and self.base.contains(job_id)
+
+    def vectors_for(self, job_ids: list, dim: int) -> np.ndarray:
+        """Like get_vectors, but jobs that are not indexed get a zero row instead of an error."""
+        out = np.zeros((len(job_ids), dim), dtype=np.float32)
+        with self._lock:
+            present = [i for i, job_id in enumerate(job_ids) if self.contains(job_id)]
+            if present:
+                out[present] = self.get_vectors([job_ids[i] for i in present])
+        return out
+
+    def stats(self) -> dict:
+        with self._lock:
+            base = self.base
+            return {
+                "size": len(self),
+                "snapshot_version": base.version if base is not None else None,
+                "snapshot_size": len(base) if base is not None else 0,
+                "snapshot_mode": ("ivf" if base._centroids is not None else "exact") if base is not None else None,
+                "delta": self.delta.stats(),
+                "shadowed": len(self._shadowed),
+            }
+
+# ---------------------------
+# PROCESS-WIDE INSTANCE
+# ---------------------------
+
+_index = LayeredJobIndex()
+_state = {"loaded": False, "synced_at": None, "checked": 0.0}
+_state_lock = threading.Lock()
+_snapshot_thread = None
+_snapshot_thread_lock = threading.Lock()
+
+def backfill(db: Session):
+    # embed active jobs that predate the embedding table (or an old model) once
+    stale = (
+        db.query(Job)
+        .options(selectinload(Job.embedding))
+        .outerjoin(JobEmbedding, JobEmbedding.job_id == Job.id)
+        .filter(Job.is_active == True,
+                or_(JobEmbedding.id == None, JobEmbedding.model_version != EMBED_MODEL_VERSION))
+        .all()
+    )
+    refresh_job_embeddings(db, stale)
+
+def _active_vectors(db: Session):
+    rows = (
+        db.query(JobEmbedding.job_id, JobEmbedding.vector, JobEmbedding.codec)
+        .join(Job, Job.id == JobEmbedding.job_id)
+        .filter(Job.is_active == True, JobEmbedding.model_version == EMBED_MODEL_VERSION)
+        .all()
+    )
+    vectors = (np.vstack([unpack_vector(blob, codec) for _, blob, codec in rows]) if rows
+               else np.zeros((0, 0), dtype=np.float32))
+    return [job_id for job_id, _, _ in rows], vectors
+
+def _open_snapshot():
+    """The current snapshot, mapped, if it matches this process's model and codec."""
+    if not job_snapshot.SNAPSHOTS_ENABLED:
+        return None
+    manifest = job_snapshot.read_manifest()
+    if (manifest is None or manifest.get("model_version") != EMBED_MODEL_VERSION
+            or manifest.get("codec") != VECTOR_INDEX_CODEC):
+        return None
+    try:
+        return MappedJobIndex(job_snapshot.open_arrays(manifest), manifest)
+    except (OSError, ValueError) as e:
+        print("Could not map job index snapshot:", e)
+        return None
+
+def sync(db: Session, index: LayeredJobIndex, since: datetime) -> datetime:
+    """Apply job/embedding rows changed since `since` to `index`; returns the new sync point."""
+    since = since - timedelta(seconds=1)  # clock/commit skew margin
+    started = datetime.utcnow()
+    changed = (
+        db.query(Job.id, Job.is_active, JobEmbedding.vector, JobEmbedding.codec, JobEmbedding.model_version)
+        .outerjoin(JobEmbedding, JobEmbedding.job_id == Job.id)
+        .filter(or_(Job.updated_at >= since, JobEmbedding.updated_at >= since))
+        .all()
+    )
+    for job_id, is_active, blob, codec, model_version in changed:
+        if is_active and blob is not None and model_version == EMBED_MODEL_VERSION:
+            index.add(job_id, unpack_vector(blob, codec))
+        else:
+            index.remove(job_id)
+    return started
+
+def _load(db: Session):
+    global _index
+    backfill(db)
+    mapped = _open_snapshot()
+    if mapped is not None:
+        index = LayeredJobIndex(mapped)
+        synced_at = sync(db, index, datetime.fromisoformat(mapped.manifest["synced_at"]))
+    else:
+        # no usable snapshot yet: hold everything in memory and have one written
+        synced_at = datetime.utcnow()
+        index = LayeredJobIndex()
+        job_ids, vectors = _active_vectors(db)
+        index.delta.build(job_ids, vectors)
+        request_snapshot()
+    _index = index
+    _state.update(loaded=True, synced_at=synced_at, checked=time.monotonic())
+    print(f"Job vector index loaded: {_index.stats()}")
+
+def _refresh(db: Session):
+    """Periodic: switch to a newer snapshot if one was published, then catch up from the DB."""
+    global _index
+    manifest = job_snapshot.read_manifest() if job_snapshot.SNAPSHOTS_ENABLED else None
+    current = _index.base.version if _index.base is not None else 0
+    mapped = _open_snapshot() if manifest and manifest["version"] > current else None
+    if mapped is not None:
+        # fill the new layer's delta before swapping so searches never see a gap
+        index = LayeredJobIndex(mapped)
+        synced_at = sync(db, index, datetime.fromisoformat(mapped.manifest["synced_at"]))
+        _index = index
+    else:
+        synced_at = sync(db, _index, _state["synced_at"])
+    _state.update(synced_at=synced_at, checked=time.monotonic())
+    if _index.pending() >= VECTOR_SNAPSHOT_DELTA_MAX:
+        request_snapshot()
+
+def get_job_index(db: Session) -> LayeredJobIndex:
+    """The loaded, recently synced index. Loads from the snapshot (or the DB) on first use."""
+    with _state_lock:
+        if not _state["loaded"]:
+            _load(db)
+        elif time.monotonic() - _state["checked"] >= VECTOR_INDEX_SYNC_SECONDS:
+            _refresh(db)
+    return _index
+
+def index_job(job: Job):
+    """job_sync hook: the job's stored embedding is current, put it in the index."""
+    if _state["loaded"] and job.embedding is not None and job.embedding.model_version == EMBED_MODEL_VERSION:
+        _index.add(job.id, unpack_vector(job.embedding.vector, job.embedding.codec))
+
+def unindex_job(job_id: int):
+    _index.remove(job_id)
+
+def stats() -> dict:
+    return {"loaded": _state["loaded"], "codec": VECTOR_INDEX_CODEC, **_index.stats()}
+
+# ---------------------------
+# SNAPSHOT WRITER
+# ---------------------------
+
+def write_snapshot(db: Session):
+    """Build the index from the DB and publish it as the next snapshot. None if another process is writing."""
+    with job_snapshot.writer_lock() as acquired:
+        if not acquired:
+            return None
+        started = datetime.utcnow()
+        job_ids, vectors = _active_vectors(db)
+        index = JobVectorIndex()
+        index.build(job_ids, vectors)
+        manifest = job_snapshot.publish(index.export(), {
+            "codec": VECTOR_INDEX_CODEC,
+            "model_version": EMBED_MODEL_VERSION,
+            "synced_at": started.isoformat(),
+        })
+    print(f"Job index snapshot v{manifest['version']} written: {manifest['count']} jobs")
+    return manifest
+
+def _write_snapshot_in_background():
+    db = SessionLocal()
+    try:
+        write_snapshot(db)
+    except Exception as e:
+        print("Job index snapshot failed:", e)
+    finally:
+        db.close()
+
+def request_snapshot():
+    """Write a fresh snapshot on a background thread (at most one at a time per process)."""
+    global _snapshot_thread
+    if not job_snapshot.SNAPSHOTS_ENABLED:
+        return
+    with _snapshot_thread_lock:
+        if _snapshot_thread is not None and _snapshot_thread.is_alive():
+            return
+        _snapshot_thread = threading.Thread(target=_write_snapshot_in_background, name="job-snapshot", daemon=True)
+        _snapshot_thread.start()
@@ -0,0 +1,199 @@
+# backend/services/job_ranker.py
+#
+# Multi-stage ranking behind /jobs/search. Work per request is bounded by
+# RANK_CANDIDATES, however many jobs are active:
+#
+#   1. candidates  cheap, indexed lookups only:
+#                  - with ?query=: the best full-text matches (job_search, BM25);
+#                  - otherwise: the jobs sharing the most skills with the resume
+#                    (job_skills), topped up with its nearest jobs in the vector
+#                    index (job_index);
+#   2. rerank      score_features for the candidates (skill overlap, education,
+#                  embedding similarity from stored vectors) plus the full-text
+#                  relevance, combined with the RANK_WEIGHT_* weights;
+#   3. select      the top `limit` by partial selection;
+#   4. cross       optional (RERANK_ENABLED): a cross-encoder rescores the top
+#                  RERANK_TOP_N within a latency budget, see ai/reranker. Their
+#                  score becomes a RANK_WEIGHT_CROSS blend of both stages; if
+#                  the budget runs out the first-stage order is kept.
+#
+# The default weights (50/20/30, no text weight) reproduce score_resume, so the
+# score a user sees does not depend on the path that found the job. Each stage
+# is timed: the router sends the timings as a Server-Timing header, and rolling
+# percentiles per stage are in /health/metrics.
+
+import heapq
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+from sqlalchemy.orm import Session, selectinload
+
+from backend.models.job import Job
+from backend.ai import reranker
+from backend.ai.resume_parser import score_features
+from backend.services import job_index, job_search, job_skills
+from backend.services.admission import DeadlineExceeded
+
+RANK_CANDIDATES = int(os.getenv("RANK_CANDIDATES", "300"))
+# without a query, this many of the candidates come from skill overlap, the rest from the vector index
+RANK_SKILL_CANDIDATES = int(os.getenv("RANK_SKILL_CANDIDATES", "150"))
+RANK_WEIGHT_SKILLS = float(os.getenv("RANK_WEIGHT_SKILLS", "50"))
+RANK_WEIGHT_EDUCATION = float(os.getenv("RANK_WEIGHT_EDUCATION", "20"))
+RANK_WEIGHT_SIMILARITY = float(os.getenv("RANK_WEIGHT_SIMILARITY", "30"))
+RANK_WEIGHT_TEXT = float(os.getenv("RANK_WEIGHT_TEXT", "0"))  # full-text relevance, scaled to 0-1 per request
+RANK_WEIGHT_CROSS = float(os.getenv("RANK_WEIGHT_CROSS", "0.5"))  # share of the cross-encoder in a reranked score
+
+# ---------------------------
+# STAGE TIMINGS
+# ---------------------------
+
+_latencies = {}  # stage -> recent durations in seconds
+_latencies_lock = threading.Lock()
+
+class StageTimer:
+    """
+    Durations of one request's stages, in the order they ran. With a `deadline`
+    (services/admission.Deadline), a stage does not start once it has passed.
+    """
+
+    def __init__(self, deadline=None):
+        self.stages = {}
+        self.deadline = deadline
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.deadline is not None:
+            self.deadline.check()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def finish(self):
+        self.stages["total"] = time.perf_counter() - self._started
+        with _latencies_lock:
+            for name, seconds in self.stages.items():
+                _latencies.setdefault(name, deque(maxlen=1000)).append(seconds)
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items())
+
+def stats() -> dict:
+    def pct(values, p):
+        return round(values[min(len(values) - 1, int(p * len(values)))] * 1000, 2)
+
+    with _latencies_lock:
+        snapshot = {name: sorted(values) for name, values in _latencies.items()}
+    return {
+        "weights": {"skills": RANK_WEIGHT_SKILLS, "education": RANK_WEIGHT_EDUCATION,
+                    "similarity": RANK_WEIGHT_SIMILARITY, "text": RANK_WEIGHT_TEXT},
+        "candidates": RANK_CANDIDATES,
+        "cross_encoder": reranker.stats(),
+        "stages_ms": {
+            name: {"p50": pct(values, 0.50), "p99": pct(values, 0.99), "max": round(values[-1] * 1000, 2)}
+            for name, values in snapshot.items() if values
+        },
+    }
+
+# ---------------------------
+# RANKING
+# ---------------------------
+
+def _candidates(db: Session, profile: dict, query, index, resume_vector, n: int):
+    """(candidate job ids, {job_id: full-text relevance})."""
+    if query:
+        relevance = dict(job_search.search_job_ids(db, query, n))
+        return list(relevance), relevance
+
+    ids = [job_id for job_id, _ in job_skills.recommend_job_ids(db, profile["skills"], min(RANK_SKILL_CANDIDATES, n))]
+    if index is not None and len(ids) < n:
+        seen = set(ids)
+        for job_id, _ in index.search(resume_vector, n):
+            if job_id not in seen:
+                ids.append(job_id)
+                seen.add(job_id)
+                if len(ids) >= n:
+                    break
+    return ids, {}
+
+def rank_jobs(db: Session, profile: dict, query: str = None, limit: int = 20,
+              timer: StageTimer = None) -> list:
+    """The best `limit` (job, score) pairs for a matching profile (see matching_profiles), best first."""
+    timer = timer or StageTimer()
+    n = max(RANK_CANDIDATES, limit)
+
+    # the profile carries the resume's stored embedding; nothing is encoded here
+    resume_vector = profile["vector"]
+    index = None
+    if resume_vector is not None:
+        try:
+            with timer.stage("index"):
+                index = job_index.get_job_index(db)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            db.rollback()
+            print("Job vector index unavailable, ranking without similarity:", e)
+
+    # 1. candidates
+    with timer.stage("candidates"):
+        candidate_ids, relevance = _candidates(db, profile, query, index, resume_vector, n)
+    if not candidate_ids:
+        return []
+
+    with timer.stage("load"):
+        jobs = (
+            db.query(Job)
+            .options(selectinload(Job.employer))
+            .filter(Job.id.in_(candidate_ids), Job.is_active == True)
+            .all()
+        )
+
+    # 2. rerank the candidates only, on stored vectors
+    with timer.stage("rerank"):
+        job_vectors = index.vectors_for([job.id for job in jobs], len(resume_vector)) if index is not None else None
+        features = score_features(
+            profile, [job.description for job in jobs],
+            job_vectors=job_vectors, resume_vector=resume_vector, similarity=index is not None,
+        )
+        scores = RANK_WEIGHT_SKILLS * features["skills"]
+        scores += RANK_WEIGHT_EDUCATION * features["education"]
+        scores += RANK_WEIGHT_SIMILARITY * features["similarity"]
+        if relevance and RANK_WEIGHT_TEXT:
+            text_scores = np.array([relevance.get(job.id, 0.0) for job in jobs])
+            if text_scores.max() > 0:
+                scores += RANK_WEIGHT_TEXT * text_scores / text_scores.max()
+
+    # 3. top `limit` (and the cross-encoder's top N if that is more)
+    top_n = reranker.RERANK_TOP_N if reranker.RERANK_ENABLED else 0
+    with timer.stage("select"):
+        best = heapq.nlargest(max(limit, top_n), zip(scores.tolist(), range(len(jobs))))
+
+    # 4. optional cross-encoder pass over the head of the list
+    if top_n and best:
+        with timer.stage("cross"):
+            best = _cross_rerank(profile, jobs, best, top_n, timer)
+    return [(jobs[i], score) for score, i in best[:limit]]
+
+def _cross_rerank(profile: dict, jobs: list, best: list, top_n: int, timer: StageTimer) -> list:
+    head, tail = best[:top_n], best[top_n:]
+    texts = [f"{jobs[i].title}. {jobs[i].description}" for _, i in head]
+    resume_hash = profile["content_hash"] or reranker.text_hash(profile["text"])
+    budget_ms = reranker.RERANK_BUDGET_MS
+    if timer.deadline is not None:
+        budget_ms = min(budget_ms, timer.deadline.remaining() * 1000)
+    relevance = reranker.relevance(resume_hash, profile["text"], [(reranker.text_hash(t), t) for t in texts],
+                                   budget_ms=budget_ms)
+    if relevance is None:
+        return best  # over budget or unavailable: first-stage order
+    head = [
+        ((1 - RANK_WEIGHT_CROSS) * score + RANK_WEIGHT_CROSS * 100 * rel, i)
+        for (score, i), rel in zip(head, relevance)
+    ]
+    head.sort(reverse=True)
+    return head + tail
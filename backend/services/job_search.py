@@ -0,0 +1,203 @@
+# backend/services/job_search.py
+#
+# Full-text job search over title, description, tags and the employer's
+# company name. Every active job has one row in job_search_documents, kept
+# current by job_sync. The backend is picked from the database dialect:
+#
+#   fts5   SQLite   FTS5 table mirroring the documents (via triggers), ranked by bm25()
+#                   with per-column weights (JOB_SEARCH_WEIGHTS)
+#   mysql  MySQL    FULLTEXT index on the documents, boolean mode, ranked by MATCH()
+#   like   others   AND of LIKE filters over the documents, newest first, unranked
+#
+# JOB_SEARCH_BACKEND overrides the choice (e.g. "like" where FTS5 is not compiled
+# in). Every query term must match; the last term also matches as a prefix, so
+# search-as-you-type works.
+
+import os
+import re
+from sqlalchemy import or_, text
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+from backend.models.job import Job
+from backend.models.employer import Employer
+from backend.models.job_search_document import JobSearchDocument
+
+JOB_SEARCH_BACKEND = os.getenv("JOB_SEARCH_BACKEND", "").strip().lower()
+# bm25 column weights: title, description, tags, company (FTS5 only)
+JOB_SEARCH_WEIGHTS = [float(w) for w in os.getenv("JOB_SEARCH_WEIGHTS", "10,1,4,3").split(",")]
+MAX_QUERY_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+")
+
+def _terms(query: str) -> list:
+    return _TERM_RE.findall((query or "").lower())[:MAX_QUERY_TERMS]
+
+# ---------------------------
+# BACKENDS
+# ---------------------------
+
+class SearchBackend:
+    name = ""
+
+    def ensure_schema(self, db: Session):
+        """Create whatever the backend needs beyond the ORM tables. Idempotent."""
+
+    def search(self, db: Session, terms: list, limit: int) -> list:
+        """Up to `limit` (job_id, relevance) pairs, most relevant first."""
+        raise NotImplementedError
+
+
+class Fts5Backend(SearchBackend):
+    name = "fts5"
+
+    # external-content FTS5 table over job_search_documents; triggers keep it in step
+    _DDL = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS job_search_fts USING fts5("
+        " title, description, tags, company,"
+        " content='job_search_documents', content_rowid='job_id', tokenize='porter unicode61')",
+        "CREATE TRIGGER IF NOT EXISTS job_search_documents_ai AFTER INSERT ON job_search_documents BEGIN"
+        " INSERT INTO job_search_fts(rowid, title, description, tags, company)"
+        " VALUES (new.job_id, new.title, new.description, new.tags, new.company); END",
+        "CREATE TRIGGER IF NOT EXISTS job_search_documents_ad AFTER DELETE ON job_search_documents BEGIN"
+        " INSERT INTO job_search_fts(job_search_fts, rowid, title, description, tags, company)"
+        " VALUES ('delete', old.job_id, old.title, old.description, old.tags, old.company); END",
+        "CREATE TRIGGER IF NOT EXISTS job_search_documents_au AFTER UPDATE ON job_search_documents BEGIN"
+        " INSERT INTO job_search_fts(job_search_fts, rowid, title, description, tags, company)"
+        " VALUES ('delete', old.job_id, old.title, old.description, old.tags, old.company);"
+        " INSERT INTO job_search_fts(rowid, title, description, tags, company)"
+        " VALUES (new.job_id, new.title, new.description, new.tags, new.company); END",
+    ]
+
+    def ensure_schema(self, db: Session):
+        existed = db.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'job_search_fts'")).first()
+        for ddl in self._DDL:
+            db.execute(text(ddl))
+        if not existed:
+            # index documents written before the FTS table existed
+            db.execute(text("INSERT INTO job_search_fts(job_search_fts) VALUES ('rebuild')"))
+
+    def search(self, db: Session, terms: list, limit: int) -> list:
+        match = " ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+        weights = ", ".join(str(w) for w in JOB_SEARCH_WEIGHTS)
+        rows = db.execute(
+            text(f"SELECT rowid, bm25(job_search_fts, {weights}) AS rank FROM job_search_fts"
+                 " WHERE job_search_fts MATCH :match ORDER BY rank LIMIT :limit"),
+            {"match": match, "limit": limit},
+        )
+        # bm25() is lower-is-better
+        return [(job_id, -rank) for job_id, rank in rows]
+
+
+class MySqlFulltextBackend(SearchBackend):
+    name = "mysql"
+
+    def search(self, db: Session, terms: list, limit: int) -> list:
+        against = " ".join([f"+{term}" for term in terms[:-1]] + [f"+{terms[-1]}*"])
+        rows = db.execute(
+            text("SELECT job_id, MATCH(title, description, tags, company) AGAINST (:against IN BOOLEAN MODE) AS relevance"
+                 " FROM job_search_documents"
+                 " WHERE MATCH(title, description, tags, company) AGAINST (:against IN BOOLEAN MODE)"
+                 " ORDER BY relevance DESC LIMIT :limit"),
+            {"against": against, "limit": limit},
+        )
+        return [(job_id, float(relevance)) for job_id, relevance in rows]
+
+
+class LikeBackend(SearchBackend):
+    name = "like"
+
+    def search(self, db: Session, terms: list, limit: int) -> list:
+        query = db.query(JobSearchDocument.job_id)
+        for term in terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            query = query.filter(or_(*[
+                column.ilike(pattern, escape="\\")
+                for column in (JobSearchDocument.title, JobSearchDocument.description,
+                               JobSearchDocument.tags, JobSearchDocument.company)
+            ]))
+        return [(job_id, 0.0) for (job_id,) in query.order_by(JobSearchDocument.job_id.desc()).limit(limit)]
+
+
+_BACKENDS = {backend.name: backend for backend in (Fts5Backend, MySqlFulltextBackend, LikeBackend)}
+_DIALECT_BACKENDS = {"sqlite": "fts5", "mysql": "mysql", "mariadb": "mysql"}
+_backend = None
+
+def get_backend(db: Session) -> SearchBackend:
+    global _backend
+    if _backend is None:
+        name = JOB_SEARCH_BACKEND or _DIALECT_BACKENDS.get(db.get_bind().dialect.name, "like")
+        if name not in _BACKENDS:
+            raise ValueError(f"JOB_SEARCH_BACKEND must be one of {sorted(_BACKENDS)}, got {name!r}")
+        _backend = _BACKENDS[name]()
+    return _backend
+
+# ---------------------------
+# DOCUMENTS (called by job_sync; caller commits)
+# ---------------------------
+
+def index_job(db: Session, job: Job):
+    """Write the job's search document, or drop it if the job is inactive."""
+    if not job.is_active:
+        remove_job(db, job.id)
+        return
+    document = db.get(JobSearchDocument, job.id)
+    if document is None:
+        document = JobSearchDocument(job_id=job.id)
+        db.add(document)
+    document.title = job.title
+    document.description = job.description
+    document.tags = job.tags
+    document.company = job.employer.company_name if job.employer else None
+
+def remove_job(db: Session, job_id: int):
+    db.query(JobSearchDocument).filter(JobSearchDocument.job_id == job_id).delete(synchronize_session=False)
+
+def rebuild(db: Session) -> int:
+    """Rewrite every document from the jobs table."""
+    db.query(JobSearchDocument).delete(synchronize_session=False)
+    rows = (
+        db.query(Job.id, Job.title, Job.description, Job.tags, Employer.company_name)
+        .outerjoin(Employer, Employer.id == Job.employer_id)
+        .filter(Job.is_active == True)
+        .all()
+    )
+    db.bulk_insert_mappings(JobSearchDocument, [
+        {"job_id": job_id, "title": title, "description": description, "tags": tags, "company": company}
+        for job_id, title, description, tags, company in rows
+    ])
+    return len(rows)
+
+# ---------------------------
+# STARTUP / QUERIES
+# ---------------------------
+
+def ensure_schema():
+    """Startup: create the backend's index and fill it if the documents table is new."""
+    global _backend
+    db = SessionLocal()
+    try:
+        backend = get_backend(db)
+        try:
+            backend.ensure_schema(db)
+        except Exception as e:
+            db.rollback()
+            print(f"Full-text search backend '{backend.name}' unavailable, using LIKE:", e)
+            _backend = LikeBackend()
+        if db.query(JobSearchDocument.job_id).first() is None:
+            indexed = rebuild(db)
+            if indexed:
+                print(f"Indexed {indexed} jobs for full-text search")
+        db.commit()
+    finally:
+        db.close()
+
+def search_job_ids(db: Session, query: str, limit: int) -> list:
+    """(job_id, relevance) pairs for the active jobs matching every term of `query`, best first."""
+    terms = _terms(query)
+    if not terms:
+        return []
+    return get_backend(db).search(db, terms, limit)
+
+def backend_name() -> str:
+    return _backend.name if _backend is not None else None
@@ -0,0 +1,113 @@
+# backend/services/job_skills.py
+#
+# Skill -> job inverted index behind /best-jobs/recommended. Each active job's
+# required_skills are canonicalized to skill_taxonomy ids and stored one row per
+# (job_id, skill_id) in job_skills. job_sync keeps the rows current on create,
+# edit and removal. A recommendation reads the posting lists of the resume's
+# skills (an index-only lookup on (skill_id, job_id)) and ranks jobs by how
+# many of those skills they require.
+#
+# Posting lists of frequently asked skills are kept in a bounded in-process LRU
+# (JOB_SKILL_CACHE_SIZE skills). Writes in this process evict the affected
+# skills at once; other workers see them within JOB_SKILL_CACHE_SECONDS.
+
+import heapq
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from sqlalchemy.orm import Session
+
+from backend.models.job import Job
+from backend.models.job_skill import JobSkill
+from backend.ai.skill_taxonomy import skill_ids_for
+
+JOB_SKILL_CACHE_SIZE = int(os.getenv("JOB_SKILL_CACHE_SIZE", "256"))
+JOB_SKILL_CACHE_SECONDS = float(os.getenv("JOB_SKILL_CACHE_SECONDS", "60"))
+
+_postings = OrderedDict()  # skill id -> (loaded at, tuple of job ids), LRU order
+_postings_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0}
+
+# ---------------------------
+# WRITES
+# ---------------------------
+
+def _required_skills(job: Job) -> list:
+    try:
+        skills = json.loads(job.required_skills or "[]")
+    except ValueError:
+        return []
+    return skills if isinstance(skills, list) else []
+
+def sync_job_skills(db: Session, job: Job):
+    """Rewrite the job's rows from its required_skills (only the difference is written). Caller commits."""
+    wanted = set(skill_ids_for(_required_skills(job))) if job.is_active else set()
+    stored = {skill_id for (skill_id,) in db.query(JobSkill.skill_id).filter(JobSkill.job_id == job.id)}
+    removed, added = stored - wanted, wanted - stored
+    if removed:
+        (db.query(JobSkill)
+         .filter(JobSkill.job_id == job.id, JobSkill.skill_id.in_(removed))
+         .delete(synchronize_session=False))
+    db.add_all(JobSkill(job_id=job.id, skill_id=skill_id) for skill_id in added)
+    _evict(removed | added)
+
+def delete_job_skills(db: Session, job_id: int):
+    """The job no longer takes part in recommendations. Caller commits."""
+    skill_ids = {skill_id for (skill_id,) in db.query(JobSkill.skill_id).filter(JobSkill.job_id == job_id)}
+    if skill_ids:
+        db.query(JobSkill).filter(JobSkill.job_id == job_id).delete(synchronize_session=False)
+    _evict(skill_ids)
+
+def _evict(skill_ids: set):
+    with _postings_lock:
+        for skill_id in skill_ids:
+            _postings.pop(skill_id, None)
+
+# ---------------------------
+# READS
+# ---------------------------
+
+def _posting_lists(db: Session, skill_ids: list) -> dict:
+    """skill id -> job ids, from the LRU where fresh, the rest in one indexed query."""
+    now = time.monotonic()
+    found = {}
+    with _postings_lock:
+        for skill_id in skill_ids:
+            entry = _postings.get(skill_id)
+            if entry is not None and now - entry[0] < JOB_SKILL_CACHE_SECONDS:
+                _postings.move_to_end(skill_id)
+                found[skill_id] = entry[1]
+        _counters["hits"] += len(found)
+        _counters["misses"] += len(skill_ids) - len(found)
+
+    missing = [skill_id for skill_id in skill_ids if skill_id not in found]
+    if missing:
+        loaded = {skill_id: [] for skill_id in missing}
+        for skill_id, job_id in db.query(JobSkill.skill_id, JobSkill.job_id).filter(JobSkill.skill_id.in_(missing)):
+            loaded[skill_id].append(job_id)
+        with _postings_lock:
+            for skill_id, job_ids in loaded.items():
+                found[skill_id] = tuple(job_ids)
+                _postings[skill_id] = (now, found[skill_id])
+            while len(_postings) > JOB_SKILL_CACHE_SIZE:
+                _postings.popitem(last=False)
+    return found
+
+def recommend_job_ids(db: Session, skills: list, limit: int = 20) -> list:
+    """
+    (job_id, overlap) for the jobs sharing the most skills with `skills` (free-form
+    strings, canonicalized here), best first; newer jobs win ties.
+    """
+    skill_ids = skill_ids_for(skills)
+    if not skill_ids:
+        return []
+    overlap = Counter()
+    for job_ids in _posting_lists(db, skill_ids).values():
+        overlap.update(job_ids)
+    return heapq.nlargest(limit, overlap.items(), key=lambda item: (item[1], item[0]))
+
+def stats() -> dict:
+    with _postings_lock:
+        return {"cached_skills": len(_postings), **_counters}
@@ -0,0 +1,117 @@
+# backend/services/job_snapshot.py
+#
+# On-disk, versioned snapshots of the job vector index, so every uvicorn /
+# gunicorn worker maps the same read-only files instead of building its own
+# copy (the OS page cache holds one copy for all of them).
+#
+#   <VECTOR_SNAPSHOT_DIR>/
+#     CURRENT.json                 manifest of the live version
+#     v<N>.ids.npy                 int64 job ids, sorted
+#     v<N>.vectors.npy             rows in the manifest's codec
+#     v<N>.scales.npy              per-row dequantization scales
+#     v<N>.centroids.npy / .assign.npy   IVF lists (empty below the threshold)
+#
+# Arrays are written to temp files and renamed into place, then CURRENT.json is
+# replaced, so readers see either the old version or the new one, never a mix.
+# Only one process writes at a time (flock on .lock). Versions older than the
+# previous one are deleted on publish; open mappings stay valid because
+# unlinked files live on until their last mapping closes.
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: snapshots can still be built with the script
+    fcntl = None
+
+VECTOR_SNAPSHOT_DIR = os.getenv("VECTOR_SNAPSHOT_DIR", "backend/data/job_index")
+SNAPSHOTS_ENABLED = bool(VECTOR_SNAPSHOT_DIR)  # VECTOR_SNAPSHOT_DIR="" keeps the index purely in memory
+MANIFEST = "CURRENT.json"
+ARRAYS = ("ids", "vectors", "scales", "centroids", "assign")
+
+
+def _path(name: str) -> str:
+    return os.path.join(VECTOR_SNAPSHOT_DIR, name)
+
+def _array_path(version: int, array: str) -> str:
+    return _path(f"v{version}.{array}.npy")
+
+def _replace_atomically(final_path: str, write):
+    fd, tmp_path = tempfile.mkstemp(dir=VECTOR_SNAPSHOT_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, final_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# ---------------------------
+# READ
+# ---------------------------
+
+def read_manifest():
+    """The live snapshot's manifest, or None if there is none yet."""
+    try:
+        with open(_path(MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def open_arrays(manifest: dict) -> dict:
+    """Memory-map a snapshot's arrays read-only."""
+    return {array: np.load(_array_path(manifest["version"], array), mmap_mode="r") for array in ARRAYS}
+
+# ---------------------------
+# WRITE
+# ---------------------------
+
+@contextmanager
+def writer_lock():
+    """Non-blocking exclusive writer lock; yields False if another process holds it."""
+    os.makedirs(VECTOR_SNAPSHOT_DIR, exist_ok=True)
+    with open(_path(".lock"), "a") as f:  # closing the file releases the flock
+        if fcntl is not None:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+        yield True
+
+def publish(arrays: dict, meta: dict) -> dict:
+    """
+    Write `arrays` (see ARRAYS) as the next version and make it current.
+    `meta` (codec, model_version, synced_at, ...) is stored in the manifest.
+    Call with the writer lock held.
+    """
+    os.makedirs(VECTOR_SNAPSHOT_DIR, exist_ok=True)
+    previous = read_manifest()
+    version = (previous["version"] if previous else 0) + 1
+
+    for array in ARRAYS:
+        _replace_atomically(_array_path(version, array), lambda f, a=arrays[array]: np.save(f, a))
+
+    manifest = {**meta, "version": version, "count": int(len(arrays["ids"]))}
+    _replace_atomically(_path(MANIFEST), lambda f: f.write(json.dumps(manifest).encode("utf-8")))
+    # keep the previous version for workers that read the old manifest a moment ago
+    _remove_older_than(version - 1)
+    return manifest
+
+def _remove_older_than(version: int):
+    for name in os.listdir(VECTOR_SNAPSHOT_DIR):
+        if not (name.startswith("v") and name.endswith(".npy")):
+            continue
+        try:
+            file_version = int(name[1:].split(".", 1)[0])
+        except ValueError:
+            continue
+        if file_version < version:
+            os.remove(_path(name))
@@ -0,0 +1,107 @@
+# backend/services/job_sync.py
+#
+# Single place the jobs router reports job writes to. Everything derived from a
+# job (its embedding, its vector index entry, its job_skills rows, its
+# full-text search document, its column of the resume score matrix) hangs off
+# these hooks, so the router does not need to know what has
+# to be kept in sync.
+# Rescoring every resume runs on a background worker and never delays the
+# API response.
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+from backend.models.job import Job
+from backend.services import job_index, job_search, job_skills, resume_scores
+from backend.services.job_embeddings import refresh_job_embedding
+
+JOB_SYNC_WORKERS = int(os.getenv("JOB_SYNC_WORKERS", "1"))
+
+_executor = ThreadPoolExecutor(max_workers=JOB_SYNC_WORKERS, thread_name_prefix="job-sync")
+_pending = set()
+_pending_lock = threading.Lock()
+
+# ---------------------------
+# HOOKS (called by the jobs router after commit)
+# ---------------------------
+
+# fields that feed score_resume_batch; edits to anything else keep the scores valid
+SCORED_FIELDS = {"description", "is_active"}
+# fields that feed the job_skills inverted index
+SKILL_FIELDS = {"required_skills", "is_active"}
+# fields in the full-text search document
+SEARCH_FIELDS = {"title", "description", "tags", "is_active"}
+
+def on_job_saved(db: Session, job: Job, changed_fields: set = None):
+    """
+    A job was created (changed_fields=None) or edited. Re-embeds it, and when a
+    scored field changed flags its existing scores stale and rescores it in the
+    background.
+    """
+    # a failure here must not lose the job; search backfills missing vectors later
+    try:
+        refresh_job_embedding(db, job)  # no-op unless the description changed
+        job_index.index_job(job)
+    except Exception as e:
+        db.rollback()
+        print(f"Could not embed job {job.id}:", e)
+
+    changed = None if changed_fields is None else set(changed_fields)
+    try:
+        if changed is None or SKILL_FIELDS & changed:
+            job_skills.sync_job_skills(db, job)
+        if changed is None or SEARCH_FIELDS & changed:
+            job_search.index_job(db, job)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Could not index job {job.id}:", e)
+
+    if changed_fields is not None and not (SCORED_FIELDS & set(changed_fields)):
+        return
+    if resume_scores.mark_job_stale(db, job.id):
+        db.commit()
+    _submit(job.id)
+
+def on_job_removed(db: Session, job: Job):
+    """A job was deleted or deactivated: it must stop showing up in search and recommendations."""
+    job_index.unindex_job(job.id)
+    job_skills.delete_job_skills(db, job.id)
+    job_search.remove_job(db, job.id)
+    resume_scores.delete_job_scores(db, job.id)
+    db.commit()
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
+
+# ---------------------------
+# WORKER
+# ---------------------------
+
+def _submit(job_id: int):
+    # a burst of edits to the same job collapses into one rescore
+    with _pending_lock:
+        if job_id in _pending:
+            return
+        _pending.add(job_id)
+    _executor.submit(_rescore, job_id)
+
+def _rescore(job_id: int):
+    with _pending_lock:
+        _pending.discard(job_id)
+    db = SessionLocal()
+    try:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if job is None or not job.is_active:
+            return
+        written = resume_scores.score_job_against_resumes(db, job)
+        db.commit()
+        print(f"Job {job_id} rescored against {written} resumes")
+    except Exception as e:
+        db.rollback()
+        print(f"Job {job_id} rescoring failed:", e)
+    finally:
+        db.close()
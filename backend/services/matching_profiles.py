@@ -0,0 +1,221 @@
+# backend/services/matching_profiles.py
+#
+# Per-user matching profile: what personalized endpoints need about a user's
+# current resume (its id, canonical skills and skill ids, education, the start
+# of its text and its embedding), so they never sort the user's resumes, load
+# parsed_text or re-encode anything.
+#
+# The current resume is the latest scored one, as in crud.get_latest_scored_resume.
+# resume_pipeline writes the profile row in the same commit that marks a resume
+# "scored"; users who were scored before the table existed get theirs built on
+# first use. Both write with a dialect upsert on user_id, so a first-use build
+# racing the pipeline (or another request) never fails on the unique key and
+# never replaces the pipeline's newer resume. Decoded profiles sit in a bounded in-process LRU
+# (PROFILE_CACHE_SIZE users). The writing process evicts its own entry at once.
+# Other workers trust an entry for PROFILE_CACHE_SECONDS, then re-check only
+# which resume the row points at (one indexed lookup) before reusing it.
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.models.matching_profile import MatchingProfile
+from backend.models.resume import Resume
+from backend.ai.resume_parser import EMBED_MODEL_VERSION
+from backend.ai.skill_taxonomy import skill_ids_for
+from backend.ai.vector_codec import EMBED_CODEC
+from backend.services.job_embeddings import pack_vector, unpack_vector
+from backend.services.resume_scores import resume_vectors
+
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "4096"))
+PROFILE_CACHE_SECONDS = float(os.getenv("PROFILE_CACHE_SECONDS", "5"))
+TEXT_HEAD_CHARS = 2000
+
+_cache = OrderedDict()  # user id -> (checked at, profile dict), LRU order
+_cache_lock = threading.Lock()
+_counters = {"hits": 0, "revalidated": 0, "loads": 0, "builds": 0}
+
+def _json_list(value) -> list:
+    if isinstance(value, str):
+        try:
+            value = json.loads(value or "[]")
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+def _count(name: str):
+    with _cache_lock:
+        _counters[name] += 1
+
+# ---------------------------
+# WRITES
+# ---------------------------
+
+def _profile_values(db: Session, resume: Resume, resume_vector=None) -> dict:
+    if resume_vector is None:
+        resume_vector = resume_vectors(db, [resume])[0]
+    skills = _json_list(resume.skills)
+    return {
+        "user_id": resume.user_id,
+        "resume_id": resume.id,
+        "content_hash": resume.content_hash,
+        "title": resume.title,
+        "file_url": resume.file_url,
+        "skills": json.dumps(skills),
+        "skill_ids": json.dumps(skill_ids_for(skills)),
+        "education": json.dumps(_json_list(resume.education)),
+        "experience": json.dumps(_json_list(resume.experience)),
+        "text_head": (resume.parsed_text or "")[:TEXT_HEAD_CHARS],
+        "embedding": pack_vector(resume_vector) if resume_vector is not None else None,
+        "embedding_codec": EMBED_CODEC,
+        "embedding_model": EMBED_MODEL_VERSION,
+        "updated_at": datetime.utcnow(),
+    }
+
+def _insert_statement(db: Session, values: dict, replace: bool):
+    """INSERT of one profile that updates (replace=True) or keeps (replace=False) an existing row."""
+    dialect = db.get_bind().dialect.name
+    table = MatchingProfile.__table__
+    updated = [name for name in values if name != "user_id"]
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(values)
+        if not replace:
+            return stmt.prefix_with("IGNORE")
+        return stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in updated})
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(values)
+        if not replace:
+            return stmt.on_conflict_do_nothing(index_elements=["user_id"])
+        return stmt.on_conflict_do_update(index_elements=["user_id"],
+                                          set_={name: stmt.excluded[name] for name in updated})
+    return None
+
+def save_profile(db: Session, resume: Resume, resume_vector=None):
+    """Point the user's profile at `resume` (just scored). Caller commits."""
+    values = _profile_values(db, resume, resume_vector)
+    stmt = _insert_statement(db, values, replace=True)
+    if stmt is not None:
+        db.execute(stmt)
+    else:
+        # no native upsert on this dialect
+        row = db.query(MatchingProfile).filter(MatchingProfile.user_id == resume.user_id).first()
+        if row is None:
+            row = MatchingProfile(user_id=resume.user_id)
+            db.add(row)
+        for name, value in values.items():
+            setattr(row, name, value)
+    invalidate(resume.user_id)
+
+def _build(db: Session, row, resume: Resume):
+    """
+    First-use build: create the row if it is missing, or re-embed it if it was made with
+    another embedding model. Whatever resume_pipeline wrote in the meantime wins.
+    """
+    values = _profile_values(db, resume)
+    if row is None:
+        stmt = _insert_statement(db, values, replace=False)
+        if stmt is None:
+            stmt = MatchingProfile.__table__.insert().values(values)  # a racing insert raises IntegrityError
+    else:
+        stmt = (
+            MatchingProfile.__table__.update()
+            .where(MatchingProfile.user_id == resume.user_id,
+                   MatchingProfile.embedding_model != EMBED_MODEL_VERSION)
+            .values(values)
+        )
+    db.execute(stmt)
+    invalidate(resume.user_id)
+
+def invalidate(user_id: int):
+    with _cache_lock:
+        _cache.pop(user_id, None)
+
+# ---------------------------
+# READS
+# ---------------------------
+
+def _decode(row: MatchingProfile) -> dict:
+    vector = None
+    if row.embedding is not None and row.embedding_model == EMBED_MODEL_VERSION:
+        vector = unpack_vector(row.embedding, row.embedding_codec)
+    return {
+        "user_id": row.user_id,
+        "resume_id": row.resume_id,
+        "content_hash": row.content_hash,
+        "title": row.title,
+        "file_url": row.file_url,
+        "skills": _json_list(row.skills),
+        "skill_ids": _json_list(row.skill_ids),
+        "education": _json_list(row.education),
+        "experience": _json_list(row.experience),
+        "text": row.text_head or "",
+        "vector": vector,
+    }
+
+def _load(db: Session, user_id: int):
+    row = db.query(MatchingProfile).filter(MatchingProfile.user_id == user_id).first()
+    stale_model = row is not None and row.embedding_model != EMBED_MODEL_VERSION
+    if row is None or stale_model:
+        # first use since the table was added, or the embedding model changed
+        resume = (
+            db.query(Resume)
+            .filter(Resume.user_id == user_id, Resume.ai_status == "scored")
+            .order_by(Resume.created_at.desc(), Resume.id.desc())
+            .first()
+        )
+        if resume is None:
+            return None
+        try:
+            _build(db, row, resume)
+            db.commit()
+            _count("builds")
+        except IntegrityError:
+            db.rollback()  # someone else created the row first; theirs is as good
+        row = db.query(MatchingProfile).filter(MatchingProfile.user_id == user_id).first()
+        if row is None:
+            return None
+    _count("loads")
+    return _decode(row)
+
+def get_profile(db: Session, user_id: int):
+    """The user's matching profile (a dict, see _decode), or None if they have no scored resume."""
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(user_id)
+        if entry is not None:
+            _cache.move_to_end(user_id)
+    if entry is not None:
+        checked_at, profile = entry
+        if now - checked_at < PROFILE_CACHE_SECONDS:
+            _count("hits")
+            return profile
+        # another worker may have scored a newer resume since
+        current = db.query(MatchingProfile.resume_id).filter(MatchingProfile.user_id == user_id).scalar()
+        if current == profile["resume_id"]:
+            _count("revalidated")
+            with _cache_lock:
+                _cache[user_id] = (now, profile)
+            return profile
+
+    profile = _load(db, user_id)
+    if profile is not None:
+        with _cache_lock:
+            _cache[user_id] = (now, profile)
+            _cache.move_to_end(user_id)
+            while len(_cache) > PROFILE_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return profile
+
+def stats() -> dict:
+    with _cache_lock:
+        return {"cached_users": len(_cache), **_counters}
@@ -0,0 +1,140 @@
+# backend/services/parse_cache.py
+#
+# parse_resume() results cached by sha256(file bytes) + PARSER_VERSION, so a
+# re-uploaded (or byte-identical) resume skips extraction, the Gemini call and
+# the resume embedding. Entries are evicted least-recently-used once the cache
+# grows past PARSE_CACHE_MAX_BYTES.
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.models.parse_cache import ParseCacheEntry
+from backend.ai.resume_parser import parse_resume, PARSER_VERSION, EMBED_MODEL_VERSION
+from backend.ai.vector_codec import EMBED_CODEC
+from backend.services.embedding_chunks import embed_documents
+from backend.services.job_embeddings import pack_vector, unpack_vector
+
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+_counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+_counters_lock = threading.Lock()
+
+# ---------------------------
+# HELPERS
+# ---------------------------
+
+def _count(name: str, amount: int = 1):
+    with _counters_lock:
+        _counters[name] += amount
+
+def file_sha256(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _lookup(db: Session, content_hash: str):
+    return (
+        db.query(ParseCacheEntry)
+        .filter(ParseCacheEntry.content_hash == content_hash,
+                ParseCacheEntry.parser_version == PARSER_VERSION)
+        .first()
+    )
+
+def _evict(db: Session):
+    """Drop least-recently-used entries until the cache fits in PARSE_CACHE_MAX_BYTES."""
+    total = db.query(func.coalesce(func.sum(ParseCacheEntry.size_bytes), 0)).scalar() or 0
+    if total <= PARSE_CACHE_MAX_BYTES:
+        return
+    doomed = []
+    rows = (
+        db.query(ParseCacheEntry.id, ParseCacheEntry.size_bytes)
+        .order_by(ParseCacheEntry.last_used_at.asc())
+        .all()
+    )
+    for entry_id, size in rows:
+        if total <= PARSE_CACHE_MAX_BYTES:
+            break
+        total -= size or 0
+        doomed.append(entry_id)
+    db.query(ParseCacheEntry).filter(ParseCacheEntry.id.in_(doomed)).delete(synchronize_session=False)
+    db.commit()
+    _count("evictions", len(doomed))
+
+# ---------------------------
+# PUBLIC
+# ---------------------------
+
+def parse_resume_cached(db: Session, file_path: str, content_hash: str = None):
+    """
+    Returns (parsed_data, resume_vector). On a hit neither the file, the LLM nor
+    the embedding model is touched. Fallback (local, LLM failed) parses are not cached, so a
+    Gemini outage does not pin a low-quality result to a file.
+    """
+    content_hash = content_hash or file_sha256(file_path)
+
+    entry = _lookup(db, content_hash)
+    if entry is not None and entry.embedding is not None and entry.embedding_model == EMBED_MODEL_VERSION:
+        entry.hits = (entry.hits or 0) + 1
+        entry.last_used_at = datetime.utcnow()
+        db.commit()
+        _count("hits")
+        return json.loads(entry.parsed), unpack_vector(entry.embedding, entry.embedding_codec)
+
+    _count("misses")
+    if entry is not None:
+        # parsed by the current parser, only the embedding is missing or stale: skip the parse
+        parsed = json.loads(entry.parsed)
+    else:
+        parsed = parse_resume(file_path)
+    try:
+        vector = embed_documents(db, [parsed.get("text") or ""])[0]
+    except Exception as e:
+        # keep the parse; scoring will try the embedding again
+        print("Resume embedding failed, not caching this parse:", e)
+        return parsed, None
+
+    if parsed.get("source") != "fallback":
+        payload = json.dumps(parsed)
+        blob = pack_vector(vector)
+        try:
+            if entry is None:
+                entry = ParseCacheEntry(content_hash=content_hash, parser_version=PARSER_VERSION)
+                db.add(entry)
+            entry.parsed = payload
+            entry.embedding = blob
+            entry.embedding_model = EMBED_MODEL_VERSION
+            entry.embedding_codec = EMBED_CODEC
+            entry.size_bytes = len(payload.encode("utf-8")) + len(blob)
+            entry.last_used_at = datetime.utcnow()
+            db.commit()
+            _count("stores")
+            _evict(db)
+        except IntegrityError:
+            # another worker stored the same file first
+            db.rollback()
+
+    return parsed, vector
+
+def stats(db: Session) -> dict:
+    with _counters_lock:
+        counters = dict(_counters)
+    lookups = counters["hits"] + counters["misses"]
+    entries, size = db.query(
+        func.count(ParseCacheEntry.id), func.coalesce(func.sum(ParseCacheEntry.size_bytes), 0)
+    ).one()
+    return {
+        **counters,
+        "hit_rate": round(counters["hits"] / lookups, 4) if lookups else None,
+        "entries": entries,
+        "bytes": int(size or 0),
+        "max_bytes": PARSE_CACHE_MAX_BYTES,
+        "parser_version": PARSER_VERSION,
+    }
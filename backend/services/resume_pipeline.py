@@ -0,0 +1,169 @@
+# backend/services/resume_pipeline.py
+#
+# Background resume processing. Uploads only persist the file and a Resume row
+# (ai_status="pending"); a small in-process worker pool then parses and scores
+# it, moving ai_status through pending -> parsed -> scored, or -> failed.
+# The resumes table itself is the queue, so nothing is lost on restart:
+# recover_pending() re-submits anything that was still pending, or parsed but
+# not yet scored (those pick up at scoring).
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+from backend.models.resume import Resume
+from backend.models.user import User
+from backend.services.parse_cache import parse_resume_cached
+from backend.services.matching_profiles import save_profile
+from backend.services.resume_scores import resume_vectors, score_resume_against_jobs
+
+RESUME_WORKERS = int(os.getenv("RESUME_WORKERS", "2"))
+# a claim older than this is assumed to belong to a crashed worker and is retried
+CLAIM_TIMEOUT_SECONDS = int(os.getenv("RESUME_CLAIM_TIMEOUT_SECONDS", "600"))
+# uploads are refused (503) while this many resumes are queued or running in this process
+RESUME_MAX_BACKLOG = int(os.getenv("RESUME_MAX_BACKLOG", "200"))
+# "parsed" is claimable too: a worker that died between parsing and scoring leaves it there
+_CLAIMABLE = ("pending", "parsed")
+
+_executor = ThreadPoolExecutor(max_workers=RESUME_WORKERS, thread_name_prefix="resume-worker")
+_in_flight = set()
+_in_flight_lock = threading.Lock()
+_durations = deque(maxlen=100)  # seconds per processed resume
+
+# ---------------------------
+# QUEUE
+# ---------------------------
+
+def submit(resume_id: int) -> bool:
+    """Queue a resume for processing. Returns False if it is already queued in this process."""
+    with _in_flight_lock:
+        if resume_id in _in_flight:
+            return False
+        _in_flight.add(resume_id)
+    _executor.submit(_run, resume_id)
+    return True
+
+def recover_pending() -> int:
+    """Re-queue resumes a previous run left pending or parsed-but-unscored (call on startup)."""
+    db = SessionLocal()
+    try:
+        unfinished = Resume.ai_status.in_(_CLAIMABLE)
+        ids = [row.id for row in db.query(Resume.id).filter(unfinished).all()]
+        # their claims belonged to the previous run's workers, which are gone: without
+        # this, a restart within CLAIM_TIMEOUT_SECONDS would leave them unclaimable
+        if ids:
+            (db.query(Resume)
+             .filter(unfinished, Resume.ai_started_at != None)
+             .update({Resume.ai_started_at: None}, synchronize_session=False))
+            db.commit()
+    finally:
+        db.close()
+    for resume_id in ids:
+        submit(resume_id)
+    return len(ids)
+
+def backlog() -> int:
+    with _in_flight_lock:
+        return len(_in_flight)
+
+def is_full() -> bool:
+    return backlog() >= RESUME_MAX_BACKLOG
+
+def retry_after() -> int:
+    """Seconds until the current backlog is likely processed."""
+    with _in_flight_lock:
+        mean = sum(_durations) / len(_durations) if _durations else 5.0
+        return max(1, math.ceil(mean * len(_in_flight) / RESUME_WORKERS))
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
+
+def _run(resume_id: int):
+    started = time.monotonic()
+    try:
+        process_resume(resume_id)
+    except Exception as e:
+        print(f"Resume {resume_id} worker crashed:", e)
+    finally:
+        with _in_flight_lock:
+            _in_flight.discard(resume_id)
+            _durations.append(time.monotonic() - started)
+
+# ---------------------------
+# WORKER
+# ---------------------------
+
+def _claim(db: Session, resume_id: int) -> bool:
+    """Atomically mark the resume as taken so two workers (or processes) never parse it twice."""
+    now = datetime.utcnow()
+    claimed = (
+        db.query(Resume)
+        .filter(
+            Resume.id == resume_id,
+            Resume.ai_status.in_(_CLAIMABLE),
+            (Resume.ai_started_at == None) | (Resume.ai_started_at < now - timedelta(seconds=CLAIM_TIMEOUT_SECONDS)),
+        )
+        .update({Resume.ai_started_at: now}, synchronize_session=False)
+    )
+    db.commit()
+    return claimed == 1
+
+def _fail(db: Session, resume: Resume, error: Exception):
+    db.rollback()
+    resume.ai_status = "failed"
+    resume.ai_error = str(error)[:2000]
+    db.commit()
+    print(f"Resume {resume.id} failed:", error)
+
+def process_resume(resume_id: int):
+    db = SessionLocal()
+    try:
+        if not _claim(db, resume_id):
+            return
+        resume = db.query(Resume).filter(Resume.id == resume_id).first()
+
+        # 1. Parse (cached by file content, so re-uploads skip Gemini and the embedding)
+        if resume.ai_status == "parsed":
+            resume_vector = None  # parsed by a worker that died before scoring: only step 2 is left
+        else:
+            try:
+                parsed_data, resume_vector = parse_resume_cached(db, resume.file_path, resume.content_hash)
+                apply_parsed(db, resume, parsed_data)
+                resume.ai_status = "parsed"
+                resume.ai_error = None
+                db.commit()
+            except Exception as e:
+                _fail(db, resume, e)
+                return
+
+        # 2. Score against the active jobs; the user's matching profile switches to this resume
+        try:
+            if resume_vector is None:
+                resume_vector = resume_vectors(db, [resume])[0]
+            score_resume_against_jobs(db, resume, resume_vector)
+            save_profile(db, resume, resume_vector)
+            resume.ai_status = "scored"
+            db.commit()
+        except Exception as e:
+            _fail(db, resume, e)
+    finally:
+        db.close()
+
+def apply_parsed(db: Session, resume: Resume, parsed_data: dict):
+    resume.parsed_text = parsed_data.get("text") or ""
+    resume.skills = parsed_data.get("skills") or []
+    resume.education = parsed_data.get("education") or []
+    resume.experience = parsed_data.get("experience") or []
+
+    # update profile fields when the parser provides them
+    user = db.query(User).filter(User.id == resume.user_id).first()
+    if user:
+        user.biography = parsed_data.get("biography") or user.biography
+        user.experience = parsed_data.get("experience_summary") or user.experience
+        user.education = parsed_data.get("education_summary") or user.education
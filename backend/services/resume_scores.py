@@ -0,0 +1,179 @@
+# backend/services/resume_scores.py
+#
+# The precomputed resume x job score matrix behind /best-jobs/hot and
+# crud.get_recommended_jobs. It is maintained incrementally:
+#   - a parsed resume is scored against every active job (resume_pipeline),
+#   - a created/edited job is scored against every user's latest resume (job_sync).
+# Rows are written with a dialect-native bulk upsert on (resume_id, job_id), so
+# re-scoring never deletes and re-inserts. When a job is edited, its rows are
+# flagged is_stale until the rescore lands, and readers skip them.
+
+from datetime import datetime
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session, selectinload
+
+from backend.models.job import Job
+from backend.models.parse_cache import ParseCacheEntry
+from backend.models.resume import Resume
+from backend.models.resume_score import ResumeScore
+from backend.ai.resume_parser import score_resume_batch, PARSER_VERSION, EMBED_MODEL_VERSION
+from backend.services.embedding_chunks import embed_documents
+from backend.services.job_embeddings import get_job_matrix, unpack_vector
+
+UPSERT_BATCH_SIZE = 500
+
+# ---------------------------
+# WRITES
+# ---------------------------
+
+def _upsert_statement(db: Session, rows: list):
+    dialect = db.get_bind().dialect.name
+    table = ResumeScore.__table__
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        return stmt.on_duplicate_key_update(
+            score=stmt.inserted.score, is_stale=stmt.inserted.is_stale, updated_at=stmt.inserted.updated_at,
+        )
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=["resume_id", "job_id"],
+            set_={"score": stmt.excluded.score, "is_stale": stmt.excluded.is_stale,
+                  "updated_at": stmt.excluded.updated_at},
+        )
+    return None
+
+def upsert_scores(db: Session, pairs: list):
+    """Insert or update (resume_id, job_id, score) triples; the caller commits."""
+    now = datetime.utcnow()
+    rows = [
+        {"resume_id": resume_id, "job_id": job_id, "score": score, "is_stale": False,
+         "created_at": now, "updated_at": now}
+        for resume_id, job_id, score in pairs
+    ]
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[start:start + UPSERT_BATCH_SIZE]
+        stmt = _upsert_statement(db, batch)
+        if stmt is not None:
+            db.execute(stmt)
+            continue
+        # no native upsert on this dialect: replace the pairs in place
+        for row in batch:
+            db.query(ResumeScore).filter(
+                ResumeScore.resume_id == row["resume_id"], ResumeScore.job_id == row["job_id"]
+            ).delete(synchronize_session=False)
+        db.bulk_insert_mappings(ResumeScore, batch)
+
+def mark_job_stale(db: Session, job_id: int) -> int:
+    """Flag every score of an edited job until it has been rescored; the caller commits."""
+    return (
+        db.query(ResumeScore)
+        .filter(ResumeScore.job_id == job_id, ResumeScore.is_stale == False)
+        .update({ResumeScore.is_stale: True}, synchronize_session=False)
+    )
+
+def delete_job_scores(db: Session, job_id: int) -> int:
+    return db.query(ResumeScore).filter(ResumeScore.job_id == job_id).delete(synchronize_session=False)
+
+# ---------------------------
+# SCORING
+# ---------------------------
+
+def _resume_data(resume: Resume) -> dict:
+    return {
+        "text": resume.parsed_text or "",
+        "skills": resume.skills or [],
+        "education": resume.education or [],
+    }
+
+def score_resume_against_jobs(db: Session, resume: Resume, resume_vector=None) -> int:
+    """Upsert this resume's score for every active job. Returns the number of rows written."""
+    jobs = (
+        db.query(Job)
+        .options(selectinload(Job.embedding))
+        .filter(Job.is_active == True)
+        .all()
+    )
+    if not jobs:
+        return 0
+    job_matrix = get_job_matrix(db, jobs)
+    scores = score_resume_batch(
+        _resume_data(resume), [job.description for job in jobs],
+        job_vectors=job_matrix, resume_vector=resume_vector,
+    )
+    upsert_scores(db, [(resume.id, job.id, score) for job, score in zip(jobs, scores)])
+    return len(jobs)
+
+def latest_scored_resumes(db: Session) -> list:
+    """
+    Each user's current resume as the readers pick it (crud.get_latest_scored_resume,
+    matching_profiles): the latest "scored" one by created_at, then id. A newer upload
+    still in the pipeline gets its scores when it is scored.
+    """
+    scored = Resume.ai_status == "scored"
+    newest = (
+        db.query(Resume.user_id, func.max(Resume.created_at).label("created_at"))
+        .filter(scored)
+        .group_by(Resume.user_id)
+        .subquery()
+    )
+    latest_ids = (
+        db.query(func.max(Resume.id))
+        .join(newest, and_(Resume.user_id == newest.c.user_id, Resume.created_at == newest.c.created_at))
+        .filter(scored)
+        .group_by(Resume.user_id)
+    )
+    return db.query(Resume).filter(Resume.id.in_(latest_ids.scalar_subquery())).all()
+
+def resume_vectors(db: Session, resumes: list) -> list:
+    """Resume embeddings from the parse cache; anything missing is encoded in one batch."""
+    hashes = {r.content_hash for r in resumes if r.content_hash}
+    cached = {}
+    if hashes:
+        entries = (
+            db.query(ParseCacheEntry.content_hash, ParseCacheEntry.embedding, ParseCacheEntry.embedding_codec)
+            .filter(ParseCacheEntry.content_hash.in_(hashes),
+                    ParseCacheEntry.parser_version == PARSER_VERSION,
+                    ParseCacheEntry.embedding_model == EMBED_MODEL_VERSION)
+            .all()
+        )
+        cached = {content_hash: unpack_vector(blob, codec) for content_hash, blob, codec in entries if blob is not None}
+
+    vectors = [cached.get(r.content_hash) for r in resumes]
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        encoded = embed_documents(db, [resumes[i].parsed_text or "" for i in missing])
+        for i, vector in zip(missing, encoded):
+            vectors[i] = vector
+    return vectors
+
+def score_job_against_resumes(db: Session, job: Job) -> int:
+    """Upsert this job's score for every user's latest resume. Returns the number of rows written."""
+    resumes = latest_scored_resumes(db)
+    if not resumes:
+        return 0
+    try:
+        job_vector = get_job_matrix(db, [job])
+        vectors = resume_vectors(db, resumes)
+    except Exception as e:
+        # scores without similarity would look fresh but be wrong: leave the job's rows
+        # stale (readers skip them) until a later rescore or resume upload replaces them
+        db.rollback()
+        print(f"Job {job.id} not rescored, embeddings unavailable:", e)
+        mark_job_stale(db, job.id)
+        return 0
+
+    pairs = []
+    for resume, resume_vector in zip(resumes, vectors):
+        score = score_resume_batch(
+            _resume_data(resume), [job.description],
+            job_vectors=job_vector if resume_vector is not None else None, resume_vector=resume_vector,
+        )[0]
+        pairs.append((resume.id, job.id, score))
+    upsert_scores(db, pairs)
+    return len(pairs)
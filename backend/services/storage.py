@@ -0,0 +1,88 @@
+# backend/services/storage.py
+#
+# Content-addressed resume storage. Uploads are streamed to a temp file in
+# chunks while the sha256 is computed, then moved to
+#   <UPLOAD_DIR>/<hash[:2]>/<hash><ext>
+# so identical files are stored once and two users uploading "resume.pdf"
+# never overwrite each other. Disk writes run in the threadpool, never on the
+# event loop.
+
+import hashlib
+import os
+import tempfile
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "backend/uploads/resumes")
+UPLOAD_URL_PREFIX = "/uploads/resumes"
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+CHUNK_SIZE = 1024 * 1024
+
+_TMP_DIR = os.path.join(UPLOAD_DIR, ".incoming")
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+def blob_path(content_hash: str, ext: str) -> str:
+    return os.path.join(UPLOAD_DIR, content_hash[:2], f"{content_hash}{ext}")
+
+def blob_url(content_hash: str, ext: str) -> str:
+    return f"{UPLOAD_URL_PREFIX}/{content_hash[:2]}/{content_hash}{ext}"
+
+def _open_temp():
+    os.makedirs(_TMP_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=_TMP_DIR, suffix=".part")
+    return os.fdopen(fd, "wb"), path
+
+def _publish(tmp_path: str, final_path: str) -> bool:
+    """Move the temp file into place; returns True if the blob already existed (dedup)."""
+    if os.path.exists(final_path):
+        os.remove(tmp_path)
+        return True
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(tmp_path, final_path)  # atomic, so readers never see a partial file
+    return False
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload(upload: UploadFile, ext: str, max_bytes: int = MAX_UPLOAD_BYTES) -> dict:
+    """
+    Stream `upload` to the blob store. Raises UploadTooLarge as soon as more than
+    `max_bytes` have been read. Returns {"content_hash", "path", "url", "size", "deduplicated"}.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    out, tmp_path = await run_in_threadpool(_open_temp)
+    try:
+        while True:
+            chunk = await upload.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"File exceeds the {max_bytes} byte upload limit")
+            digest.update(chunk)
+            await run_in_threadpool(out.write, chunk)
+        await run_in_threadpool(out.close)
+    except BaseException:
+        out.close()
+        await run_in_threadpool(_discard, tmp_path)
+        raise
+
+    content_hash = digest.hexdigest()
+    final_path = blob_path(content_hash, ext)
+    deduplicated = await run_in_threadpool(_publish, tmp_path, final_path)
+    return {
+        "content_hash": content_hash,
+        "path": final_path,
+        "url": blob_url(content_hash, ext),
+        "size": size,
+        "deduplicated": deduplicated,
+    }